@@ -11,6 +11,11 @@ from datetime import datetime, timedelta
 import json
 import bcrypt
 from functools import wraps
+from search_index import SearchIndex, build_match_query
+from search_cache import SearchResultCache, make_key
+from suggest_index import SuggestIndex
+from keyset_pagination import seek, paginate, ensure_seek_index
+from facet_counts import FacetCounts
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'wisenews-secret-key-2025'
@@ -160,6 +165,32 @@ def init_database():
 # Initialize database on startup
 init_database()
 
+# Articles per page on /articles
+ARTICLES_PER_PAGE = 25
+
+def _ensure_listing_index():
+    conn = sqlite3.connect(DATABASE_PATH)
+    ensure_seek_index(conn.cursor(), date_column='created_at')
+    conn.commit()
+    conn.close()
+
+_ensure_listing_index()
+
+# Article counts per source / category / day, kept current by triggers
+facet_counts = FacetCounts(DATABASE_PATH)
+facet_counts.ensure()
+
+# FTS5 index over title/summary/content, kept in sync by triggers
+search_index = SearchIndex(DATABASE_PATH)
+search_index.ensure()
+
+# Search / listing results served from memory until articles change
+search_cache = SearchResultCache(DATABASE_PATH)
+search_cache.ensure()
+
+# Typeahead completions from titles and sources (first build in the background)
+suggest_index = SuggestIndex(DATABASE_PATH).start()
+
 # Auth decorators
 def login_required(f):
     @wraps(f)
@@ -538,10 +569,20 @@ def quick_updates():
 
 @app.route('/articles')
 def articles():
+    page_cursor = request.args.get('cursor')
     conn = sqlite3.connect(DATABASE_PATH)
     cursor = conn.cursor()
-    cursor.execute('SELECT title, summary, source, category FROM articles ORDER BY created_at DESC')
-    articles = [{'title': row[0], 'summary': row[1], 'source': row[2], 'category': row[3]} for row in cursor.fetchall()]
+    
+    # Total from the trigger-maintained facet counts instead of COUNT(*) on every page
+    total = facet_counts.total()
+    
+    # One page, seeking past the cursor on (created_at, id)
+    condition, params, order_by, _ = seek(page_cursor, date_column='created_at')
+    cursor.execute(f'''SELECT id, title, summary, source, category, created_at FROM articles
+                      {'WHERE ' + condition if condition else ''} ORDER BY {order_by} LIMIT ?''',
+                   params + [ARTICLES_PER_PAGE + 1])
+    rows, next_cursor, prev_cursor = paginate(cursor.fetchall(), ARTICLES_PER_PAGE, page_cursor, date_index=5)
+    articles = [{'title': row[1], 'summary': row[2], 'source': row[3], 'category': row[4]} for row in rows]
     conn.close()
     
     return render_template_string('''
@@ -559,7 +600,7 @@ def articles():
     </nav>
     
     <div class="container mt-4">
-        <h1>All Articles ({{ articles|length }})</h1>
+        <h1>All Articles ({{ total }})</h1>
         
         {% for article in articles %}
         <div class="card mb-2">
@@ -570,10 +611,15 @@ def articles():
             </div>
         </div>
         {% endfor %}
+        
+        <div class="d-flex justify-content-between my-3">
+            {% if prev_cursor %}<a href="/articles?cursor={{ prev_cursor }}" class="btn btn-outline-primary">&larr; Newer</a>{% else %}<span></span>{% endif %}
+            {% if next_cursor %}<a href="/articles?cursor={{ next_cursor }}" class="btn btn-outline-primary">Older &rarr;</a>{% endif %}
+        </div>
     </div>
 </body>
 </html>
-    ''', articles=articles)
+    ''', articles=articles, total=total, next_cursor=next_cursor, prev_cursor=prev_cursor)
 
 @app.route('/search')
 def search():
@@ -583,9 +629,20 @@ def search():
     if query:
         conn = sqlite3.connect(DATABASE_PATH)
         cursor = conn.cursor()
-        cursor.execute('SELECT title, summary, source, category FROM articles WHERE title LIKE ? OR summary LIKE ? ORDER BY created_at DESC', 
-                      (f'%{query}%', f'%{query}%'))
-        articles = [{'title': row[0], 'summary': row[1], 'source': row[2], 'category': row[3]} for row in cursor.fetchall()]
+        generation = search_cache.generation(cursor)
+        cache_key = make_key('search', query)
+        articles = search_cache.get(cache_key, generation)
+        if articles is None:
+            match = build_match_query(query)
+            if match and search_index.ready():
+                # Every match, BM25-ranked; the snippet stands in for a missing summary
+                rows = search_index.search(cursor, match, 'a.title, a.summary, a.source, a.category', limit=None)
+                articles = [{'title': row[0], 'summary': row[1] or row[4], 'source': row[2], 'category': row[3]} for row in rows]
+            else:
+                cursor.execute('SELECT title, summary, source, category FROM articles WHERE title LIKE ? OR summary LIKE ? ORDER BY created_at DESC', 
+                              (f'%{query}%', f'%{query}%'))
+                articles = [{'title': row[0], 'summary': row[1], 'source': row[2], 'category': row[3]} for row in cursor.fetchall()]
+            search_cache.put(cache_key, articles, generation)
         conn.close()
     
     return render_template_string('''
@@ -701,8 +758,7 @@ def api_status():
         conn = sqlite3.connect(DATABASE_PATH)
         cursor = conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM articles')
-        article_count = cursor.fetchone()[0]
+        article_count = facet_counts.total()
         
         cursor.execute('SELECT COUNT(*) FROM users')
         user_count = cursor.fetchone()[0]
@@ -746,17 +802,33 @@ def api_articles():
     try:
         limit = request.args.get('limit', 20, type=int)
         category = request.args.get('category')
+        page_cursor = request.args.get('cursor')
         
         conn = sqlite3.connect(DATABASE_PATH)
         cursor = conn.cursor()
         
+        generation = search_cache.generation(cursor)
+        cache_key = make_key('api_articles', category=category, limit=limit, cursor=page_cursor)
+        response = search_cache.get(cache_key, generation)
+        if response is not None:
+            conn.close()
+            return jsonify(response)
+        
+        conditions, params = [], []
         if category:
-            cursor.execute('SELECT title, summary, source, category, created_at FROM articles WHERE category = ? ORDER BY created_at DESC LIMIT ?', (category, limit))
-        else:
-            cursor.execute('SELECT title, summary, source, category, created_at FROM articles ORDER BY created_at DESC LIMIT ?', (limit,))
+            conditions.append('category = ?')
+            params.append(category)
+        condition, seek_params, order_by, _ = seek(page_cursor, date_column='created_at')
+        if condition:
+            conditions.append(condition)
+            params.extend(seek_params)
+        where = 'WHERE ' + ' AND '.join(conditions) if conditions else ''
+        cursor.execute(f'SELECT title, summary, source, category, created_at, id FROM articles {where} ORDER BY {order_by} LIMIT ?',
+                       params + [limit + 1])
+        rows, next_cursor, prev_cursor = paginate(cursor.fetchall(), limit, page_cursor, date_index=4, id_index=5)
         
         articles = []
-        for row in cursor.fetchall():
+        for row in rows:
             articles.append({
                 'title': row[0],
                 'summary': row[1],
@@ -764,13 +836,30 @@ def api_articles():
                 'category': row[3],
                 'created_at': row[4]
             })
+        response = {'articles': articles, 'count': len(articles), 'next_cursor': next_cursor, 'prev_cursor': prev_cursor}
+        search_cache.put(cache_key, response, generation)
         
         conn.close()
-        return jsonify({'articles': articles, 'count': len(articles)})
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/facets')
+def api_facets():
+    return jsonify(facet_counts.get_all(request.args.get('limit', type=int)))
+
+@app.route('/api/suggest')
+def api_suggest():
+    prefix = request.args.get('q', '')[:100]
+    limit = request.args.get('limit', 8, type=int)
+    return jsonify({'query': prefix, 'suggestions': suggest_index.suggest(prefix, limit)})
+
+@app.route('/api/search-cache')
+@login_required
+def api_search_cache():
+    return jsonify(search_cache.get_stats())
+
 @app.route('/api/live-events')
 def api_live_events():
     try:
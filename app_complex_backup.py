@@ -1,8 +1,9 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, send_from_directory, session
 import os
 import sqlite3
 from datetime import datetime
 import secrets
+import hashlib
 
 # Import server optimizer
 from server_optimizer import optimizer, cache_db_query, get_optimized_db_connection, return_optimized_db_connection
@@ -52,7 +53,7 @@ except ImportError:
     QUICK_UPDATES_FRONTEND_AVAILABLE = False
 
 # Import live events archiver
-from live_events_archiver import live_events_archiver
+from live_events_archiver import live_events_archiver, ensure_live_event_column, COMPLETED_LIVE_EVENT_CONDITION
 
 # Import social media management
 from social_routes import social_bp
@@ -72,7 +73,38 @@ from support_routes import support_bp
 # Import performance optimizer
 from app_performance_optimizer import optimize_app
 
+# Import shared article fingerprint helpers
+from article_fingerprints import generate_fingerprints, ensure_fingerprint_columns, find_duplicate, SIMHASH_BANDS
+
+# Import the downloads/ import watermark
+from import_manifest import ImportManifest
+
+# Import RSS feed health registry
+from feed_health import FeedHealthRegistry
+
+# Import the staged ingestion pipeline
+from ingest_pipeline import Pipeline, Stage
+
+# Import story clustering
+from story_clusters import StoryClusterer, ONE_PER_STORY_CONDITION, STORY_SIZE_COLUMN
+
+# Import the full-text search index
+from search_index import SearchIndex, build_match_query
+
+# Import the search result cache
+from search_cache import get_search_cache, make_key
+
+# Import the typeahead suggestion index
+from suggest_index import SuggestIndex
+
+# Import keyset pagination helpers
+from keyset_pagination import seek, paginate, ensure_seek_index
+
+# Import materialized facet counts
+from facet_counts import FacetCounts
+
 import logging
+import threading
 
 
 def with_loading_screen(message="Loading...", min_delay=1000):
@@ -436,57 +468,78 @@ def has_real_time_notifications_access_template(user_id):
     has_access, _ = has_real_time_notifications_access(user_id)
     return has_access
 
+# FTS5 index over articles for /search
+search_index = SearchIndex('news_database.db')
+# In-memory search / listing results, invalidated when articles change
+search_cache = get_search_cache()
+# Prefix completions for search-as-you-type (refreshed incrementally in the background)
+suggest_index = SuggestIndex('news_database.db')
+# Article counts per source / category / read status / day, kept by triggers
+facet_counts = FacetCounts('news_database.db')
+
 # Auto-refresh configuration
 AUTO_REFRESH_ENABLED = True
 REFRESH_INTERVAL_MINUTES = 30  # Default: 30 minutes
 
-def generate_content_hash(content):
-    """Generate a hash of the article content for duplicate detection"""
-    # Clean content for better duplicate detection
-    cleaned_content = re.sub(r'\s+', ' ', content.lower().strip())
-    # Remove common variations that don't affect content meaning
-    cleaned_content = re.sub(r'[^\w\s]', '', cleaned_content)
-    return hashlib.md5(cleaned_content.encode('utf-8')).hexdigest()
-
-def generate_title_hash(title):
-    """Generate a hash of the article title for duplicate detection"""
-    cleaned_title = re.sub(r'[^\w\s]', '', title.lower().strip())
-    return hashlib.md5(cleaned_title.encode('utf-8')).hexdigest()
-
-def is_duplicate_article(title, content, cursor):
-    """Check if article is a duplicate using multiple methods"""
-    
-    # Method 1: Exact title match
-    cursor.execute('SELECT id FROM articles WHERE title = ?', (title,))
-    if cursor.fetchone():
-        return True, "Exact title match"
-    
-    # Method 2: Similar title (first 50 characters)
-    title_prefix = title[:50]
-    cursor.execute('SELECT id FROM articles WHERE title LIKE ?', (f'{title_prefix}%',))
-    if cursor.fetchone():
-        return True, "Similar title match"
-    
-    # Method 3: Content hash match
-    content_hash = generate_content_hash(content)
-    cursor.execute('SELECT id FROM articles WHERE content_hash = ?', (content_hash,))
-    if cursor.fetchone():
-        return True, "Content hash match"
-    
-    # Method 4: Title hash match (for titles with different punctuation)
-    title_hash = generate_title_hash(title)
-    cursor.execute('SELECT id, title FROM articles WHERE url_hash = ?', (title_hash,))
-    existing = cursor.fetchone()
-    if existing:
-        return True, f"Title hash match with: {existing[1]}"
-    
-    # Method 5: Content similarity (first 100 characters)
-    content_prefix = content[:100] if len(content) > 100 else content
-    cursor.execute('SELECT id FROM articles WHERE content LIKE ?', (f'{content_prefix}%',))
-    if cursor.fetchone():
-        return True, "Content similarity match"
-    
-    return False, "No duplicate found"
+# File import configuration
+IMPORT_CHUNK_SIZE = 100  # Files inserted per transaction by load_articles_to_db
+
+# Enrichment pipeline configuration - workers per stage
+ENRICH_WORKERS = 2  # Keyword/category extraction (threads)
+ANNOUNCE_WORKERS = 2  # Quick updates and notifications (threads)
+IMAGE_WORKERS = 4  # Image lookups (threads); queue overflow is dropped, never waited on
+PIPELINE_QUEUE_SIZE = 200
+# Passes an article is offered to the pipeline before it is left unenriched
+MAX_ENRICHMENT_ATTEMPTS = 3
+
+# Story clustering - listings show one card per story unless ?stories=0
+GROUP_ARTICLES_BY_STORY = True
+# Listing totals are cached this long per filter combination (approximate while articles arrive)
+ARTICLE_COUNT_CACHE_SECONDS = 300
+
+def is_duplicate_article(title, content, cursor, fingerprints=None):
+    """Check if article is a duplicate using multiple methods.
+    
+    Every check is an indexed lookup on fingerprints stored at insert time;
+    pass ``fingerprints`` from generate_fingerprints to avoid computing them twice.
+    """
+    return find_duplicate(cursor, title, content, fingerprints)
+
+def backfill_article_fingerprints(batch_size=500):
+    """Fill fingerprint columns for rows stored before they existed"""
+    conn = sqlite3.connect('news_database.db', check_same_thread=False)
+    cursor = conn.cursor()
+    filled = 0
+    last_id = 0
+    try:
+        while True:
+            cursor.execute('''
+                SELECT id, title, content FROM articles
+                WHERE simhash IS NULL AND content IS NOT NULL AND content != '' AND id > ?
+                ORDER BY id LIMIT ?
+            ''', (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            updates = []
+            for article_id, title, content in rows:
+                fingerprints = generate_fingerprints(title or '', content)
+                updates.append((fingerprints['content_hash'], fingerprints['title_hash'], fingerprints['simhash'])
+                               + tuple(fingerprints[f'simhash_band{i}'] for i in range(SIMHASH_BANDS))
+                               + (article_id,))
+            cursor.executemany(f'''
+                UPDATE articles SET content_hash = COALESCE(content_hash, ?), url_hash = COALESCE(url_hash, ?),
+                                    simhash = ?, {', '.join(f'simhash_band{i} = ?' for i in range(SIMHASH_BANDS))}
+                WHERE id = ?
+            ''', updates)
+            conn.commit()
+            filled += len(rows)
+            last_id = rows[-1][0]
+    finally:
+        conn.close()
+    if filled:
+        print(f"🔑 Fingerprinted {filled} existing articles")
+    return filled
 
 # PWA routes
 @app.route('/static/manifest.json')
@@ -540,8 +593,32 @@ def init_db():
     if 'content_hash' not in columns:
         cursor.execute('ALTER TABLE articles ADD COLUMN content_hash TEXT')
     
+    if 'url' not in columns:
+        cursor.execute('ALTER TABLE articles ADD COLUMN url TEXT')
+    
+    if 'published_date' not in columns:
+        cursor.execute('ALTER TABLE articles ADD COLUMN published_date TEXT')
+    
+    if 'needs_enrichment' not in columns:
+        cursor.execute('ALTER TABLE articles ADD COLUMN needs_enrichment INTEGER DEFAULT 0')
+    
+    if 'enrichment_attempts' not in columns:
+        cursor.execute('ALTER TABLE articles ADD COLUMN enrichment_attempts INTEGER DEFAULT 0')
+    
+    # SimHash columns and band indexes for the insert-time duplicate check
+    ensure_fingerprint_columns(cursor)
+    
     # Create indexes for faster duplicate checking
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_title ON articles(title)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filename ON articles(filename)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_articles_needs_enrichment
+        ON articles(id) WHERE needs_enrichment = 1
+    ''')
+    # (date_added, id) order that article listings page through
+    ensure_seek_index(cursor)
+    # Indexed link from archived live event articles to their event
+    ensure_live_event_column(cursor)
     try:
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_url_hash ON articles(url_hash)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_hash ON articles(content_hash)')
@@ -558,6 +635,11 @@ def init_db():
         )
     ''')
     
+    # Distinct sessions behind a search decide whether it is offered as a suggestion
+    cursor.execute("PRAGMA table_info(search_history)")
+    if 'session_key' not in [column[1] for column in cursor.fetchall()]:
+        cursor.execute('ALTER TABLE search_history ADD COLUMN session_key TEXT')
+    
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS bookmarks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -836,6 +918,15 @@ def init_db():
     
     conn.commit()
     conn.close()
+    
+    # Full-text index and its sync triggers (built from existing articles the first time)
+    search_index.ensure()
+    # Generation triggers that invalidate cached search results
+    search_cache.ensure()
+    # Facet count table and triggers (counted from existing articles the first time)
+    facet_counts.ensure()
+    # First suggestion index build runs in the background, not in a request
+    suggest_index.start()
 
 def extract_keywords(text):
     """Extract keywords from article content"""
@@ -919,142 +1010,307 @@ def has_real_time_notifications_access(user_id):
         logger.error(f"Error checking real-time notifications access: {e}")
         return False, "Error checking subscription status"
 
-def load_articles_to_db():
-    """Load articles from files into database with duplicate detection"""
+def notify_new_article(article_id, title, content, category, keywords, source_name, source_type, url):
+    """Fan a newly stored article out to quick updates and notifications"""
+    # Trigger quick update for new article
+    if quick_updates:
+        try:
+            article_data = {
+                'id': article_id,
+                'title': title,
+                'content': content,
+                'category': category,
+                'source_name': source_name,
+                'source_type': source_type,
+                'date_added': datetime.now().isoformat(),
+                'keywords': keywords.split(',') if keywords else []
+            }
+            quick_updates.add_quick_update('new_article', article_data, 'high')
+        except Exception as e:
+            logger.warning(f"Failed to trigger quick update for article {article_id}: {e}")
+    
+    # Create article data for notifications
+    article_data = {
+        'id': article_id,
+        'title': title,
+        'content': content,
+        'category': category,
+        'source_name': source_name,
+        'url': url,
+        'keywords': keywords.split(',') if keywords else []
+    }
+    
+    # Trigger notifications for this new article
+    trigger_article_notifications(article_data)
+
+def attach_article_images(article_id, title, content, category):
+    """Process article for relevant images (events, people, etc.)"""
+    try:
+        image_manager.process_article_for_images(article_id, title, content, category)
+    except Exception as e:
+        logger.warning(f"Failed to process images for article {article_id}: {e}")
+
+def announce_new_article(article_id, title, content, category, keywords, source_name, source_type, url):
+    """Fan a newly stored article out to quick updates, notifications and images"""
+    notify_new_article(article_id, title, content, category, keywords, source_name, source_type, url)
+    attach_article_images(article_id, title, content, category)
+
+# --- Enrichment pipeline stages ---
+
+def _enrich_stage(article):
+    """Keywords and category - cheap enough that a thread beats shipping the article to a process"""
+    article['keywords'] = extract_keywords(article['content'])
+    article['category'] = categorize_article(article['title'], article['content'])
+    return article
+
+def _store_stage(article):
+    """Save enrichment results and file the article under its story - it is fully available after this stage"""
     conn = sqlite3.connect('news_database.db', check_same_thread=False)
-    cursor = conn.cursor()
+    conn.execute('UPDATE articles SET keywords = ?, category = ?, needs_enrichment = 0 WHERE id = ?',
+                 (article['keywords'], article['category'], article['id']))
+    conn.commit()
+    conn.close()
     
-    # Get all text files in downloads directory
+    try:
+        # The duplicate index was synced once for this article's batch
+        article['story_id'] = story_clusterer.assign(article['id'], sync_index=False)
+    except Exception as e:
+        logger.error(f"Story clustering failed for article {article['id']}: {e}")
+    return article
+
+def _announce_stage(article):
+    notify_new_article(article['id'], article['title'], article['content'], article['category'],
+                       article['keywords'], article['source_name'], article['source_type'], article['url'])
+    return article
+
+def _image_stage(article):
+    attach_article_images(article['id'], article['title'], article['content'], article['category'])
+    return article
+
+# Single store worker, so story assignment never races itself
+story_clusterer = StoryClusterer('news_database.db')
+
+enrichment_pipeline = Pipeline([
+    Stage('enrich', _enrich_stage, workers=ENRICH_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+    Stage('store', _store_stage, workers=1, queue_size=PIPELINE_QUEUE_SIZE),
+    Stage('announce', _announce_stage, workers=ANNOUNCE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE),
+    Stage('images', _image_stage, workers=IMAGE_WORKERS, queue_size=PIPELINE_QUEUE_SIZE, overflow='drop'),
+], name='enrichment')
+
+# Only one enrichment pass runs at a time
+_enrichment_lock = threading.Lock()
+# Rows from before the fingerprint columns are filled in by the first pass
+_fingerprints_backfilled = False
+
+def enrich_pending_articles(batch_size=200):
+    """Enrich articles imported or ingested without keywords/category yet"""
+    if not _enrichment_lock.acquire(blocking=False):
+        return 0  # Another pass is already working through the backlog
+    
+    try:
+        global _fingerprints_backfilled
+        if not _fingerprints_backfilled:
+            backfill_article_fingerprints()
+            _fingerprints_backfilled = True
+        return _enrich_pending_batches(batch_size)
+    finally:
+        _enrichment_lock.release()
+
+def _enrich_pending_batches(batch_size):
+    total_enriched = 0
+    last_id = 0
+    
+    while True:
+        conn = sqlite3.connect('news_database.db', check_same_thread=False)
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute('''
+                SELECT id, title, content, source_type, source_name, COALESCE(url, file_path)
+                FROM articles
+                WHERE needs_enrichment = 1 AND id > ? AND COALESCE(enrichment_attempts, 0) < ?
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, MAX_ENRICHMENT_ATTEMPTS, batch_size))
+            pending = cursor.fetchall()
+            # Counted before submitting, so an article that keeps failing is given up on
+            cursor.executemany('UPDATE articles SET enrichment_attempts = COALESCE(enrichment_attempts, 0) + 1 WHERE id = ?',
+                               [(row[0],) for row in pending])
+            conn.commit()
+        except sqlite3.OperationalError:
+            # Column not added yet - nothing has been ingested directly
+            conn.close()
+            break
+        conn.close()
+        
+        if not pending:
+            break
+        
+        # Index the batch's signatures once, ahead of the store stage's story assignment
+        sync_duplicate_index()
+        
+        # Blocks whenever the first stage is full
+        for article_id, title, content, source_type, source_name, url in pending:
+            enrichment_pipeline.submit({
+                'id': article_id,
+                'title': title,
+                'content': content,
+                'source_type': source_type,
+                'source_name': source_name,
+                'url': url
+            })
+        
+        last_id = pending[-1][0]
+        total_enriched += len(pending)
+    
+    # Hold the lock until every article is stored so the next pass cannot resubmit it;
+    # notifications and images carry on in the background
+    enrichment_pipeline.wait_for('store')
+    
+    if total_enriched:
+        print(f"✨ Enriched {total_enriched} new articles")
+    return total_enriched
+
+def sync_duplicate_index():
+    """Catch the MinHash index up with articles inserted outside ArticleWriter"""
+    try:
+        story_clusterer.index.sync()
+    except Exception as e:
+        logger.error(f"Failed to update MinHash index: {e}")
+
+def start_background_enrichment():
+    """Run enrich_pending_articles on a daemon thread"""
+    thread = threading.Thread(target=enrich_pending_articles, daemon=True)
+    thread.start()
+    return thread
+
+def parse_download_filename(filename):
+    """Work out source type, source name and title from a downloads/ filename"""
+    source_type = "RSS"
+    source_name = "Unknown"
+    
+    if filename.startswith("RSS_") or filename.startswith("RSS__"):
+        source_type = "RSS"
+        if "__" in filename:
+            source_name = filename.split("__")[1] if len(filename.split("__")) > 1 else "RSS Feed"
+        else:
+            source_name = "RSS Feed"
+    elif filename.startswith("TW_") or filename.startswith("TWITTER__"):
+        source_type = "Twitter"
+        source_name = "Twitter"
+    elif filename.startswith("YT_") or filename.startswith("YOUTUBE__"):
+        source_type = "YouTube"
+        source_name = "YouTube"
+    
+    # Extract title from filename
+    title = filename.replace('.txt', '')
+    # Remove prefixes
+    for prefix in ['RSS__', 'RSS_', 'TW_', 'TWITTER__', 'YT_', 'YOUTUBE__']:
+        if title.startswith(prefix):
+            title = title[len(prefix):]
+            break
+    
+    title = title.replace('_', ' ')[:200]  # Limit title length
+    return source_type, source_name, title
+
+def load_articles_to_db():
+    """Import files added to downloads/ since the last run with duplicate detection.
+    
+    Only files at or past the stored mtime watermark (plus earlier failures,
+    which are retried) are read, existence is checked per chunk with one
+    indexed query, and each chunk is committed on its own. Keywords,
+    category, notifications and images are filled in by the background
+    enrichment pass instead of inline.
+    """
     downloads_dir = 'downloads'
     if not os.path.exists(downloads_dir):
-        conn.close()
         return {'added': 0, 'duplicates': 0, 'errors': 0, 'total_files': 0}
     
-    files = [f for f in os.listdir(downloads_dir) if f.endswith('.txt')]
+    manifest = ImportManifest('news_database.db', downloads_dir)
+    files = manifest.new_files()
+    if files is None:
+        # Directory unchanged since the last completed import
+        start_background_enrichment()
+        return {'added': 0, 'duplicates': 0, 'errors': 0, 'total_files': 0}
+    
+    conn = sqlite3.connect('news_database.db', check_same_thread=False)
+    cursor = conn.cursor()
     
     articles_added = 0
     duplicates_skipped = 0
     errors = 0
     
-    print(f"📚 Processing {len(files)} files for database import...")
+    print(f"📚 Processing {len(files)} new files for database import...")
     
-    for filename in files:
-        filepath = os.path.join(downloads_dir, filename)
+    for start in range(0, len(files), IMPORT_CHUNK_SIZE):
+        chunk = files[start:start + IMPORT_CHUNK_SIZE]
+        chunk_added = 0
+        chunk_failures = []
         
-        # Check if file already processed by filename
-        cursor.execute('SELECT id FROM articles WHERE filename = ?', (filename,))
-        if cursor.fetchone():
-            continue  # Skip files already in database
-            
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-            
-            if not content:
-                print(f"⚠️  Empty file skipped: {filename}")
-                continue
-                
-            # Extract source information from filename
-            source_type = "RSS"
-            source_name = "Unknown"
-            
-            if filename.startswith("RSS_") or filename.startswith("RSS__"):
-                source_type = "RSS"
-                if "__" in filename:
-                    source_name = filename.split("__")[1] if len(filename.split("__")) > 1 else "RSS Feed"
-                else:
-                    source_name = "RSS Feed"
-            elif filename.startswith("TW_") or filename.startswith("TWITTER__"):
-                source_type = "Twitter"
-                source_name = "Twitter"
-            elif filename.startswith("YT_") or filename.startswith("YOUTUBE__"):
-                source_type = "YouTube"
-                source_name = "YouTube"
-            
-            # Extract title from filename or content
-            title = filename.replace('.txt', '')
-            # Remove prefixes
-            for prefix in ['RSS__', 'RSS_', 'TW_', 'TWITTER__', 'YT_', 'YOUTUBE__']:
-                if title.startswith(prefix):
-                    title = title[len(prefix):]
-                    break
-            
-            title = title.replace('_', ' ')[:200]  # Limit title length
-            
-            if not title.strip():
-                title = content[:50] + '...' if len(content) > 50 else content
-            
-            # Check for duplicates using multiple methods
-            is_duplicate, duplicate_reason = is_duplicate_article(title, content, cursor)
-            
-            if is_duplicate:
-                print(f"🔄 Duplicate skipped: {title[:50]}... ({duplicate_reason})")
-                duplicates_skipped += 1
-                continue
-            
-            # Generate hashes for future duplicate detection
-            content_hash = generate_content_hash(content)
-            title_hash = generate_title_hash(title)
-            
-            keywords = extract_keywords(content)
-            category = categorize_article(title, content)
-            
-            # Insert new article
-            cursor.execute('''
-                INSERT INTO articles (title, content, source_type, source_name, filename, file_path, keywords, category, url_hash, content_hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (title, content, source_type, source_name, filename, filepath, keywords, category, title_hash, content_hash))
-            
-            # Get the newly inserted article ID
-            article_id = cursor.lastrowid
-            
-            # Trigger quick update for new article
-            if quick_updates:
-                try:
-                    article_data = {
-                        'id': article_id,
-                        'title': title,
-                        'content': content,
-                        'category': category,
-                        'source_name': source_name,
-                        'source_type': source_type,
-                        'date_added': datetime.now().isoformat(),
-                        'keywords': keywords.split(',') if keywords else []
-                    }
-                    quick_updates.add_quick_update('new_article', article_data, 'high')
-                except Exception as e:
-                    logger.warning(f"Failed to trigger quick update for article {article_id}: {e}")
-            
-            # Create article data for notifications
-            article_data = {
-                'id': article_id,
-                'title': title,
-                'content': content,
-                'category': category,
-                'source_name': source_name,
-                'url': filepath,
-                'keywords': keywords.split(',') if keywords else []
-            }
-            
-            # Trigger notifications for this new article
-            trigger_article_notifications(article_data)
+        # Check which files are already in the database in one query
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f'SELECT filename FROM articles WHERE filename IN ({placeholders})',
+                       [filename for filename, _, _ in chunk])
+        imported = {row[0] for row in cursor.fetchall()}
+        
+        for filename, filepath, mtime in chunk:
+            if filename in imported:
+                continue  # Skip files already in database
             
-            # Process article for relevant images (events, people, etc.)
             try:
-                image_manager.process_article_for_images(article_id, title, content, category)
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    content = f.read().strip()
+                
+                if not content:
+                    print(f"⚠️  Empty file skipped: {filename}")
+                    continue
+                
+                source_type, source_name, title = parse_download_filename(filename)
+                
+                if not title.strip():
+                    title = content[:50] + '...' if len(content) > 50 else content
+                
+                # Check for duplicates using multiple methods
+                fingerprints = generate_fingerprints(title, content)
+                is_duplicate, duplicate_reason = is_duplicate_article(title, content, cursor, fingerprints)
+                
+                if is_duplicate:
+                    print(f"🔄 Duplicate skipped: {title[:50]}... ({duplicate_reason})")
+                    duplicates_skipped += 1
+                    continue
+                
+                # Insert new article with its fingerprints; enrichment happens in the background
+                cursor.execute('''
+                    INSERT INTO articles (title, content, source_type, source_name, filename, file_path,
+                                          url_hash, content_hash, simhash, simhash_band0, simhash_band1,
+                                          simhash_band2, simhash_band3, needs_enrichment)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                ''', (title, content, source_type, source_name, filename, filepath,
+                      fingerprints['title_hash'], fingerprints['content_hash'], fingerprints['simhash'],
+                      fingerprints['simhash_band0'], fingerprints['simhash_band1'],
+                      fingerprints['simhash_band2'], fingerprints['simhash_band3']))
+                
+                chunk_added += 1
+                print(f"✅ Added: {title[:50]}...")
+                
             except Exception as e:
-                logger.warning(f"Failed to process images for article {article_id}: {e}")
-            
-            articles_added += 1
-            print(f"✅ Added: {title[:50]}...")
-            
-        except Exception as e:
-            print(f"❌ Error processing {filename}: {e}")
-            errors += 1
-            continue
+                print(f"❌ Error processing {filename}: {e}")
+                errors += 1
+                chunk_failures.append((filename, mtime, str(e)))
+                continue
+        
+        conn.commit()
+        # The watermark moves past failed files; the manifest keeps them for a retry
+        manifest.record_outcomes([filename for filename, _, _ in chunk], chunk_failures)
+        manifest.advance(chunk[-1][2], chunk_added)
+        articles_added += chunk_added
     
-    conn.commit()
     conn.close()
+    manifest.finish_scan()
+    
+    # Imported rows bypass ArticleWriter, which syncs the index after its own inserts
+    if articles_added:
+        sync_duplicate_index()
     
     print(f"""
 📊 WiseNews Import Summary:
@@ -1064,6 +1320,8 @@ def load_articles_to_db():
 📁 Total files processed: {len(files)}
 """)
     
+    start_background_enrichment()
+    
     return {
         'added': articles_added,
         'duplicates': duplicates_skipped,
@@ -1142,14 +1400,11 @@ def dashboard():
         category_stats = cursor.fetchall()
         
         # Get recent articles with limit - exclude ongoing live events
-        cursor.execute('''
+        cursor.execute(f'''
             SELECT id, title, source_type, category, date_added, read_status 
             FROM articles 
             WHERE is_deleted = 0 
-            AND (source_type != 'live_event' OR 
-                 (source_type = 'live_event' AND 
-                  CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER) IN 
-                  (SELECT id FROM live_events WHERE status = 'completed')))
+            AND {COMPLETED_LIVE_EVENT_CONDITION}
             ORDER BY date_added DESC 
             LIMIT 10
         ''')
@@ -1273,14 +1528,16 @@ def cookie_policy():
 @gzip_response
 def articles():
     """Browse all articles with pagination and filtering - protected from scraping"""
-    page = request.args.get('page', 1, type=int)
+    page_cursor = request.args.get('cursor', '')
     per_page = 20
     source_filter = request.args.get('source', '')
     category_filter = request.args.get('category', '')
     read_filter = request.args.get('read_status', '')
+    one_per_story = request.args.get('stories', '1' if GROUP_ARTICLES_BY_STORY else '0') == '1'
     
     # Create cache key based on parameters
-    cache_key = f"articles_p{page}_s{source_filter}_c{category_filter}_r{read_filter}"
+    filter_key = f"s{source_filter}_c{category_filter}_r{read_filter}_st{int(one_per_story)}"
+    cache_key = f"articles_{page_cursor}_{filter_key}"
     cached_result = cache.get(cache_key)
     
     if cached_result:
@@ -1297,12 +1554,7 @@ def articles():
         params = []
         
         # Exclude articles from ongoing live events (only show completed live events)
-        where_conditions.append('''
-            (source_type != 'live_event' OR 
-             (source_type = 'live_event' AND 
-              CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER) IN 
-              (SELECT id FROM live_events WHERE status = 'completed')))
-        ''')
+        where_conditions.append(COMPLETED_LIVE_EVENT_CONDITION)
         
         if source_filter:
             where_conditions.append('source_type = ?')
@@ -1316,57 +1568,54 @@ def articles():
             where_conditions.append('read_status = ?')
             params.append(read_filter == 'true')
         
+        if one_per_story:
+            where_conditions.append(ONE_PER_STORY_CONDITION)
+        
         where_clause = 'WHERE ' + ' AND '.join(where_conditions)
         
-        # Get total count efficiently
-        cursor.execute(f'SELECT COUNT(*) FROM articles {where_clause}', params)
-        result = cursor.fetchone()
-        total = result[0] if result else 0
+        # Total for these filters - counted once per few minutes, not per page view
+        count_cache_key = f"articles_count_{filter_key}"
+        total = cache.get(count_cache_key)
+        if total is None:
+            cursor.execute(f'SELECT COUNT(*) FROM articles {where_clause}', params)
+            result = cursor.fetchone()
+            total = result[0] if result else 0
+            cache.set(count_cache_key, total, timeout=ARTICLE_COUNT_CACHE_SECONDS)
         
-        # Get articles for current page
-        offset = (page - 1) * per_page
+        # Get articles for current page - seek past the cursor instead of OFFSET
+        seek_condition, seek_params, order_by, _ = seek(page_cursor)
+        if seek_condition:
+            where_clause += f' AND {seek_condition}'
         cursor.execute(f'''
-            SELECT id, title, source_type, source_name, category, date_added, read_status, keywords
+            SELECT id, title, source_type, source_name, category, date_added, read_status, keywords,
+                   {STORY_SIZE_COLUMN} AS story_size
             FROM articles 
             {where_clause}
-            ORDER BY date_added DESC 
-            LIMIT ? OFFSET ?
-        ''', params + [per_page, offset])
-        
-        articles_data = cursor.fetchall()
-        
-        # Get unique sources and categories for filters (cached separately)
-        sources_cache_key = "article_sources"
-        sources = cache.get(sources_cache_key)
-        if not sources:
-            cursor.execute('SELECT DISTINCT source_type FROM articles WHERE is_deleted = 0 ORDER BY source_type')
-            sources = [row[0] for row in cursor.fetchall()]
-            cache.set(sources_cache_key, sources, timeout=300)  # Cache for 5 minutes
-        
-        categories_cache_key = "article_categories"
-        categories = cache.get(categories_cache_key)
-        if not categories:
-            cursor.execute('SELECT DISTINCT category FROM articles WHERE is_deleted = 0 ORDER BY category')
-            categories = [row[0] for row in cursor.fetchall()]
-            cache.set(categories_cache_key, categories, timeout=300)  # Cache for 5 minutes
+            ORDER BY {order_by} 
+            LIMIT ?
+        ''', params + seek_params + [per_page + 1])
+        
+        articles_data, next_cursor, prev_cursor = paginate(cursor.fetchall(), per_page, page_cursor, date_index=5)
+        
+        # Unique sources and categories for filters, from the facet counts
+        sources = facet_counts.values('source_type')
+        categories = facet_counts.values('category')
         
     finally:
         close_db(conn)
     
-    # Calculate pagination
-    total_pages = (total + per_page - 1) // per_page
-    
     # Prepare template data
     template_data = {
         'articles': articles_data,
-        'page': page,
-        'total_pages': total_pages,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor,
         'total': total,
         'sources': sources,
         'categories': categories,
         'current_source': source_filter,
         'current_category': category_filter,
-        'current_read_status': read_filter
+        'current_read_status': read_filter,
+        'one_per_story': one_per_story
     }
     
     # Cache the result for 2 minutes
@@ -1420,55 +1669,78 @@ def view_article(article_id):
             conn.close()
         return "Internal server error", 500
 
-@app.route('/search')
-@anti_scraper_protection
-def search():
-    """Search articles with anti-scraping protection"""
-    query = request.args.get('q', '').strip()
-    page = request.args.get('page', 1, type=int)
-    per_page = 20
-    
-    if not query:
-        return render_template('search.html', query='', articles=[], total=0)
-    
-    conn = sqlite3.connect('news_database.db', check_same_thread=False)
-    cursor = conn.cursor()
-    
-    # Record search
-    cursor.execute('INSERT INTO search_history (query) VALUES (?)', (query,))
+def _search_articles(cursor, query, page, per_page):
+    """(total, result page) for a search - ranked full-text when available, LIKE otherwise"""
+    match = build_match_query(query)
+    if match and search_index.ready():
+        # Ranked full-text search - exclude ongoing live events
+        live_event_filter = COMPLETED_LIVE_EVENT_CONDITION
+        total = search_index.count(cursor, match, live_event_filter)
+        articles_data = search_index.search(
+            cursor, match, 'a.id, a.title, a.source_type, a.source_name, a.category, a.date_added',
+            live_event_filter, limit=per_page, offset=(page - 1) * per_page
+        )
+        return total, articles_data
     
     # Search in title, content, and keywords - exclude ongoing live events
     search_query = f'%{query}%'
-    cursor.execute('''
+    cursor.execute(f'''
         SELECT COUNT(*) FROM articles 
         WHERE (title LIKE ? OR content LIKE ? OR keywords LIKE ?)
-        AND (source_type != 'live_event' OR 
-             (source_type = 'live_event' AND 
-              CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER) IN 
-              (SELECT id FROM live_events WHERE status = 'completed')))
+        AND {COMPLETED_LIVE_EVENT_CONDITION}
     ''', (search_query, search_query, search_query))
     
     total = cursor.fetchone()[0]
     
-    # Update search history with result count
-    cursor.execute('UPDATE search_history SET results_count = ? WHERE id = last_insert_rowid()', (total,))
-    
     # Get search results - exclude ongoing live events
     offset = (page - 1) * per_page
-    cursor.execute('''
+    cursor.execute(f'''
         SELECT id, title, source_type, source_name, category, date_added, 
                SUBSTR(content, 1, 200) as preview
         FROM articles 
         WHERE (title LIKE ? OR content LIKE ? OR keywords LIKE ?)
-        AND (source_type != 'live_event' OR 
-             (source_type = 'live_event' AND 
-              CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER) IN 
-              (SELECT id FROM live_events WHERE status = 'completed')))
+        AND {COMPLETED_LIVE_EVENT_CONDITION}
         ORDER BY date_added DESC
         LIMIT ? OFFSET ?
     ''', (search_query, search_query, search_query, per_page, offset))
     
-    articles_data = cursor.fetchall()
+    return total, cursor.fetchall()
+
+def search_session_key():
+    """Opaque per-visitor key stored with searches (the user, or a random per-browser token)"""
+    identity = session.get('user_id')
+    if identity is None:
+        identity = session.setdefault('search_session', secrets.token_hex(8))
+    return hashlib.sha256(f"search:{identity}".encode()).hexdigest()[:16]
+
+@app.route('/search')
+@anti_scraper_protection
+def search():
+    """Search articles with anti-scraping protection"""
+    query = request.args.get('q', '').strip()
+    page = request.args.get('page', 1, type=int)
+    per_page = 20
+    
+    if not query:
+        return render_template('search.html', query='', articles=[], total=0)
+    
+    conn = sqlite3.connect('news_database.db', check_same_thread=False)
+    cursor = conn.cursor()
+    
+    # Record search
+    cursor.execute('INSERT INTO search_history (query, session_key) VALUES (?, ?)', (query, search_session_key()))
+    
+    # Hot queries are served from memory until new articles are committed
+    generation = search_cache.generation(cursor)
+    cache_key = make_key('search', query, page)
+    results = search_cache.get(cache_key, generation)
+    if results is None:
+        results = _search_articles(cursor, query, page, per_page)
+        search_cache.put(cache_key, results, generation)
+    total, articles_data = results
+    
+    # Update search history with result count
+    cursor.execute('UPDATE search_history SET results_count = ? WHERE id = last_insert_rowid()', (total,))
     conn.commit()
     conn.close()
     
@@ -1481,29 +1753,24 @@ def search():
                          total_pages=total_pages,
                          total=total)
 
+@app.route('/api/suggest')
+def api_suggest():
+    """Typeahead completions for the search box"""
+    prefix = request.args.get('q', '')[:100]
+    limit = request.args.get('limit', 8, type=int)
+    return jsonify({'query': prefix, 'suggestions': suggest_index.suggest(prefix, limit)})
+
 @app.route('/analytics')
 def analytics():
     """Analytics dashboard"""
     conn = sqlite3.connect('news_database.db', check_same_thread=False)
     cursor = conn.cursor()
     
-    # Articles by source
-    cursor.execute('SELECT source_type, COUNT(*) FROM articles GROUP BY source_type')
-    source_data = cursor.fetchall()
-    
-    # Articles by category
-    cursor.execute('SELECT category, COUNT(*) FROM articles GROUP BY category ORDER BY COUNT(*) DESC')
-    category_data = cursor.fetchall()
-    
-    # Articles by date (last 7 days)
-    cursor.execute('''
-        SELECT DATE(date_added) as date, COUNT(*) 
-        FROM articles 
-        WHERE date_added >= date('now', '-7 days')
-        GROUP BY DATE(date_added)
-        ORDER BY date
-    ''')
-    daily_data = cursor.fetchall()
+    # Articles by source, category and date (last 7 days) - from the facet counts
+    source_data = facet_counts.counts('source_type', order='value')
+    category_data = facet_counts.counts('category')
+    cursor.execute("SELECT date('now', '-7 days')")
+    daily_data = facet_counts.counts('day', order='value', min_value=cursor.fetchone()[0])
     
     # Top keywords
     cursor.execute('SELECT keywords FROM articles WHERE keywords IS NOT NULL')
@@ -1835,21 +2102,38 @@ def api_articles():
     cursor = conn.cursor()
     
     limit = request.args.get('limit', 50, type=int)
-    offset = request.args.get('offset', 0, type=int)
+    # Page with the opaque ``cursor`` from the previous response; ``offset`` still works for old clients
+    page_cursor = request.args.get('cursor')
+    offset = 0 if page_cursor else request.args.get('offset', 0, type=int)
+    category = request.args.get('category')
+    one_per_story = request.args.get('stories', '1' if GROUP_ARTICLES_BY_STORY else '0') == '1'
+    story_condition = f'AND {ONE_PER_STORY_CONDITION}' if one_per_story else ''
+    category_condition = 'AND category = ?' if category else ''
+    seek_condition, seek_params, order_by, _ = seek(page_cursor)
+    
+    generation = search_cache.generation(cursor)
+    cache_key = make_key('api_articles', category=category, limit=limit, offset=offset,
+                         cursor=page_cursor, stories=one_per_story)
+    response = search_cache.get(cache_key, generation)
+    if response is not None:
+        conn.close()
+        return jsonify(response)
     
-    cursor.execute('''
+    cursor.execute(f'''
         SELECT id, title, content, source_type, source_name, 
-               date_added, keywords, category, read_status
+               date_added, keywords, category, read_status,
+               (SELECT cluster_id FROM story_cluster_members WHERE article_id = articles.id) AS story_id,
+               {STORY_SIZE_COLUMN} AS story_size
         FROM articles 
-        WHERE (source_type != 'live_event' OR 
-               (source_type = 'live_event' AND 
-                CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER) IN 
-                (SELECT id FROM live_events WHERE status = 'completed')))
-        ORDER BY date_added DESC
+        WHERE {COMPLETED_LIVE_EVENT_CONDITION}
+        {story_condition}
+        {category_condition}
+        {f'AND {seek_condition}' if seek_condition else ''}
+        ORDER BY {order_by}
         LIMIT ? OFFSET ?
-    ''', (limit, offset))
+    ''', ([category] if category else []) + seek_params + [limit + 1, offset])
     
-    articles_data = cursor.fetchall()
+    articles_data, next_cursor, prev_cursor = paginate(cursor.fetchall(), limit, page_cursor, date_index=5)
     conn.close()
     
     articles_list = []
@@ -1863,10 +2147,37 @@ def api_articles():
             'date_added': article[5],
             'keywords': article[6],
             'category': article[7],
-            'read_status': article[8]
+            'read_status': article[8],
+            'story_id': article[9],
+            'story_size': article[10]
         })
+    response = {'articles': articles_list, 'next_cursor': next_cursor, 'prev_cursor': prev_cursor}
+    search_cache.put(cache_key, response, generation)
     
-    return jsonify({'articles': articles_list})
+    return jsonify(response)
+
+@app.route('/api/facets')
+@anti_scraper_protection
+def api_facets():
+    """Article counts per source, category, read status and day"""
+    limit = request.args.get('limit', type=int)
+    facet = request.args.get('facet')
+    if facet:
+        if not facet_counts.ready() or facet not in facet_counts.facets:
+            return jsonify({'error': f'Unknown facet: {facet}'}), 404
+        return jsonify({'facet': facet, 'counts': [{'value': value, 'count': count}
+                                                   for value, count in facet_counts.counts(facet, limit=limit)]})
+    return jsonify(facet_counts.get_all(limit))
+
+@app.route('/api/stories/<int:story_id>')
+@require_api_key
+@anti_scraper_protection
+def api_story(story_id):
+    """All coverage of one story, representative first - Requires API key"""
+    story = story_clusterer.get_story(story_id)
+    if not story:
+        return jsonify({'error': 'Story not found'}), 404
+    return jsonify({'story': story})
 
 @app.route('/api/duplicate-stats')
 @require_api_key
@@ -1917,18 +2228,14 @@ def api_news_count():
         conn = sqlite3.connect('news_database.db', check_same_thread=False)
         cursor = conn.cursor()
         
-        # Count total articles
-        cursor.execute('SELECT COUNT(*) FROM articles')
-        total_articles = cursor.fetchone()[0]
+        # Total and top categories from the facet counts
+        total_articles = facet_counts.total()
+        top_categories = dict(facet_counts.counts('category', limit=5))
         
-        # Count recent articles (last 24 hours)
+        # Count recent articles (last 24 hours) - a range on the date index
         cursor.execute('SELECT COUNT(*) FROM articles WHERE date_added >= datetime("now", "-1 day")')
         recent_articles = cursor.fetchone()[0]
         
-        # Count by category
-        cursor.execute('SELECT category, COUNT(*) FROM articles GROUP BY category ORDER BY COUNT(*) DESC LIMIT 5')
-        top_categories = dict(cursor.fetchall())
-        
         conn.close()
         
         return jsonify({
@@ -3544,6 +3851,39 @@ def manual_archive_live_events():
     
     return redirect(url_for('live_events'))
 
+@app.route('/admin/search-cache')
+@admin_required
+def admin_search_cache():
+    """Search result cache hit rate and evictions (admin only)"""
+    return jsonify({'success': True, 'search_cache': search_cache.get_stats()})
+
+@app.route('/admin/pipeline-metrics')
+@admin_required
+def admin_pipeline_metrics():
+    """Per-stage throughput and queue depth of the enrichment pipeline (admin only)"""
+    return jsonify({'success': True, 'pipelines': [enrichment_pipeline.get_metrics()]})
+
+@app.route('/admin/feed-health')
+@admin_required
+def admin_feed_health():
+    """RSS feed health and circuit breaker state (admin only)"""
+    try:
+        registry = FeedHealthRegistry('news_database.db')
+        feeds = registry.get_report()
+        state = request.args.get('state')
+        if state:
+            feeds = [feed for feed in feeds if feed['state'] == state]
+        
+        return jsonify({
+            'success': True,
+            'summary': registry.get_summary(),
+            'feeds': feeds
+        })
+    
+    except Exception as e:
+        logger.error(f"Error loading feed health: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 
 def start_live_events_archiver():
     """Start the live events archiver background task"""
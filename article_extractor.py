@@ -0,0 +1,155 @@
+"""
+Streaming Article Text Extractor for WiseNews
+Pulls paragraph text out of article pages with an incremental HTML tokenizer
+instead of building a full BeautifulSoup tree, stopping as soon as the
+paragraph/character budget is met and capping how much of the page is downloaded
+"""
+
+import codecs
+import logging
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+from http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+# Default budgets
+MAX_PARAGRAPHS = 60  # Paragraphs kept per article
+MAX_CHARS = 20000  # Characters of paragraph text kept per article
+MAX_DOWNLOAD_BYTES = 1024 * 1024  # Bytes of HTML read per article page
+FALLBACK_CHARS = 1000  # Characters kept when a page has no <p> text
+
+CHUNK_SIZE = 16 * 1024
+
+# Elements whose text is never article content
+SKIPPED_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'head', 'title'}
+
+class ParagraphExtractor(HTMLParser):
+    """Incremental tokenizer that keeps only <p> text"""
+
+    def __init__(self, max_paragraphs: int = MAX_PARAGRAPHS, max_chars: int = MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_paragraphs = max_paragraphs
+        self.max_chars = max_chars
+        self.paragraphs = []
+        self.chars = 0
+        self.done = False
+
+        self._current = None  # Text pieces of the open <p>, if any
+        self._skip_depth = 0
+        self._fallback = []
+        self._fallback_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == 'p':
+            # A new <p> implicitly closes an open one
+            self._close_paragraph()
+            self._current = []
+        elif tag == 'br' and self._current is not None:
+            self._current.append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag == 'br' and self._current is not None:
+            self._current.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag == 'p':
+            self._close_paragraph()
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        if self._current is not None:
+            self._current.append(data)
+        elif self._fallback_chars < FALLBACK_CHARS:
+            self._fallback.append(data)
+            self._fallback_chars += len(data)
+
+    def _close_paragraph(self):
+        if self._current is None:
+            return
+        text = ''.join(self._current).strip()
+        self._current = None
+        if not text or self.done:
+            return
+
+        remaining = self.max_chars - self.chars
+        if len(text) > remaining:
+            text = text[:remaining].rstrip()
+        self.paragraphs.append(text)
+        self.chars += len(text)
+
+        if len(self.paragraphs) >= self.max_paragraphs or self.chars >= self.max_chars:
+            self.done = True
+
+    def result(self) -> str:
+        """Joined paragraph text, or a short plain-text fallback"""
+        self._close_paragraph()
+        if self.paragraphs:
+            return '\n'.join(self.paragraphs)
+        return ''.join(self._fallback)[:FALLBACK_CHARS] + "..."
+
+def extract_from_chunks(chunks: Iterable[str], max_paragraphs: int = MAX_PARAGRAPHS,
+                        max_chars: int = MAX_CHARS) -> str:
+    """Feed decoded HTML chunks until the budget is met"""
+    parser = ParagraphExtractor(max_paragraphs, max_chars)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    return parser.result()
+
+def extract_article_text(html: str, max_paragraphs: int = MAX_PARAGRAPHS,
+                         max_chars: int = MAX_CHARS) -> str:
+    """Extract paragraph text from an already downloaded page"""
+    return extract_from_chunks(
+        (html[start:start + CHUNK_SIZE] for start in range(0, len(html), CHUNK_SIZE)),
+        max_paragraphs, max_chars
+    )
+
+def _decoded_chunks(response, max_bytes: int):
+    """Decode a streamed response incrementally, stopping at max_bytes"""
+    try:
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    received = 0
+    for raw in response.iter_content(chunk_size=CHUNK_SIZE):
+        if not raw:
+            continue
+        if received + len(raw) >= max_bytes:
+            yield decoder.decode(raw[:max_bytes - received], final=True)
+            return
+        received += len(raw)
+        yield decoder.decode(raw)
+    yield decoder.decode(b'', final=True)
+
+def fetch_article_text(url: str, session=None,
+                       max_bytes: int = MAX_DOWNLOAD_BYTES,
+                       max_paragraphs: int = MAX_PARAGRAPHS,
+                       max_chars: int = MAX_CHARS,
+                       timeout: float = 10,
+                       headers: Optional[dict] = None) -> str:
+    """Stream an article page and extract its text without reading the whole body.
+
+    Uses the shared pooled client unless another session is passed. Network
+    errors are raised to the caller.
+    """
+    client = session or http_client
+    response = client.get(url, headers=headers or {'User-Agent': 'Mozilla/5.0'}, timeout=timeout, stream=True)
+    try:
+        response.raise_for_status()
+        if 'charset' not in response.headers.get('Content-Type', '').lower():
+            # No declared charset: requests would fall back to latin-1 for text/html;
+            # a page that does declare iso-8859-1 keeps it
+            response.encoding = 'utf-8'
+        return extract_from_chunks(_decoded_chunks(response, max_bytes), max_paragraphs, max_chars)
+    finally:
+        # A fully read body goes back to the pool; a cut-off one is dropped
+        response.close()
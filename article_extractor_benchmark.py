@@ -0,0 +1,103 @@
+"""
+Article Extractor Benchmark
+Compares the streaming extractor against the previous full BeautifulSoup parse
+on the saved downloads/ corpus (each saved article is wrapped in a typical
+news page layout: head, scripts, navigation, the paragraphs, related links)
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+import article_extractor
+
+PAGE_HEAD = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>
+<style>body {{ font-family: sans-serif; }} .nav a {{ margin: 0 4px; }}</style>
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}}</script>
+</head><body>
+<div class="nav">{nav}</div>
+<article><h1>{title}</h1>
+"""
+PAGE_TAIL = """</article>
+<aside class="related"><ul>{related}</ul></aside>
+<footer><p>&copy; WiseNews test page</p></footer>
+<script>{script}</script>
+</body></html>"""
+
+def legacy_extract(html):
+    """The extractor news_aggregator used before the streaming one"""
+    soup = BeautifulSoup(html, 'html.parser')
+    paragraphs = soup.find_all('p')
+    if paragraphs:
+        return '\n'.join([p.text.strip() for p in paragraphs if p.text.strip()])
+    else:
+        return soup.get_text()[:1000] + "..."
+
+def build_page(title, text):
+    """Wrap saved article text in a realistic page"""
+    nav = ''.join(f'<a href="/section/{i}">Section {i}</a>' for i in range(40))
+    related = ''.join(f'<li><a href="/story/{i}">Related story {i}</a></li>' for i in range(30))
+    paragraphs = ''.join(f'<p>{line.strip()}</p>\n' for line in text.splitlines() if line.strip())
+    return (PAGE_HEAD.format(title=title, nav=nav) + paragraphs +
+            PAGE_TAIL.format(related=related, script='var x = 1;' * 2000))
+
+def load_corpus(downloads_dir, limit):
+    pages = []
+    for filename in sorted(os.listdir(downloads_dir)):
+        if not filename.endswith('.txt'):
+            continue
+        try:
+            with open(os.path.join(downloads_dir, filename), 'r', encoding='utf-8') as f:
+                text = f.read()
+        except Exception:
+            continue
+        pages.append(build_page(filename[:-4], text))
+        if limit and len(pages) >= limit:
+            break
+    return pages
+
+def measure(name, extractor, pages):
+    """CPU time per page and peak traced memory of the largest single parse"""
+    started = time.process_time()
+    total_chars = 0
+    for html in pages:
+        total_chars += len(extractor(html))
+    cpu = time.process_time() - started
+
+    peak = 0
+    for html in pages[:200]:
+        tracemalloc.start()
+        extractor(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    print(f"{name:<12} {cpu * 1000 / len(pages):8.3f} ms/article   "
+          f"peak {peak / 1024:8.1f} KiB   {total_chars / len(pages):8.0f} chars/article")
+    return cpu, peak
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark article text extraction')
+    parser.add_argument('--downloads', default='downloads', help='Directory of saved articles')
+    parser.add_argument('--limit', type=int, default=0, help='Only use the first N articles')
+    args = parser.parse_args()
+
+    pages = load_corpus(args.downloads, args.limit)
+    if not pages:
+        print(f"❌ No saved articles found in {args.downloads}")
+        return
+
+    average_kib = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"📚 {len(pages)} pages, {average_kib:.1f} KiB average\n")
+
+    legacy_cpu, legacy_peak = measure('bs4', legacy_extract, pages)
+    stream_cpu, stream_peak = measure('streaming', article_extractor.extract_article_text, pages)
+
+    print(f"\n⚡ CPU: {legacy_cpu / stream_cpu:.1f}x faster, "
+          f"peak memory: {legacy_peak / max(stream_peak, 1):.1f}x lower")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Article Fingerprints for WiseNews
+Normalized hashes shared by every writer of the articles table so duplicate
+checks agree no matter which path inserted the article
+"""
+
+import hashlib
+import re
+
+def generate_content_hash(content):
+    """Generate a hash of the article content for duplicate detection"""
+    # Clean content for better duplicate detection
+    cleaned_content = re.sub(r'\s+', ' ', content.lower().strip())
+    # Remove common variations that don't affect content meaning
+    cleaned_content = re.sub(r'[^\w\s]', '', cleaned_content)
+    return hashlib.md5(cleaned_content.encode('utf-8')).hexdigest()
+
+def generate_title_hash(title):
+    """Generate a hash of the article title for duplicate detection"""
+    cleaned_title = re.sub(r'[^\w\s]', '', title.lower().strip())
+    return hashlib.md5(cleaned_title.encode('utf-8')).hexdigest()
+
+# SimHash of the body: 64 bits split into 4 indexed 16-bit bands. Two bodies
+# within SIMHASH_MAX_DISTANCE bits of each other share at least one band.
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+SIMHASH_MAX_DISTANCE = 3
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+def generate_simhash(content):
+    """64-bit SimHash of the word trigrams of the normalized content (signed, for SQLite)"""
+    words = re.sub(r'[^\w\s]', '', re.sub(r'\s+', ' ', content.lower())).split()
+    if not words:
+        return None
+    grams = [' '.join(words[i:i + 3]) for i in range(max(1, len(words) - 2))]
+    # Count the set bits per position with zip over fixed-width bit strings
+    bit_strings = [format(int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big'),
+                          '064b') for gram in grams]
+    half = len(bit_strings) / 2.0
+    value = 0
+    for column in zip(*bit_strings):
+        value = (value << 1) | (column.count('1') > half)
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+def simhash_bands(simhash):
+    """The 16-bit bands of a SimHash, highest first"""
+    if simhash is None:
+        return [None] * SIMHASH_BANDS
+    value = simhash & ((1 << SIMHASH_BITS) - 1)
+    mask = (1 << _BAND_BITS) - 1
+    return [(value >> (_BAND_BITS * (SIMHASH_BANDS - 1 - i))) & mask for i in range(SIMHASH_BANDS)]
+
+def hamming_distance(simhash1, simhash2):
+    return ((simhash1 ^ simhash2) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+def generate_fingerprints(title, content):
+    """All fingerprint columns of an article, computed once at insert"""
+    simhash = generate_simhash(content)
+    fingerprints = {
+        'title_hash': generate_title_hash(title),
+        'content_hash': generate_content_hash(content),
+        'simhash': simhash
+    }
+    for i, band in enumerate(simhash_bands(simhash)):
+        fingerprints[f'simhash_band{i}'] = band
+    return fingerprints
+
+def ensure_fingerprint_columns(cursor):
+    """Add the SimHash columns and their band indexes to the articles table"""
+    cursor.execute("PRAGMA table_info(articles)")
+    columns = [column[1] for column in cursor.fetchall()]
+    for name in ['simhash'] + [f'simhash_band{i}' for i in range(SIMHASH_BANDS)]:
+        if name not in columns:
+            cursor.execute(f'ALTER TABLE articles ADD COLUMN {name} INTEGER')
+    for i in range(SIMHASH_BANDS):
+        cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS idx_articles_simhash_band{i}
+            ON articles(simhash_band{i}) WHERE simhash_band{i} IS NOT NULL
+        ''')
+    # Case-insensitive title order for find_duplicate's prefix check
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_title_nocase ON articles(title COLLATE NOCASE)')
+
+def find_duplicate(cursor, title, content, fingerprints=None):
+    """(is_duplicate, reason) from indexed fingerprint lookups only.
+
+    The title prefix check is an index range scan on idx_title_nocase (ASCII
+    case-insensitive, like the LIKE it replaced), and near-identical bodies
+    come from the SimHash band indexes plus a Hamming check over the handful
+    of rows that share a band.
+    """
+    fingerprints = fingerprints or generate_fingerprints(title, content)
+
+    # Method 1: Exact title match
+    cursor.execute('SELECT id FROM articles WHERE title = ? LIMIT 1', (title,))
+    if cursor.fetchone():
+        return True, "Exact title match"
+
+    # Method 2: Similar title (first 50 characters)
+    title_prefix = title[:50]
+    cursor.execute('SELECT id FROM articles WHERE title COLLATE NOCASE >= ? AND title COLLATE NOCASE < ? LIMIT 1',
+                   (title_prefix, title_prefix + '\U0010ffff'))
+    if cursor.fetchone():
+        return True, "Similar title match"
+
+    # Method 3: Content hash match
+    cursor.execute('SELECT id FROM articles WHERE content_hash = ? LIMIT 1', (fingerprints['content_hash'],))
+    if cursor.fetchone():
+        return True, "Content hash match"
+
+    # Method 4: Title hash match (for titles with different punctuation)
+    cursor.execute('SELECT id, title FROM articles WHERE url_hash = ? LIMIT 1', (fingerprints['title_hash'],))
+    existing = cursor.fetchone()
+    if existing:
+        return True, f"Title hash match with: {existing[1]}"
+
+    # Method 5: Content similarity (SimHash within a few bits)
+    if fingerprints['simhash'] is not None:
+        cursor.execute(' UNION '.join(
+            f'SELECT simhash FROM articles WHERE simhash_band{i} = ?' for i in range(SIMHASH_BANDS)
+        ), simhash_bands(fingerprints['simhash']))
+        for (candidate,) in cursor.fetchall():
+            if candidate is not None and hamming_distance(candidate, fingerprints['simhash']) <= SIMHASH_MAX_DISTANCE:
+                return True, "Content similarity match"
+
+    return False, "No duplicate found"
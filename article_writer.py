@@ -0,0 +1,165 @@
+"""
+Direct-to-Database Article Writer for WiseNews
+Lets the aggregator insert structured article records straight into the
+articles table in batched transactions instead of round-tripping every
+article through downloads/*.txt and load_articles_to_db
+"""
+
+import logging
+import sqlite3
+from typing import Dict, List, Optional
+
+from article_fingerprints import ensure_fingerprint_columns, find_duplicate, generate_fingerprints
+from minhash_index import MinHashLSHIndex
+
+logger = logging.getLogger(__name__)
+
+class ArticleWriter:
+    """Buffers article records and writes them in one transaction per batch"""
+
+    def __init__(self, db_path: str = 'news_database.db', batch_size: int = 50,
+                 index_minhash: bool = True):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self._pending: List[Dict] = []
+        self.totals = {'inserted': 0, 'skipped': 0, 'errors': 0}
+        self._init_db()
+        # Signatures are stored at ingest so duplicate checks never rescan the corpus
+        self.minhash_index = MinHashLSHIndex(db_path) if index_minhash else None
+
+    def _init_db(self):
+        """Make sure the articles table has the columns structured records need"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                source_type TEXT NOT NULL,
+                source_name TEXT,
+                filename TEXT NOT NULL,
+                date_added DATETIME DEFAULT CURRENT_TIMESTAMP,
+                file_path TEXT NOT NULL,
+                keywords TEXT,
+                category TEXT,
+                read_status BOOLEAN DEFAULT FALSE,
+                url_hash TEXT,
+                content_hash TEXT
+            )
+        ''')
+
+        cursor.execute("PRAGMA table_info(articles)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        if 'url' not in columns:
+            cursor.execute('ALTER TABLE articles ADD COLUMN url TEXT')
+        if 'published_date' not in columns:
+            cursor.execute('ALTER TABLE articles ADD COLUMN published_date TEXT')
+        if 'needs_enrichment' not in columns:
+            # Set for rows written here; the app fills keywords/category and
+            # fans out notifications/images for them afterwards
+            cursor.execute('ALTER TABLE articles ADD COLUMN needs_enrichment INTEGER DEFAULT 0')
+
+        ensure_fingerprint_columns(cursor)
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_title ON articles(title)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_url_hash ON articles(url_hash)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_hash ON articles(content_hash)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_articles_needs_enrichment
+            ON articles(id) WHERE needs_enrichment = 1
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def add(self, title: str, content: str, source_type: str, source_name: Optional[str],
+            filename: str, file_path: str = '', url: Optional[str] = None,
+            published_date: Optional[str] = None) -> Optional[Dict]:
+        """Queue one article; flushes automatically when the batch is full"""
+        if not title or not content:
+            return None
+
+        self._pending.append({
+            'title': title[:500],
+            'content': content,
+            'source_type': source_type,
+            'source_name': source_name,
+            'filename': filename,
+            'file_path': file_path,
+            'url': url,
+            'published_date': published_date
+        })
+
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return None
+
+    def flush(self) -> Dict:
+        """Write all queued articles in a single transaction.
+
+        Each record gets the same verdict as a file import: find_duplicate runs
+        before its insert, inside the batch's transaction, so it also sees the
+        records inserted just before it. date_added is left to the column default (CURRENT_TIMESTAMP, UTC) like
+        every other writer, so listings, day counts and story windows compare
+        one timestamp format.
+        """
+        pending, self._pending = self._pending, []
+        result = {'inserted': 0, 'skipped': 0, 'errors': 0}
+        if not pending:
+            return result
+
+        for record in pending:
+            record.update(generate_fingerprints(record['title'], record['content']))
+
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        try:
+            # Write lock up front, so no other writer slips a duplicate in between check and insert
+            conn.execute('BEGIN IMMEDIATE')
+            inserted = 0
+            for record in pending:
+                is_duplicate, _ = find_duplicate(cursor, record['title'], record['content'], record)
+                if is_duplicate:
+                    result['skipped'] += 1
+                    continue
+
+                cursor.execute('''
+                    INSERT INTO articles (title, content, source_type, source_name, filename,
+                                          file_path, url_hash, content_hash, simhash, simhash_band0, simhash_band1,
+                                          simhash_band2, simhash_band3, url, published_date, needs_enrichment)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+                ''', (
+                    record['title'], record['content'], record['source_type'], record['source_name'],
+                    record['filename'], record['file_path'], record['title_hash'],
+                    record['content_hash'], record['simhash'], record['simhash_band0'], record['simhash_band1'],
+                    record['simhash_band2'], record['simhash_band3'], record['url'], record['published_date']
+                ))
+                inserted += 1
+            conn.commit()
+            result['inserted'] = inserted
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Failed to write article batch: {e}")
+            result['errors'] = len(pending)
+            result['skipped'] = 0
+        finally:
+            conn.close()
+
+        if result['inserted'] and self.minhash_index:
+            try:
+                self.minhash_index.sync()
+            except Exception as e:
+                logger.error(f"Failed to update MinHash index: {e}")
+
+        for key in self.totals:
+            self.totals[key] += result[key]
+        return result
+
+    def close(self) -> Dict:
+        """Flush anything still queued and return the run totals"""
+        self.flush()
+        return dict(self.totals)
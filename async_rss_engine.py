@@ -0,0 +1,334 @@
+"""
+Async RSS Ingestion Engine for WiseNews
+Fetches RSS feeds and article pages concurrently with a global request cap,
+per-host concurrency limits and per-host politeness delays (the hosts
+configured in http_client.HOST_RATE_LIMITS keep their own spacing)
+"""
+
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import feedparser
+
+from feed_scheduler import entry_timestamp
+from http_client import http_client
+from seen_url_index import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+class AsyncRSSEngine:
+    """Concurrent RSS fetcher used by news_aggregator.run_pipeline"""
+
+    def __init__(self, text_extractor: Callable[[str], str],
+                 max_concurrency: int = 50,
+                 per_host_concurrency: int = 2,
+                 host_delay: float = 0.5,
+                 host_delays: Optional[Dict[str, float]] = None,
+                 articles_per_source: int = 3,
+                 max_article_bytes: Optional[int] = None,
+                 timeout: float = 10.0,
+                 user_agent: str = 'Mozilla/5.0',
+                 validator_store=None,
+                 seen_index=None,
+                 health_registry=None):
+        self.text_extractor = text_extractor
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.host_delay = host_delay  # Spacing for hosts without an entry in host_delays
+        # Per-host overrides; the shared client's limits unless given
+        self.host_delays = http_client.host_rate_limits if host_delays is None else host_delays
+        self.articles_per_source = articles_per_source
+        self.max_article_bytes = max_article_bytes  # Cap on HTML read per article page
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.validator_store = validator_store  # Optional feed_cache.FeedValidatorStore
+        self.seen_index = seen_index  # Optional seen_url_index.SeenUrlIndex
+        self.health_registry = health_registry  # Optional feed_health.FeedHealthRegistry
+
+        # Per-run state, created inside the running event loop
+        self._global_limit = None
+        self._host_limits = None
+        self._host_locks = None
+        self._host_next_slot = None
+        self._validators = {}
+        self._validator_updates = []
+        self._claimed_urls = set()
+        self._fetched_urls = []
+        self._health_outcomes = []
+
+        # feed_url -> publish times of entries new on this pass (None if the fetch failed)
+        self.feed_observations = {}
+        self.stats = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        """Return the host part of a URL used for per-host limits"""
+        return urlparse(url).netloc.lower()
+
+    def _reset_run_state(self):
+        """Create fresh semaphores and politeness slots for a run"""
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = defaultdict(lambda: asyncio.Semaphore(self.per_host_concurrency))
+        self._host_locks = defaultdict(asyncio.Lock)
+        self._host_next_slot = defaultdict(float)
+        self._validators = self.validator_store.load_all() if self.validator_store else {}
+        self._validator_updates = []
+        self._claimed_urls = set()
+        self._fetched_urls = []
+        self._health_outcomes = []
+        self.feed_observations = {}
+        self.stats = {
+            'feeds': 0,
+            'feeds_failed': 0,
+            'feeds_skipped_unhealthy': 0,
+            'feeds_not_modified': 0,
+            'articles': 0,
+            'articles_failed': 0,
+            'articles_skipped_seen': 0,
+            'requests': 0,
+            'hosts': 0,
+            'elapsed_seconds': 0.0
+        }
+
+    async def _wait_for_host_slot(self, host: str):
+        """Enforce the politeness delay between requests to the same host"""
+        delay = self.host_delays.get(host, self.host_delay)
+        if delay <= 0:
+            return
+
+        loop = asyncio.get_running_loop()
+        async with self._host_locks[host]:
+            wait = self._host_next_slot[host] - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next_slot[host] = loop.time() + delay
+
+    @staticmethod
+    async def _read_capped(response: aiohttp.ClientResponse, max_bytes: int) -> str:
+        """Read at most max_bytes of a body and decode it"""
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(16 * 1024):
+            body.extend(chunk)
+            if len(body) >= max_bytes:
+                del body[max_bytes:]
+                break
+        try:
+            encoding = response.get_encoding()
+        except Exception:
+            encoding = 'utf-8'
+        return bytes(body).decode(encoding, errors='replace')
+
+    async def _request(self, session: aiohttp.ClientSession, url: str,
+                       headers: Optional[Dict[str, str]] = None,
+                       max_bytes: Optional[int] = None,
+                       timing: Optional[Dict[str, float]] = None) -> Tuple[int, Any, str]:
+        """GET a URL respecting the per-host and global concurrency limits.
+
+        ``timing['started']`` is set to the loop time once both limits are held,
+        so latency measured from it excludes time spent queueing for a slot.
+        """
+        host = self._host(url)
+
+        # Host limits are taken before the global slot so that a request
+        # sleeping out a politeness delay never holds a global slot
+        async with self._host_limits[host]:
+            await self._wait_for_host_slot(host)
+            async with self._global_limit:
+                if timing is not None:
+                    timing['started'] = asyncio.get_running_loop().time()
+                self.stats['requests'] += 1
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        return 304, response.headers.copy(), ''
+                    response.raise_for_status()
+                    if max_bytes:
+                        return response.status, response.headers.copy(), await self._read_capped(response, max_bytes)
+                    return response.status, response.headers.copy(), await response.text(errors='replace')
+
+    async def _get(self, session: aiohttp.ClientSession, url: str, max_bytes: Optional[int] = None) -> str:
+        """GET a URL and return its body text"""
+        _, _, text = await self._request(session, url, max_bytes=max_bytes)
+        return text
+
+    async def _fetch_entry(self, session: aiohttp.ClientSession, entry, source_name: str) -> Optional[Dict]:
+        """Download and extract one article referenced by a feed entry"""
+        title = entry.get('title', '')
+        link = entry.get('link')
+        if not link:
+            return None
+
+        try:
+            html = await self._get(session, link, self.max_article_bytes)
+            loop = asyncio.get_running_loop()
+            content = await loop.run_in_executor(None, self.text_extractor, html)
+            self.stats['articles'] += 1
+            self._fetched_urls.append(link)
+            return {
+                'title': title,
+                'content': content,
+                'link': link,
+                'source': source_name,
+                'published': entry.get('published')
+            }
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching article '{title[:60]}'")
+        except Exception as e:
+            logger.warning(f"Failed to fetch article '{title[:60]}': {e}")
+
+        self.stats['articles_failed'] += 1
+        return None
+
+    async def _drop_seen_entries(self, entries: List, processed: List[str], limit: int) -> List:
+        """Up to ``limit`` entries whose article was not fetched before nor claimed this run.
+
+        Only the entries kept are claimed, so ones beyond the limit stay free for
+        a later pass; entries fetched on an earlier pass count as processed.
+        """
+        loop = asyncio.get_running_loop()
+        links = [entry.get('link') for entry in entries]
+        unseen = set(await loop.run_in_executor(None, self.seen_index.filter_unseen, links))
+
+        kept = []
+        for entry in entries:
+            if len(kept) >= limit:
+                break
+            link = entry.get('link')
+            canonical = canonicalize_url(link) if link else None
+            if link in unseen and canonical not in self._claimed_urls:
+                self._claimed_urls.add(canonical)
+                kept.append(entry)
+            else:
+                if link not in unseen:
+                    processed.append(self.validator_store.entry_id(entry) if self.validator_store else link)
+                self.stats['articles_skipped_seen'] += 1
+        return kept
+
+    async def _process_feed(self, session: aiohttp.ClientSession, rss_url: str) -> Tuple[str, List[Dict]]:
+        """Fetch one feed and all of its selected entries"""
+        validators = self._validators.get(rss_url)
+        conditional_headers = self.validator_store.conditional_headers(validators) if self.validator_store else None
+
+        loop = asyncio.get_running_loop()
+        # Filled in by _request once the host and global slots are held
+        timing = {}
+        try:
+            status, response_headers, raw_feed = await self._request(session, rss_url, conditional_headers,
+                                                                     timing=timing)
+            latency_ms = (loop.time() - timing['started']) * 1000
+            if status == 304:
+                # Nothing changed since the last pass - skip parsing entirely
+                self.stats['feeds'] += 1
+                self.stats['feeds_not_modified'] += 1
+                self._validator_updates.append({'feed_url': rss_url, 'status': 304})
+                self.feed_observations[rss_url] = []
+                self._health_outcomes.append({'feed_url': rss_url, 'ok': True, 'latency_ms': latency_ms})
+                return rss_url, []
+
+            feed = await loop.run_in_executor(None, feedparser.parse, raw_feed)
+        except Exception as e:
+            logger.warning(f"Failed to fetch RSS feed {rss_url}: {e}")
+            self.stats['feeds_failed'] += 1
+            self.feed_observations[rss_url] = None
+            self._health_outcomes.append({'feed_url': rss_url, 'ok': False,
+                                          'latency_ms': (loop.time() - timing.get('started', loop.time())) * 1000,
+                                          'error': str(e) or type(e).__name__})
+            return rss_url, []
+
+        # An empty feed is as useless as a dead one
+        self._health_outcomes.append({'feed_url': rss_url, 'ok': bool(feed.entries), 'latency_ms': latency_ms,
+                                      'error': None if feed.entries else 'empty feed'})
+
+        self.stats['feeds'] += 1
+        entries = []
+        # Entry IDs handled on this pass; recorded once the articles are fetched
+        processed = []
+        try:
+            entries = feed.entries
+            if self.validator_store:
+                entries = self.validator_store.filter_new_entries(entries, validators)
+            self.feed_observations[rss_url] = [entry_timestamp(entry) for entry in entries]
+            articles = await self._fetch_new_entries(session, feed, rss_url, entries, processed)
+        except Exception as e:
+            # One bad feed must not fail the whole gather() sweep
+            logger.warning(f"Failed to process RSS feed {rss_url}: {e}")
+            self.stats['feeds_failed'] += 1
+            articles = []
+        finally:
+            if self.validator_store:
+                self._record_validators(rss_url, status, response_headers, feed.entries, entries,
+                                        validators, processed)
+        return rss_url, articles
+
+    async def _fetch_new_entries(self, session: aiohttp.ClientSession, feed, rss_url: str,
+                                 entries: List, processed: List[str]) -> List[Dict]:
+        """Fetch the articles of a feed's new entries, appending the IDs handled to processed"""
+        if self.seen_index and entries:
+            entries = await self._drop_seen_entries(entries, processed, self.articles_per_source)
+        else:
+            entries = entries[:self.articles_per_source]
+        if not entries:
+            logger.info(f"No new articles in RSS feed: {rss_url}")
+            return []
+
+        source_name = feed.feed.get('title') or self._host(rss_url)
+        results = await asyncio.gather(*(self._fetch_entry(session, entry, source_name) for entry in entries))
+        for entry, article in zip(entries, results):
+            if article:
+                processed.append(self.validator_store.entry_id(entry) if self.validator_store else entry.get('link'))
+        return [article for article in results if article]
+
+    def _record_validators(self, rss_url: str, status: int, response_headers, all_entries: List,
+                           new_entries: List, validators: Optional[Dict], processed: List[str]):
+        """Queue the feed's validators and the entry IDs that no longer need fetching.
+
+        ETag / Last-Modified are only kept once every new entry is handled, so
+        a feed with entries left over (failed or over the per-source cap) is
+        downloaded in full again next pass instead of answering 304.
+        """
+        complete = {self.validator_store.entry_id(entry) for entry in new_entries} <= set(processed)
+        self._validator_updates.append({
+            'feed_url': rss_url,
+            'status': status,
+            'etag': response_headers.get('ETag') if complete else None,
+            'last_modified': response_headers.get('Last-Modified') if complete else None,
+            'entry_ids': self.validator_store.remembered_ids(all_entries, validators, processed)
+        })
+
+    async def fetch_all(self, rss_urls: List[str]) -> List[Tuple[str, List[Dict]]]:
+        """Fetch every feed concurrently and return (feed_url, articles) pairs"""
+        self._reset_run_state()
+        started = time.time()
+
+        if self.health_registry:
+            allowed = self.health_registry.filter_allowed(rss_urls)
+            self.stats['feeds_skipped_unhealthy'] = len(rss_urls) - len(allowed)
+            rss_urls = allowed
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency,
+                                         limit_per_host=self.per_host_concurrency)
+        headers = {'User-Agent': self.user_agent}
+
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as session:
+            results = await asyncio.gather(*(self._process_feed(session, url) for url in rss_urls))
+
+        if self.validator_store:
+            self.validator_store.record_many(self._validator_updates)
+        if self.seen_index:
+            self.seen_index.add_many(self._fetched_urls)
+        if self.health_registry:
+            self.health_registry.record_many(self._health_outcomes)
+
+        self.stats['hosts'] = len(self._host_limits)
+        self.stats['elapsed_seconds'] = round(time.time() - started, 2)
+        logger.info(f"Async RSS sweep finished: {self.stats}")
+        return results
+
+    def run(self, rss_urls: List[str]) -> List[Tuple[str, List[Dict]]]:
+        """Blocking entry point for callers outside an event loop"""
+        return asyncio.run(self.fetch_all(rss_urls))
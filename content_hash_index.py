@@ -0,0 +1,173 @@
+"""
+Content Hash Index for WiseNews
+Sidecar SQLite index of saved article content hashes and normalized title keys
+so save_to_file answers "is this a duplicate?" with indexed lookups instead of
+re-reading every file in downloads/. Articles inserted by other writers
+(ArticleWriter, load_articles_to_db) are folded in from an id watermark before
+each lookup.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Length of the normalized title prefix used as the title key
+TITLE_KEY_LENGTH = 30
+
+FILENAME_PREFIXES = ('RSS__', 'RSS_', 'TW_', 'TWITTER__', 'YT_', 'YOUTUBE__')
+TIMESTAMP_SUFFIX = re.compile(r'_\d{8}_\d{6}$')
+
+def content_hash(content: str) -> str:
+    """MD5 of the raw article content (same hash save_to_file always used)"""
+    return hashlib.md5(content.encode('utf-8')).hexdigest()
+
+def title_key(title: str) -> str:
+    """Lowercased, punctuation-free title prefix used for similar-title checks"""
+    if not title:
+        return ''
+    cleaned = ''.join(c if c.isalnum() else ' ' for c in title.lower())
+    return ' '.join(cleaned.split())[:TITLE_KEY_LENGTH].strip()
+
+def title_from_filename(filename: str) -> str:
+    """Recover the (sanitized) title a download file was saved under"""
+    title = filename[:-4] if filename.endswith('.txt') else filename
+    for prefix in FILENAME_PREFIXES:
+        if title.startswith(prefix):
+            title = title[len(prefix):]
+            break
+    return TIMESTAMP_SUFFIX.sub('', title).replace('_', ' ')
+
+class ContentHashIndex:
+    """Incrementally maintained index over downloads/ and the articles table"""
+
+    def __init__(self, db_path: str = 'news_database.db', downloads_dir: str = 'downloads'):
+        self.db_path = db_path
+        self.downloads_dir = downloads_dir
+        self._init_db()
+        self.ensure_built()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create index tables if needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                content_hash TEXT,
+                title_key TEXT,
+                filename TEXT,
+                indexed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_index_hash ON content_index(content_hash)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_content_index_title_key ON content_index(title_key)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS content_index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def ensure_built(self):
+        """One-time backfill from existing files and article titles"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT value FROM content_index_meta WHERE key = 'built_at'")
+        if cursor.fetchone():
+            conn.close()
+            return
+
+        rows = []
+        if os.path.isdir(self.downloads_dir):
+            for entry in os.scandir(self.downloads_dir):
+                if not entry.name.endswith('.txt'):
+                    continue
+                try:
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        existing = f.read()
+                except Exception:
+                    continue  # Skip if can't read file
+                rows.append((content_hash(existing), title_key(title_from_filename(entry.name)), entry.name))
+
+        cursor.executemany(
+            'INSERT INTO content_index (content_hash, title_key, filename) VALUES (?, ?, ?)',
+            [row for row in rows if row[0] or row[1]]
+        )
+        added = self._sync_articles(cursor)
+        cursor.execute("INSERT OR REPLACE INTO content_index_meta (key, value) VALUES ('built_at', ?)",
+                       (datetime.now().isoformat(),))
+        conn.commit()
+        conn.close()
+        logger.info(f"Content hash index built with {len(rows) + added} entries")
+
+    def _sync_articles(self, cursor) -> int:
+        """Index titles of articles inserted since the last sync; returns how many"""
+        cursor.execute("SELECT value FROM content_index_meta WHERE key = 'articles_watermark'")
+        row = cursor.fetchone()
+        watermark = int(row[0]) if row else 0
+        try:
+            cursor.execute('SELECT id, title, filename FROM articles WHERE id > ? ORDER BY id', (watermark,))
+            articles = cursor.fetchall()
+        except sqlite3.OperationalError:
+            return 0  # articles table not created yet
+        if not articles:
+            return 0
+
+        cursor.executemany(
+            'INSERT INTO content_index (content_hash, title_key, filename) VALUES (NULL, ?, ?)',
+            [(title_key(title), filename) for _, title, filename in articles if title_key(title)]
+        )
+        cursor.execute("INSERT OR REPLACE INTO content_index_meta (key, value) VALUES ('articles_watermark', ?)",
+                       (str(articles[-1][0]),))
+        return len(articles)
+
+    def sync(self) -> int:
+        """Catch up with articles written since the last lookup"""
+        conn = self._connect()
+        try:
+            added = self._sync_articles(conn.cursor())
+            conn.commit()
+            return added
+        finally:
+            conn.close()
+
+    def find_duplicate(self, digest: str, title: str) -> Optional[Tuple[str, str]]:
+        """Return ('content'|'title', matching filename) for a known article"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            if self._sync_articles(cursor):
+                conn.commit()
+            cursor.execute('SELECT filename FROM content_index WHERE content_hash = ? LIMIT 1', (digest,))
+            row = cursor.fetchone()
+            if row:
+                return 'content', row[0]
+
+            key = title_key(title)
+            if key:
+                cursor.execute('SELECT filename FROM content_index WHERE title_key = ? LIMIT 1', (key,))
+                row = cursor.fetchone()
+                if row:
+                    return 'title', row[0]
+            return None
+        finally:
+            conn.close()
+
+    def add(self, digest: Optional[str], title: str, filename: str):
+        """Register a newly saved article"""
+        conn = self._connect()
+        conn.execute('INSERT INTO content_index (content_hash, title_key, filename) VALUES (?, ?, ?)',
+                     (digest, title_key(title), filename))
+        conn.commit()
+        conn.close()
@@ -119,6 +119,22 @@ class DatabaseManager:
                     except:
                         pass
     
+    @contextmanager
+    def transaction(self, timeout: float = 30.0):
+        """Run several statements in one explicit transaction.
+        
+        Pooled connections are in autocommit mode, so without this every
+        statement would be its own transaction (and its own fsync).
+        """
+        with self.get_connection(timeout) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn.cursor()
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
     def execute_query(self, query: str, params: Optional[Tuple] = None, fetch: str = None) -> Any:
         """Execute a query with automatic retry and proper error handling"""
         max_retries = 3
@@ -164,10 +180,8 @@ class DatabaseManager:
         
         for attempt in range(max_retries):
             try:
-                with self.get_connection() as conn:
-                    cursor = conn.cursor()
+                with self.transaction() as cursor:
                     cursor.executemany(query, params_list)
-                    conn.commit()
                     return
                     
             except sqlite3.OperationalError as e:
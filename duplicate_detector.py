@@ -6,18 +6,32 @@ Analyzes articles for duplicates and keeps the most relevant ones
 import sqlite3
 import hashlib
 import re
-from collections import defaultdict
+import io
+import json
+import argparse
+import contextlib
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from difflib import SequenceMatcher
 from datetime import datetime
 import logging
+from minhash_index import MinHashLSHIndex, candidate_neighbours
 
 logger = logging.getLogger(__name__)
 
 class DuplicateDetector:
-    def __init__(self, db_path='news_database.db'):
+    def __init__(self, db_path='news_database.db', similarity_threshold=0.85,
+                 title_similarity_threshold=0.9, content_similarity_threshold=0.95,
+                 near_duplicate_threshold=0.75):
         self.db_path = db_path
-        self.similarity_threshold = 0.85  # 85% similarity threshold
-        self.title_similarity_threshold = 0.9  # 90% for titles
+        self.similarity_threshold = similarity_threshold  # 85% similarity threshold
+        self.title_similarity_threshold = title_similarity_threshold  # 90% for titles
+        self.content_similarity_threshold = content_similarity_threshold  # 95% content alone
+        self.near_duplicate_threshold = near_duplicate_threshold  # 75% lower bound for near-duplicates
+        
+        # Candidate pairs come from MinHash/LSH buckets; only those are compared exactly
+        self.lsh_index = MinHashLSHIndex(db_path)
+        self._features = {}
         
     def connect_db(self):
         """Connect to the database"""
@@ -51,6 +65,45 @@ class DuplicateDetector:
         # Calculate sequence similarity
         return SequenceMatcher(None, norm1, norm2).ratio()
     
+    def _text_features(self, article):
+        """Normalized title/content and content hash of an article, computed once per article"""
+        article_id, title, content = article[0], article[1], article[2]
+        cached = self._features.get(article_id)
+        if cached and cached[0] is title and cached[1] is content:
+            return cached[2]
+        
+        features = {
+            'title': self.normalize_text(title) if title else None,
+            'content': self.normalize_text(content) if content else None,
+        }
+        features['hash'] = hashlib.md5(features['content'].encode()).hexdigest() if content else ""
+        self._features[article_id] = (title, content, features)
+        return features
+    
+    @staticmethod
+    def _similar_at_least(features1, features2, field, threshold):
+        """SequenceMatcher ratio >= threshold, checking cheap upper bounds first"""
+        norm1, norm2 = features1[field], features2[field]
+        if norm1 is None or norm2 is None:
+            return False
+        total = len(norm1) + len(norm2)
+        if not total:
+            return threshold <= 1.0
+        # real_quick_ratio() and quick_ratio() bounds without building a matcher
+        if 2.0 * min(len(norm1), len(norm2)) / total < threshold:
+            return False
+        chars1 = features1.setdefault(field + '_chars', Counter(norm1))
+        chars2 = features2.setdefault(field + '_chars', Counter(norm2))
+        if 2.0 * sum((chars1 & chars2).values()) / total < threshold:
+            return False
+        return SequenceMatcher(None, norm1, norm2).ratio() >= threshold
+    
+    @staticmethod
+    def _similarity(norm1, norm2):
+        if norm1 is None or norm2 is None:
+            return 0.0
+        return SequenceMatcher(None, norm1, norm2).ratio()
+    
     def get_content_hash(self, content):
         """Generate a hash for content comparison"""
         if not content:
@@ -99,17 +152,68 @@ class DuplicateDetector:
         print(f"📊 Analyzing {len(articles)} articles for duplicates...")
         
         # Group articles for duplicate detection
-        duplicates = self.find_duplicates(articles)
+        buckets = self._indexed_buckets(articles) if table_name == 'articles' else None
+        duplicates = self.find_duplicates(articles, buckets)
         
         return duplicates, table_name
     
-    def find_duplicates(self, articles):
-        """Find duplicate articles using multiple criteria"""
+    def _candidate_neighbours(self, articles, buckets=None):
+        """Candidate near-duplicates per article id: shared LSH bucket, URL or content hash"""
+        if buckets is None:
+            buckets = defaultdict(list)
+            for article in articles:
+                signature = self.lsh_index.signature_for(article[1], article[2])
+                for key in self.lsh_index.band_keys(signature):
+                    buckets[key].append(article[0])
+        
+        # Exact URL and content-hash matches are candidates too, whatever their bucket size
+        exact = defaultdict(list)
+        for article in articles:
+            if article[3]:
+                exact[('url', article[3])].append(article[0])
+            content_hash = self._text_features(article)['hash']
+            if content_hash:
+                exact[('hash', content_hash)].append(article[0])
+        
+        neighbours = candidate_neighbours(buckets)
+        for members in exact.values():
+            if len(members) > 1:
+                for article_id in members:
+                    neighbours[article_id].update(m for m in members if m != article_id)
+        return neighbours
+    
+    def _indexed_buckets(self, articles):
+        """LSH buckets for rows of the articles table, from the stored index"""
+        self.lsh_index.sync()
+        ids = {article[0] for article in articles}
+        buckets = self.lsh_index.load_buckets(ids)
+        
+        # Rows the index has not seen (e.g. written with explicit ids) are signed here
+        missing = ids - self.lsh_index.indexed_ids()
+        for article in articles:
+            if article[0] in missing:
+                signature = self.lsh_index.signature_for(article[1], article[2])
+                for key in self.lsh_index.band_keys(signature):
+                    buckets[key].append(article[0])
+        return buckets
+    
+    def find_duplicates(self, articles, buckets=None):
+        """Find duplicate articles using multiple criteria.
+        
+        Each article is only compared with its LSH/URL/hash candidates that come
+        after it, so the groups match a full pairwise scan for everything the
+        LSH bands surface. ``buckets`` (bucket -> ids) can be passed from the
+        stored index; otherwise signatures are computed here.
+        """
         duplicates = []
         processed_ids = set()
         
         print("🔍 Detecting duplicates...")
         
+        self._features = {}
+        position = {article[0]: i for i, article in enumerate(articles)}
+        neighbours = self._candidate_neighbours(articles, buckets)
+        
         for i, article1 in enumerate(articles):
             if article1[0] in processed_ids:
                 continue
@@ -117,7 +221,9 @@ class DuplicateDetector:
             duplicate_group = [article1]
             processed_ids.add(article1[0])
             
-            for j, article2 in enumerate(articles[i+1:], i+1):
+            later = sorted(position[c] for c in neighbours.get(article1[0], ()) if position.get(c, -1) > i)
+            for j in later:
+                article2 = articles[j]
                 if article2[0] in processed_ids:
                     continue
                 
@@ -143,28 +249,94 @@ class DuplicateDetector:
         if url1 and url2 and url1 == url2:
             return True
         
-        # Check title similarity
-        title_similarity = self.calculate_similarity(title1, title2)
-        if title_similarity >= self.title_similarity_threshold:
-            # If titles are very similar, check content
-            content_similarity = self.calculate_similarity(content1, content2)
-            if content_similarity >= self.similarity_threshold:
-                return True
+        features1 = self._text_features(article1)
+        features2 = self._text_features(article2)
         
         # Check content hash for exact content matches
-        if content1 and content2:
-            hash1 = self.get_content_hash(content1)
-            hash2 = self.get_content_hash(content2)
-            if hash1 == hash2 and hash1 != "":
-                return True
+        if features1['hash'] and features1['hash'] == features2['hash']:
+            return True
         
-        # Check for very high content similarity even with different titles
-        if content1 and content2:
-            content_similarity = self.calculate_similarity(content1, content2)
-            if content_similarity >= 0.95:  # 95% content similarity
-                return True
+        # Check title similarity: if titles are very similar, the content needs
+        # the lower threshold, otherwise very high content similarity alone
+        if self._similar_at_least(features1, features2, 'title', self.title_similarity_threshold):
+            content_threshold = min(self.similarity_threshold, self.content_similarity_threshold)
+        else:
+            content_threshold = self.content_similarity_threshold
         
-        return False
+        return self._similar_at_least(features1, features2, 'content', content_threshold)
+    
+    def check_article(self, title, content, url=None, exclude_id=None):
+        """Stored articles that duplicate a single (new) article, via the LSH index"""
+        self.lsh_index.sync()
+        candidate_ids = self.lsh_index.candidates(self.lsh_index.signature_for(title, content), exclude_id)
+        
+        conn = self.connect_db()
+        cursor = conn.cursor()
+        if url:
+            cursor.execute('SELECT id FROM articles WHERE url_hash = ?', (url,))
+            candidate_ids.update(row[0] for row in cursor.fetchall())
+        candidate_ids.discard(exclude_id)
+        
+        candidates = []
+        ids = list(candidate_ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(f'''
+                SELECT id, title, content, url_hash, source_name, date_added,
+                       COALESCE(importance_score, 5), COALESCE(sentiment_score, 0.0), date_added
+                FROM articles WHERE id IN ({','.join('?' * len(chunk))})
+            ''', chunk)
+            candidates.extend(cursor.fetchall())
+        conn.close()
+        
+        new_article = (None, title, content, url, None, None, 5, 0.0, None)
+        return [article for article in candidates if self.is_duplicate(new_article, article)]
+    
+    def score_article(self, article):
+        """Quality score used to pick the article kept for a group (or story)"""
+        # Updated indices for articles table: id, title, content, url_hash, source_name, date_added, importance_score, sentiment_score, last_updated
+        id_, title, content, url_hash, source_name, date_added, importance_score, sentiment_score, last_updated = article
+        
+        score = 0
+        
+        # Content length (longer is often better)
+        if content:
+            score += min(len(content) / 1000, 5)  # Max 5 points for content length
+        
+        # Importance score (1-10 scale)
+        if importance_score:
+            score += importance_score / 2  # Max 5 points for importance
+        
+        # Sentiment score (positive sentiment preferred for news)
+        if sentiment_score and sentiment_score > 0:
+            score += min(sentiment_score * 2, 1)  # Max 1 point for positive sentiment
+        
+        # Source reputation (prefer major sources)
+        reputable_sources = ['bbc', 'cnn', 'reuters', 'ap', 'nytimes', 'guardian', 'washingtonpost']
+        if source_name:
+            for rep_source in reputable_sources:
+                if rep_source in source_name.lower():
+                    score += 2
+                    break
+        
+        # Recency (prefer newer articles)
+        if date_added:
+            try:
+                from datetime import datetime
+                article_date = datetime.fromisoformat(date_added.replace('Z', '+00:00'))
+                days_old = (datetime.now() - article_date.replace(tzinfo=None)).days
+                if days_old <= 1:
+                    score += 3
+                elif days_old <= 7:
+                    score += 1
+            except:
+                pass
+        
+        # Title quality (prefer longer, more descriptive titles)
+        if title:
+            score += min(len(title) / 50, 1)  # Max 1 point for title length
+        
+        return score
     
     def select_best_article(self, duplicate_group):
         """Select the best article from a duplicate group"""
@@ -176,48 +348,7 @@ class DuplicateDetector:
         best_score = -1
         
         for article in duplicate_group:
-            # Updated indices for articles table: id, title, content, url_hash, source_name, date_added, importance_score, sentiment_score, last_updated
-            id_, title, content, url_hash, source_name, date_added, importance_score, sentiment_score, last_updated = article
-            
-            score = 0
-            
-            # Content length (longer is often better)
-            if content:
-                score += min(len(content) / 1000, 5)  # Max 5 points for content length
-            
-            # Importance score (1-10 scale)
-            if importance_score:
-                score += importance_score / 2  # Max 5 points for importance
-            
-            # Sentiment score (positive sentiment preferred for news)
-            if sentiment_score and sentiment_score > 0:
-                score += min(sentiment_score * 2, 1)  # Max 1 point for positive sentiment
-            
-            # Source reputation (prefer major sources)
-            reputable_sources = ['bbc', 'cnn', 'reuters', 'ap', 'nytimes', 'guardian', 'washingtonpost']
-            if source_name:
-                for rep_source in reputable_sources:
-                    if rep_source in source_name.lower():
-                        score += 2
-                        break
-            
-            # Recency (prefer newer articles)
-            if date_added:
-                try:
-                    from datetime import datetime
-                    article_date = datetime.fromisoformat(date_added.replace('Z', '+00:00'))
-                    days_old = (datetime.now() - article_date.replace(tzinfo=None)).days
-                    if days_old <= 1:
-                        score += 3
-                    elif days_old <= 7:
-                        score += 1
-                except:
-                    pass
-            
-            # Title quality (prefer longer, more descriptive titles)
-            if title:
-                score += min(len(title) / 50, 1)  # Max 1 point for title length
-            
+            score = self.score_article(article)
             if score > best_score:
                 best_score = score
                 best_article = article
@@ -231,6 +362,7 @@ class DuplicateDetector:
         
         total_removed = 0
         total_kept = 0
+        removed_ids = []
         
         print(f"🗑️  Processing {len(duplicates)} duplicate groups...")
         
@@ -247,14 +379,18 @@ class DuplicateDetector:
                 article = next(a for a in group if a[0] == article_id)
                 print(f"   ❌ Removing: ID {article_id} - \"{article[1][:60]}...\"")
                 
-                if not dry_run:
-                    cursor.execute('DELETE FROM articles WHERE id = ?', (article_id,))
+                removed_ids.append(article_id)
                 
                 total_removed += 1
             
             total_kept += 1
         
         if not dry_run:
+            from story_clusters import forget_articles
+            # The whole plan goes out in one batched statement and one transaction
+            forget_articles(cursor, removed_ids)
+            cursor.executemany('DELETE FROM articles WHERE id = ?', [(article_id,) for article_id in removed_ids])
+            self.lsh_index.remove(removed_ids, conn)
             conn.commit()
             print(f"\n✅ Database changes committed!")
         else:
@@ -307,24 +443,30 @@ class DuplicateDetector:
         conn.close()
         
         near_duplicates = []
-        processed = set()
         
         print("🔍 Finding near-duplicates (75-85% similarity)...")
         
+        # Only LSH candidates are compared; pairs below roughly 0.4 shingle overlap are not
+        self._features = {}
+        position = {article[0]: i for i, article in enumerate(articles)}
+        buckets = defaultdict(list)
+        for article in articles:
+            for key in self.lsh_index.band_keys(self.lsh_index.signature_for(article[1], article[2])):
+                buckets[key].append(article[0])
+        neighbours = candidate_neighbours(buckets)
+        
         for i, article1 in enumerate(articles):
-            if article1[0] in processed:
-                continue
-                
-            for j, article2 in enumerate(articles[i+1:], i+1):
-                if article2[0] in processed:
-                    continue
-                
-                title_sim = self.calculate_similarity(article1[1], article2[1])
-                content_sim = self.calculate_similarity(article1[2], article2[2])
+            later = sorted(position[c] for c in neighbours.get(article1[0], ()) if position[c] > i)
+            for j in later:
+                article2 = articles[j]
+                features1 = self._text_features(article1)
+                features2 = self._text_features(article2)
+                title_sim = self._similarity(features1['title'], features2['title'])
+                content_sim = self._similarity(features1['content'], features2['content'])
                 
                 # Near duplicate if high similarity but below duplicate threshold
-                if (0.75 <= title_sim < self.title_similarity_threshold or 
-                    0.75 <= content_sim < self.similarity_threshold):
+                if (self.near_duplicate_threshold <= title_sim < self.title_similarity_threshold or 
+                    self.near_duplicate_threshold <= content_sim < self.similarity_threshold):
                     
                     near_duplicates.append((article1, article2, title_sim, content_sim))
                     print(f"📄 Near-duplicate: \"{article1[1][:40]}...\" vs \"{article2[1][:40]}...\" (T:{title_sim:.2f}, C:{content_sim:.2f})")
@@ -369,8 +511,308 @@ class DuplicateDetector:
         conn.close()
         return len(empty_articles)
 
+ARTICLE_COLUMNS = '''
+    id, title, content, url_hash, source_name, date_added,
+    COALESCE(importance_score, 5) as relevance_score,
+    COALESCE(sentiment_score, 0.0) as sentiment_score,
+    COALESCE(date_added, date_added) as last_updated
+'''
+
+def _dedup_shard(detector, shard_key, article_ids, buckets):
+    """Worker: duplicate groups and keep/remove decisions for one shard.
+    
+    ``detector`` is the runner's, unpickled without re-running its setup DDL,
+    and ``buckets`` are the shard's stored LSH buckets, so only articles the
+    index has not seen yet are signed here.
+    """
+    conn = detector.connect_db()
+    cursor = conn.cursor()
+    articles = []
+    for start in range(0, len(article_ids), 500):
+        chunk = article_ids[start:start + 500]
+        cursor.execute(f'SELECT {ARTICLE_COLUMNS} FROM articles WHERE id IN ({",".join("?" * len(chunk))})', chunk)
+        articles.extend(cursor.fetchall())
+    conn.close()
+    
+    indexed = {article_id for members in buckets.values() for article_id in members}
+    for article in articles:
+        if article[0] not in indexed:
+            signature = detector.lsh_index.signature_for(article[1], article[2])
+            for key in detector.lsh_index.band_keys(signature):
+                buckets.setdefault(key, []).append(article[0])
+    
+    # Same order as a full analyze_articles pass
+    articles.sort(key=lambda article: (article[5] or '', article[0]), reverse=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        groups = detector.find_duplicates(articles, buckets)
+    
+    plan = []
+    for group in groups:
+        best_id = detector.select_best_article(group)[0]
+        plan.extend((best_id, article[0]) for article in group if article[0] != best_id)
+    return shard_key, len(groups), plan
+
+class ShardedDedupRunner:
+    """Offline dedup across a process pool with checkpointed shards.
+    
+    Articles are split into shards (date windows, or connected groups of LSH
+    candidates), each shard is deduplicated by a worker, and its keep/remove
+    decisions are saved together with the shard's checkpoint. An interrupted
+    run resumes with the shards still pending; the finished plan is applied
+    in one transaction with apply_plan.
+    """
+    
+    def __init__(self, db_path='news_database.db', workers=None, window_days=7, **thresholds):
+        self.db_path = db_path
+        self.workers = workers
+        self.window_days = window_days
+        self.thresholds = thresholds
+        self.detector = DuplicateDetector(db_path, **thresholds)
+        self._init_db()
+    
+    def _init_db(self):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dedup_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                shard_by TEXT NOT NULL,
+                status TEXT DEFAULT 'running', -- running, planned, applied
+                shards_total INTEGER DEFAULT 0,
+                started_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                finished_at DATETIME
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dedup_shards (
+                run_id INTEGER NOT NULL,
+                shard_key TEXT NOT NULL,
+                article_ids TEXT NOT NULL, -- JSON list, fixed when the run is planned
+                status TEXT DEFAULT 'pending', -- pending, done
+                groups_found INTEGER DEFAULT 0,
+                finished_at DATETIME,
+                PRIMARY KEY (run_id, shard_key)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS dedup_plan (
+                run_id INTEGER NOT NULL,
+                shard_key TEXT NOT NULL,
+                keep_id INTEGER NOT NULL,
+                remove_id INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_dedup_plan_run ON dedup_plan(run_id)')
+        conn.commit()
+        conn.close()
+    
+    def _date_shards(self, cursor):
+        cursor.execute('SELECT id, CAST(julianday(date_added) AS INTEGER) FROM articles')
+        shards = defaultdict(list)
+        for article_id, day in cursor.fetchall():
+            window = (day // self.window_days) * self.window_days if day is not None else None
+            shards[f"date:{window}"].append(article_id)
+        return shards
+    
+    def _lsh_shards(self, cursor):
+        """Connected components of the LSH / URL / content-hash candidate graph"""
+        index = self.detector.lsh_index
+        index.sync()
+        neighbours = candidate_neighbours(index.load_buckets())
+        for column in ('url_hash', 'content_hash'):
+            cursor.execute(f'''
+                SELECT GROUP_CONCAT(id) FROM articles
+                WHERE {column} IS NOT NULL AND {column} != ''
+                GROUP BY {column} HAVING COUNT(*) > 1
+            ''')
+            for (ids,) in cursor.fetchall():
+                members = [int(article_id) for article_id in ids.split(',')]
+                for article_id in members:
+                    neighbours[article_id].update(m for m in members if m != article_id)
+        
+        shards = {}
+        seen = set()
+        for start_id in neighbours:
+            if start_id in seen:
+                continue
+            component = []
+            stack = [start_id]
+            seen.add(start_id)
+            while stack:
+                article_id = stack.pop()
+                component.append(article_id)
+                for other in neighbours.get(article_id, ()):
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            if len(component) > 1:
+                shards[f"lsh:{min(component)}"] = component
+        return shards
+    
+    def _open_run(self, shard_by, resume):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        if resume:
+            cursor.execute('''
+                SELECT id FROM dedup_runs WHERE shard_by = ? AND status = 'running'
+                ORDER BY id DESC LIMIT 1
+            ''', (shard_by,))
+            row = cursor.fetchone()
+            if row:
+                conn.close()
+                print(f"♻️  Resuming dedup run {row[0]}")
+                return row[0]
+        
+        shards = self._lsh_shards(cursor) if shard_by == 'lsh' else self._date_shards(cursor)
+        cursor.execute('INSERT INTO dedup_runs (shard_by, shards_total) VALUES (?, ?)', (shard_by, len(shards)))
+        run_id = cursor.lastrowid
+        cursor.executemany('''
+            INSERT INTO dedup_shards (run_id, shard_key, article_ids) VALUES (?, ?, ?)
+        ''', [(run_id, key, json.dumps(sorted(ids))) for key, ids in shards.items()])
+        conn.commit()
+        conn.close()
+        print(f"🧩 Dedup run {run_id}: {len(shards)} shards by {shard_by}")
+        return run_id
+    
+    def run(self, shard_by='lsh', resume=True):
+        """Plan removals for every pending shard; returns the run id"""
+        if shard_by not in ('date', 'lsh'):
+            raise ValueError(f"Unknown shard mode: {shard_by}")
+        run_id = self._open_run(shard_by, resume)
+        
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute("SELECT shard_key, article_ids FROM dedup_shards WHERE run_id = ? AND status = 'pending'",
+                       (run_id,))
+        pending = cursor.fetchall()
+        cursor.execute("SELECT COUNT(*) FROM dedup_shards WHERE run_id = ?", (run_id,))
+        total = cursor.fetchone()[0]
+        done = total - len(pending)
+        
+        # Bucket keys per article, read once here instead of re-signing every article in the workers
+        article_buckets = defaultdict(list)
+        if pending:
+            self.detector.lsh_index.sync()
+            for bucket, members in self.detector.lsh_index.load_buckets().items():
+                for article_id in members:
+                    article_buckets[article_id].append(bucket)
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = []
+            for key, ids in pending:
+                ids = json.loads(ids)
+                shard_buckets = defaultdict(list)
+                for article_id in ids:
+                    for bucket in article_buckets.get(article_id, ()):
+                        shard_buckets[bucket].append(article_id)
+                futures.append(pool.submit(_dedup_shard, self.detector, key, ids, dict(shard_buckets)))
+            for future in as_completed(futures):
+                shard_key, groups_found, plan = future.result()
+                # Plan rows and checkpoint commit together, so a shard is never half recorded
+                cursor.executemany('''
+                    INSERT INTO dedup_plan (run_id, shard_key, keep_id, remove_id) VALUES (?, ?, ?, ?)
+                ''', [(run_id, shard_key, keep_id, remove_id) for keep_id, remove_id in plan])
+                cursor.execute('''
+                    UPDATE dedup_shards SET status = 'done', groups_found = ?, finished_at = ?
+                    WHERE run_id = ? AND shard_key = ?
+                ''', (groups_found, datetime.now().isoformat(), run_id, shard_key))
+                conn.commit()
+                done += 1
+                if plan:
+                    print(f"🔄 Shard {shard_key}: {groups_found} groups, {len(plan)} to remove ({done}/{total})")
+        
+        cursor.execute("UPDATE dedup_runs SET status = 'planned', finished_at = ? WHERE id = ?",
+                       (datetime.now().isoformat(), run_id))
+        conn.commit()
+        conn.close()
+        return run_id
+    
+    def get_plan_summary(self, run_id):
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(DISTINCT keep_id), COUNT(*) FROM dedup_plan WHERE run_id = ?
+        ''', (run_id,))
+        kept, removed = cursor.fetchone()
+        cursor.execute('SELECT status FROM dedup_runs WHERE id = ?', (run_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return {'run_id': run_id, 'status': row[0] if row else None, 'groups': kept, 'removals': removed}
+    
+    def apply_plan(self, run_id):
+        """Delete every planned removal of a finished run in one transaction.
+        
+        Groups whose kept article no longer exists are left alone, so applying
+        a stale plan never deletes every copy of a story.
+        """
+        from story_clusters import forget_articles
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('SELECT status FROM dedup_runs WHERE id = ?', (run_id,))
+        row = cursor.fetchone()
+        if not row or row[0] != 'planned':
+            conn.close()
+            raise ValueError(f"Dedup run {run_id} is not ready to apply (status: {row[0] if row else 'missing'})")
+        
+        try:
+            # Write lock first, so no kept article can disappear between the check and the deletes
+            conn.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT COUNT(DISTINCT keep_id) FROM dedup_plan p
+                WHERE run_id = ? AND NOT EXISTS (SELECT 1 FROM articles a WHERE a.id = p.keep_id)
+            ''', (run_id,))
+            skipped_groups = cursor.fetchone()[0]
+            cursor.execute('''
+                SELECT DISTINCT remove_id FROM dedup_plan p
+                WHERE run_id = ? AND EXISTS (SELECT 1 FROM articles a WHERE a.id = p.keep_id)
+            ''', (run_id,))
+            removed_ids = [row[0] for row in cursor.fetchall()]
+            
+            forget_articles(cursor, removed_ids)
+            cursor.executemany('DELETE FROM articles WHERE id = ?', [(article_id,) for article_id in removed_ids])
+            self.detector.lsh_index.remove(removed_ids, conn)
+            cursor.execute("UPDATE dedup_runs SET status = 'applied' WHERE id = ?", (run_id,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        if skipped_groups:
+            print(f"⚠️  Skipped {skipped_groups} groups whose kept article no longer exists")
+        print(f"✅ Applied dedup run {run_id}: removed {len(removed_ids)} articles")
+        return len(removed_ids)
+
+def run_sharded(args):
+    """Command-line entry for the parallel offline dedup"""
+    runner = ShardedDedupRunner(args.db, workers=args.workers, window_days=args.window_days)
+    if args.apply:
+        runner.apply_plan(args.apply)
+        return
+    
+    run_id = runner.run(shard_by=args.shard_by, resume=not args.fresh)
+    summary = runner.get_plan_summary(run_id)
+    print(f"\n📊 Dedup run {run_id} planned:")
+    print(f"   🔄 Duplicate groups: {summary['groups']}")
+    print(f"   🗑️  Articles to remove: {summary['removals']}")
+    print(f"   ▶️  Apply with: python duplicate_detector.py --apply {run_id}")
+
 def main():
     """Main function to run duplicate detection"""
+    parser = argparse.ArgumentParser(description="WiseNews duplicate article detector")
+    parser.add_argument('--parallel', action='store_true', help="sharded dedup across a process pool")
+    parser.add_argument('--db', default='news_database.db', help="database for --parallel and --apply")
+    parser.add_argument('--shard-by', choices=['lsh', 'date'], default='lsh')
+    parser.add_argument('--window-days', type=int, default=7, help="date shard width")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--fresh', action='store_true', help="start a new run instead of resuming")
+    parser.add_argument('--apply', type=int, metavar='RUN_ID', help="apply a planned run in one transaction")
+    args = parser.parse_args()
+    
+    if args.parallel or args.apply:
+        run_sharded(args)
+        return
+    
     detector = DuplicateDetector()
     
     print("🔍 WiseNews Duplicate Article Detector")
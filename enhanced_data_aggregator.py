@@ -17,10 +17,17 @@ import asyncio
 import aiohttp
 import websocket
 import schedule
-from collections import defaultdict
+from collections import defaultdict, deque
+from write_behind_buffer import WriteBehindBuffer
 
 logger = logging.getLogger(__name__)
 
+# Recent updates kept in memory per feed type
+LIVE_CACHE_SIZE = 100
+# Live update rows are written in batches of this size or after this many seconds
+LIVE_FLUSH_SIZE = 200
+LIVE_FLUSH_INTERVAL = 2.0
+
 class EnhancedDataAggregator:
     def __init__(self):
         # API Keys (to be configured)
@@ -57,12 +64,18 @@ class EnhancedDataAggregator:
         self.data_sources = self._init_data_sources()
         
         # Live feed storage
-        self.live_data_cache = defaultdict(list)
+        self.live_data_cache = defaultdict(lambda: deque(maxlen=LIVE_CACHE_SIZE))
         self.cache_lock = threading.Lock()
         
         # Initialize database
         self._init_live_feeds_db()
         
+        # Websocket ticks and aggregation passes only queue rows; a background thread writes them
+        self.live_buffer = WriteBehindBuffer('''
+            INSERT INTO live_feeds (feed_type, source, title, content, data_json, importance_score, is_breaking)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', name='live-feeds', flush_size=LIVE_FLUSH_SIZE, flush_interval=LIVE_FLUSH_INTERVAL)
+        
         # Start live feeds
         self.websocket_threads = []
         self.running = True
@@ -575,38 +588,32 @@ class EnhancedDataAggregator:
             logger.error(f"Error in Binance WebSocket: {e}")
     
     def _store_live_update(self, update_data):
-        """Store live update in database"""
+        """Queue a live update for the database and cache it for real-time access"""
         try:
-            conn = sqlite3.connect('news_database.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO live_feeds (feed_type, source, title, content, data_json, importance_score, is_breaking)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            importance = update_data.get('importance_score', 5)
+            self.live_buffer.add((
                 update_data['feed_type'],
                 update_data['source'],
                 update_data['title'],
                 update_data['content'],
                 update_data.get('data_json'),
-                update_data.get('importance_score', 5),
-                update_data.get('importance_score', 5) >= 8
+                importance,
+                importance >= 8
             ))
             
-            conn.commit()
-            conn.close()
-            
-            # Cache for real-time access
+            # The deque's maxlen drops the oldest update per feed type
             with self.cache_lock:
                 self.live_data_cache[update_data['feed_type']].append(update_data)
-                # Keep only last 100 updates per feed type
-                if len(self.live_data_cache[update_data['feed_type']]) > 100:
-                    self.live_data_cache[update_data['feed_type']] = \
-                        self.live_data_cache[update_data['feed_type']][-100:]
-            
+        
         except Exception as e:
             logger.error(f"Error storing live update: {e}")
     
+    def get_cached_updates(self, feed_type, limit=LIVE_CACHE_SIZE):
+        """Most recent cached updates for a feed type, newest first"""
+        with self.cache_lock:
+            updates = list(self.live_data_cache.get(feed_type, ()))
+        return updates[::-1][:limit]
+    
     async def aggregate_all_sources(self):
         """Aggregate data from all sources"""
         try:
@@ -641,6 +648,9 @@ class EnhancedDataAggregator:
     def get_live_feeds(self, feed_types=None, limit=50):
         """Get recent live feeds"""
         try:
+            # Make queued updates visible to the query
+            self.live_buffer.flush()
+            
             conn = sqlite3.connect('news_database.db')
             cursor = conn.cursor()
             
@@ -708,6 +718,7 @@ class EnhancedDataAggregator:
     def stop(self):
         """Stop all feeds and threads"""
         self.running = False
+        self.live_buffer.close()
         logger.info("Enhanced Data Aggregator stopped")
 
 # Global instance
@@ -9,6 +9,8 @@ import datetime
 from datetime import timedelta
 import logging
 
+from live_events_archiver import ensure_live_event_column
+
 logger = logging.getLogger(__name__)
 
 def enhance_live_events_system():
@@ -20,6 +22,7 @@ def enhance_live_events_system():
     try:
         conn = sqlite3.connect('news_database.db')
         cursor = conn.cursor()
+        ensure_live_event_column(cursor)
         
         current_time = datetime.datetime.now()
         current_iso = current_time.isoformat()
@@ -97,11 +100,7 @@ def enhance_live_events_system():
                    start_time, end_time, venue, status, metadata
             FROM live_events 
             WHERE status = 'completed' 
-            AND id NOT IN (
-                SELECT DISTINCT CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER)
-                FROM articles 
-                WHERE source_type = 'live_event' AND filename LIKE 'live_event_%'
-            )
+            AND NOT EXISTS (SELECT 1 FROM articles WHERE articles.live_event_id = live_events.id)
             AND id NOT IN (
                 SELECT DISTINCT id FROM notifications 
                 WHERE notification_type = 'live_event'
@@ -346,8 +345,8 @@ def create_enhanced_article(cursor, event_id, title, content, category, event_ty
         INSERT INTO articles (
             title, content, source_type, source_name, filename, 
             date_added, file_path, category, keywords, data_source, tags,
-            importance_score
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            importance_score, live_event_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', (
         title,
         content,
@@ -360,7 +359,8 @@ def create_enhanced_article(cursor, event_id, title, content, category, event_ty
         keywords,
         'live_events_archive',
         f"live_event,{category},{event_type}",
-        0.85  # High importance for archived live events
+        0.85,  # High importance for archived live events
+        event_id
     ))
 
 def test_enhanced_system():
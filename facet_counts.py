@@ -0,0 +1,256 @@
+"""
+Facet Counts for WiseNews
+Materialized article counts per source, category, read status and day, kept
+current by triggers on the articles table; soft-deleted articles (is_deleted)
+are not counted. Filters, dashboards and analytics read a handful of rows
+from article_facets instead of running DISTINCT or GROUP BY over every
+article.
+
+Rebuild from scratch (if counts ever drift): python facet_counts.py [db_path]
+"""
+
+import logging
+import sqlite3
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FACET_TABLE = 'article_facets'
+# (facet, column it is read from, expression over a row); the first facet whose
+# column exists wins, so 'day' uses date_added in the full app, created_at in app.py
+FACET_DEFINITIONS = [
+    ('source_type', 'source_type', '{row}.source_type'),
+    ('source_name', 'source_name', '{row}.source_name'),
+    ('source', 'source', '{row}.source'),
+    ('category', 'category', '{row}.category'),
+    ('read_status', 'read_status', '{row}.read_status'),
+    ('day', 'date_added', 'DATE({row}.date_added)'),
+    ('day', 'created_at', 'DATE({row}.created_at)'),
+]
+# Row counted for every article
+TOTAL_FACET = 'total'
+# Bumped whenever the trigger bodies change; older triggers are replaced and the counts rebuilt
+# (as they are when the articles table gains a facet column or the soft-delete flag)
+TRIGGER_VERSION = 2
+# Soft-delete flag; rows with it set are left out of every count
+DELETED_COLUMN = 'is_deleted'
+
+class FacetCounts:
+    """Trigger-maintained facet counts for an articles table"""
+
+    def __init__(self, db_path: str = 'news_database.db', table: str = 'articles'):
+        self.db_path = db_path
+        self.table = table
+        self.facets: Dict[str, Tuple[str, str]] = {}  # facet -> (column, expression)
+        self.soft_delete = False
+        self.available = False
+        self._checked = False
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+
+    def _expression(self, facet: str, row: str) -> str:
+        # NULL is stored as '' so it can be part of the key; read back as None
+        return f"IFNULL({self.facets[facet][1].format(row=row)}, '')"
+
+    def _counted(self, row: str) -> str:
+        """Whether a row is counted at all - the listings' ``is_deleted = 0``, never NULL"""
+        return f"IFNULL({row}.{DELETED_COLUMN} = 0, 0)" if self.soft_delete else '1'
+
+    def _trigger_prefix(self) -> str:
+        """Trigger names carry the version and the columns they were built for"""
+        layout = ','.join(column for column, _ in self.facets.values()) + (f',{DELETED_COLUMN}' if self.soft_delete else '')
+        return f'{FACET_TABLE}_v{TRIGGER_VERSION}_{zlib.crc32(layout.encode()):08x}'
+
+    def _drop_stale_triggers(self, cursor) -> bool:
+        """Drop triggers built for another version or column layout; True if there were any"""
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (self.table,))
+        current = f'{self._trigger_prefix()}_'
+        stale = [name for (name,) in cursor.fetchall()
+                 if name.startswith(f'{FACET_TABLE}_') and not name.startswith(current)]
+        for name in stale:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        return bool(stale)
+
+    def ensure(self) -> bool:
+        """Create the facet table and its triggers; (re)fills the table when either is new"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"PRAGMA table_info({self.table})")
+            columns = {column[1] for column in cursor.fetchall()}
+            if not columns:
+                return False
+            self.facets = {}
+            for facet, column, expression in FACET_DEFINITIONS:
+                if column in columns and facet not in self.facets:
+                    self.facets[facet] = (column, expression)
+            self.soft_delete = DELETED_COLUMN in columns
+
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FACET_TABLE,))
+            created = cursor.fetchone() is None
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {FACET_TABLE} (
+                    facet TEXT NOT NULL,
+                    value NOT NULL, -- untyped, so numeric facets (read_status) keep their type
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (facet, value)
+                ) WITHOUT ROWID
+            ''')
+            outdated = self._drop_stale_triggers(cursor)
+
+            trigger = self._trigger_prefix()
+            increments = ', '.join([f"('{TOTAL_FACET}', '', 1)"] +
+                                   [f"('{facet}', {self._expression(facet, 'new')}, 1)" for facet in self.facets])
+            increments = (f"INSERT INTO {FACET_TABLE} (facet, value, count) VALUES {increments}\n"
+                          f"ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;")
+            decrements = f"UPDATE {FACET_TABLE} SET count = count - 1 WHERE facet = '{TOTAL_FACET}' AND value = '';\n"
+            decrements += ''.join(
+                f"UPDATE {FACET_TABLE} SET count = count - 1 "
+                f"WHERE facet = '{facet}' AND value = {self._expression(facet, 'old')};\n"
+                for facet in self.facets
+            )
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger}_ai AFTER INSERT ON {self.table}
+                WHEN {self._counted('new')} BEGIN
+                    {increments}
+                END
+            ''')
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger}_ad AFTER DELETE ON {self.table}
+                WHEN {self._counted('old')} BEGIN
+                    {decrements}
+                END
+            ''')
+            if self.soft_delete:
+                # Soft delete / restore move the whole row out of / back into the counts
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {trigger}_au_deleted AFTER UPDATE OF {DELETED_COLUMN} ON {self.table}
+                    WHEN {self._counted('old')} AND NOT ({self._counted('new')}) BEGIN
+                        {decrements}
+                    END
+                ''')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {trigger}_au_restored AFTER UPDATE OF {DELETED_COLUMN} ON {self.table}
+                    WHEN NOT ({self._counted('old')}) AND {self._counted('new')} BEGIN
+                        {increments}
+                    END
+                ''')
+            for facet, (column, _) in self.facets.items():
+                old_value = self._expression(facet, 'old')
+                new_value = self._expression(facet, 'new')
+                # Only for rows counted before and after; the triggers above handle the rest
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {trigger}_au_{facet}
+                    AFTER UPDATE OF {column} ON {self.table}
+                    WHEN {old_value} IS NOT {new_value}
+                    AND {self._counted('old')} AND {self._counted('new')} BEGIN
+                        UPDATE {FACET_TABLE} SET count = count - 1 WHERE facet = '{facet}' AND value = {old_value};
+                        INSERT INTO {FACET_TABLE} (facet, value, count) VALUES ('{facet}', {new_value}, 1)
+                        ON CONFLICT (facet, value) DO UPDATE SET count = count + 1;
+                    END
+                ''')
+            if created or outdated:
+                self._fill(cursor)
+                logger.info(f"Built facet counts for {', '.join(self.facets)}")
+            conn.commit()
+            self.available = True
+        except sqlite3.Error as e:
+            logger.warning(f"Facet counts unavailable: {e}")
+            conn.rollback()
+            self.available = False
+        finally:
+            conn.close()
+            self._checked = True
+        return self.available
+
+    def ready(self) -> bool:
+        """ensure() once per process, then just report availability"""
+        return self.available if self._checked else self.ensure()
+
+    def _fill(self, cursor):
+        counted = self._counted(self.table)
+        cursor.execute(f'DELETE FROM {FACET_TABLE}')
+        cursor.execute(f'''
+            INSERT INTO {FACET_TABLE} (facet, value, count)
+            SELECT '{TOTAL_FACET}', '', COUNT(*) FROM {self.table} WHERE {counted}
+        ''')
+        for facet in self.facets:
+            expression = self._expression(facet, self.table)
+            cursor.execute(f'''
+                INSERT INTO {FACET_TABLE} (facet, value, count)
+                SELECT '{facet}', {expression}, COUNT(*) FROM {self.table} WHERE {counted} GROUP BY {expression}
+            ''')
+
+    def rebuild(self) -> float:
+        """Recount every facet from the articles table; returns seconds taken"""
+        started = time.time()
+        conn = self._connect()
+        try:
+            self._fill(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+        return time.time() - started
+
+    def counts(self, facet: str, order: str = 'count', limit: Optional[int] = None,
+               min_value: Optional[str] = None) -> List[Tuple]:
+        """(value, count) pairs of one facet, by count (largest first) or by value"""
+        if not self.ready() or facet not in self.facets:
+            return []
+        order_by = 'count DESC, value' if order == 'count' else 'value'
+        conditions = 'facet = ? AND count > 0'
+        params = [facet]
+        if min_value is not None:
+            conditions += ' AND value >= ?'
+            params.append(min_value)
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT value, count FROM {FACET_TABLE} WHERE {conditions}
+            ORDER BY {order_by} {'LIMIT ?' if limit else ''}
+        ''', params + ([limit] if limit else []))
+        rows = [(value if value != '' else None, count) for value, count in cursor.fetchall()]
+        conn.close()
+        return rows
+
+    def values(self, facet: str) -> List:
+        """Distinct values of a facet that still have articles, sorted (for filter menus)"""
+        return [value for value, _ in self.counts(facet, order='value')]
+
+    def total(self) -> int:
+        if not self.ready():
+            return 0
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT count FROM {FACET_TABLE} WHERE facet = ? AND value = ''", (TOTAL_FACET,))
+        row = cursor.fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def get_all(self, limit: Optional[int] = None) -> Dict:
+        """Every facet with its counts (largest first), plus the article total"""
+        result = {'total': 0, 'facets': {facet: [] for facet in self.facets}}
+        if not self.ready():
+            return result
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT facet, value, count FROM {FACET_TABLE} WHERE count > 0 ORDER BY facet, count DESC, value')
+        for facet, value, count in cursor.fetchall():
+            if facet == TOTAL_FACET:
+                result['total'] = count
+            elif facet in result['facets'] and (not limit or len(result['facets'][facet]) < limit):
+                result['facets'][facet].append({'value': value if value != '' else None, 'count': count})
+        conn.close()
+        return result
+
+if __name__ == "__main__":
+    facet_counts = FacetCounts(sys.argv[1] if len(sys.argv) > 1 else 'news_database.db')
+    if not facet_counts.ensure():
+        print("❌ Facet counts could not be set up (no articles table?)")
+        sys.exit(1)
+    print(f"📊 Recounting {', '.join(facet_counts.facets)}...")
+    print(f"✅ Rebuilt in {facet_counts.rebuild():.2f}s ({facet_counts.total()} articles)")
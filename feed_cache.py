@@ -0,0 +1,169 @@
+"""
+Conditional-GET Feed Cache for WiseNews
+Persists ETag / Last-Modified validators and last-seen entry IDs per RSS feed
+so unchanged feeds cost a 304 instead of a full download and parse
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How many entry IDs to remember per feed (feeds rarely carry more than 50 items)
+MAX_REMEMBERED_ENTRIES = 200
+
+class FeedValidatorStore:
+    """Per-feed HTTP validator and seen-entry store backed by SQLite"""
+
+    def __init__(self, db_path: str = 'news_database.db'):
+        self.db_path = db_path
+        self._init_db()
+
+    def _init_db(self):
+        """Create the feed_validators table if needed"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_validators (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                entry_ids TEXT, -- JSON list of entry IDs seen on the last full fetch
+                last_status INTEGER,
+                not_modified_count INTEGER DEFAULT 0,
+                last_checked DATETIME
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def entry_id(entry) -> Optional[str]:
+        """Stable identifier for a feed entry"""
+        return entry.get('id') or entry.get('link') or entry.get('title')
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        return {
+            'etag': row[0],
+            'last_modified': row[1],
+            'entry_ids': set(json.loads(row[2])) if row[2] else set(),
+            'last_status': row[3]
+        }
+
+    def get(self, feed_url: str) -> Optional[Dict]:
+        """Return stored validators for one feed"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT etag, last_modified, entry_ids, last_status
+            FROM feed_validators WHERE feed_url = ?
+        ''', (feed_url,))
+        row = cursor.fetchone()
+        conn.close()
+        return self._row_to_dict(row) if row else None
+
+    def load_all(self) -> Dict[str, Dict]:
+        """Return validators for every known feed in one query"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('SELECT feed_url, etag, last_modified, entry_ids, last_status FROM feed_validators')
+        validators = {row[0]: self._row_to_dict(row[1:]) for row in cursor.fetchall()}
+        conn.close()
+        return validators
+
+    @staticmethod
+    def conditional_headers(validators: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators"""
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def filter_new_entries(self, entries: Iterable, validators: Optional[Dict]) -> List:
+        """Drop entries that were already present on the previous fetch"""
+        seen = validators['entry_ids'] if validators else set()
+        return [entry for entry in entries if self.entry_id(entry) not in seen]
+
+    def remembered_ids(self, entries: Iterable, validators: Optional[Dict], processed: Iterable[str]) -> List[str]:
+        """Entry IDs to store after a fetch: those seen before plus those processed on this pass.
+
+        Entries whose article failed or that were cut by a per-feed limit stay
+        unrecorded, so the next pass offers them again.
+        """
+        seen = validators['entry_ids'] if validators else set()
+        processed = set(processed)
+        return [entry_id for entry_id in map(self.entry_id, entries) if entry_id in seen or entry_id in processed]
+
+    def _record_params(self, feed_url, status, etag, last_modified, entry_ids):
+        ids_json = None
+        if entry_ids is not None:
+            ids_json = json.dumps([i for i in entry_ids if i][:MAX_REMEMBERED_ENTRIES])
+        return (feed_url, etag, last_modified, ids_json, status,
+                1 if status == 304 else 0, datetime.now().isoformat())
+
+    _UPSERT = '''
+        INSERT INTO feed_validators
+            (feed_url, etag, last_modified, entry_ids, last_status, not_modified_count, last_checked)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(feed_url) DO UPDATE SET
+            etag = COALESCE(excluded.etag, feed_validators.etag),
+            last_modified = COALESCE(excluded.last_modified, feed_validators.last_modified),
+            entry_ids = COALESCE(excluded.entry_ids, feed_validators.entry_ids),
+            last_status = excluded.last_status,
+            not_modified_count = CASE WHEN excluded.last_status = 304
+                                      THEN feed_validators.not_modified_count + 1
+                                      ELSE 0 END,
+            last_checked = excluded.last_checked
+    '''
+
+    def record(self, feed_url: str, status: int, etag: Optional[str] = None,
+               last_modified: Optional[str] = None, entry_ids: Optional[List[str]] = None):
+        """Store the outcome of one feed fetch"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute(self._UPSERT, self._record_params(feed_url, status, etag, last_modified, entry_ids))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not store validators for {feed_url}: {e}")
+
+    def record_many(self, results: List[Dict]):
+        """Store several fetch outcomes in a single transaction"""
+        if not results:
+            return
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.executemany(self._UPSERT, [
+                self._record_params(r['feed_url'], r['status'], r.get('etag'),
+                                    r.get('last_modified'), r.get('entry_ids'))
+                for r in results
+            ])
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not store feed validators: {e}")
+
+    def get_statistics(self) -> Dict:
+        """Summary of how many feeds answered 304 on their last check"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*),
+                   SUM(CASE WHEN last_status = 304 THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN etag IS NOT NULL OR last_modified IS NOT NULL THEN 1 ELSE 0 END)
+            FROM feed_validators
+        ''')
+        total, not_modified, with_validators = cursor.fetchone()
+        conn.close()
+        return {
+            'feeds_tracked': total or 0,
+            'not_modified_last_check': not_modified or 0,
+            'feeds_with_validators': with_validators or 0
+        }
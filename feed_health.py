@@ -0,0 +1,213 @@
+"""
+Feed Health Registry for WiseNews
+Tracks success rate, latency and consecutive failures per RSS feed and trips a
+circuit breaker with exponential backoff so dead or slow feeds are skipped
+until a single probe request succeeds again
+"""
+
+import json
+import logging
+import random
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Consecutive failures before a feed's circuit opens
+FAILURE_THRESHOLD = 3
+# First backoff once open, doubled on every failed probe
+BASE_BACKOFF_SECONDS = 15 * 60
+MAX_BACKOFF_SECONDS = 24 * 60 * 60
+# Latency samples kept per feed for percentiles
+LATENCY_SAMPLES = 50
+
+STATE_CLOSED = 'closed'  # Healthy - fetched normally
+STATE_OPEN = 'open'  # Skipped until open_until
+STATE_HALF_OPEN = 'half_open'  # Backoff elapsed - next fetch is a probe
+
+def _percentile(samples: List[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return round(ordered[index], 1)
+
+class FeedHealthRegistry:
+    """Persistent per-feed health with a circuit breaker"""
+
+    def __init__(self, db_path: str = 'news_database.db',
+                 failure_threshold: int = FAILURE_THRESHOLD,
+                 base_backoff: float = BASE_BACKOFF_SECONDS,
+                 max_backoff: float = MAX_BACKOFF_SECONDS):
+        self.db_path = db_path
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create the feed health table if needed"""
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS feed_health (
+                feed_url TEXT PRIMARY KEY,
+                successes INTEGER DEFAULT 0,
+                failures INTEGER DEFAULT 0,
+                consecutive_failures INTEGER DEFAULT 0,
+                latencies TEXT, -- JSON list of recent latencies in ms
+                state TEXT DEFAULT 'closed',
+                open_until REAL, -- unix time the circuit may be probed again
+                last_success DATETIME,
+                last_failure DATETIME,
+                last_error TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def filter_allowed(self, feed_urls: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Drop feeds whose circuit is open; feeds past their backoff go through as probes"""
+        feed_urls = list(feed_urls)
+        now = now or time.time()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("SELECT feed_url, open_until FROM feed_health WHERE state = ?", (STATE_OPEN,))
+        blocked = set()
+        probes = []
+        for feed_url, open_until in cursor.fetchall():
+            if open_until and open_until > now:
+                blocked.add(feed_url)
+            else:
+                probes.append((STATE_HALF_OPEN, feed_url))
+        if probes:
+            cursor.executemany('UPDATE feed_health SET state = ? WHERE feed_url = ?', probes)
+            conn.commit()
+        conn.close()
+
+        allowed = [url for url in feed_urls if url not in blocked]
+        skipped = len(feed_urls) - len(allowed)
+        if skipped:
+            logger.info(f"Skipping {skipped} feeds with open circuits")
+        return allowed
+
+    def _backoff(self, consecutive_failures: int) -> float:
+        exponent = max(0, consecutive_failures - self.failure_threshold)
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** exponent))
+        # Jitter so feeds that failed together are not all probed together
+        return backoff * random.uniform(0.9, 1.1)
+
+    def record_many(self, outcomes: Iterable[Dict]):
+        """Apply fetch outcomes: dicts with feed_url, ok, latency_ms and optional error"""
+        outcomes = list(outcomes)
+        if not outcomes:
+            return
+
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.cursor()
+            placeholders = ','.join('?' * len(outcomes))
+            cursor.execute(f'''
+                SELECT feed_url, consecutive_failures, latencies, state
+                FROM feed_health WHERE feed_url IN ({placeholders})
+            ''', [outcome['feed_url'] for outcome in outcomes])
+            current = {row[0]: row[1:] for row in cursor.fetchall()}
+
+            now = time.time()
+            stamp = datetime.now().isoformat()
+            for outcome in outcomes:
+                feed_url = outcome['feed_url']
+                consecutive, latencies, state = current.get(feed_url, (0, None, STATE_CLOSED))
+                samples = json.loads(latencies) if latencies else []
+                if outcome.get('latency_ms') is not None:
+                    samples = (samples + [outcome['latency_ms']])[-LATENCY_SAMPLES:]
+
+                if outcome['ok']:
+                    if state != STATE_CLOSED:
+                        logger.info(f"Feed recovered, closing circuit: {feed_url}")
+                    consecutive, state, open_until = 0, STATE_CLOSED, None
+                    cursor.execute('''
+                        INSERT INTO feed_health (feed_url, successes, consecutive_failures, latencies,
+                                                 state, open_until, last_success)
+                        VALUES (?, 1, 0, ?, ?, NULL, ?)
+                        ON CONFLICT(feed_url) DO UPDATE SET
+                            successes = successes + 1, consecutive_failures = 0, latencies = excluded.latencies,
+                            state = excluded.state, open_until = NULL, last_success = excluded.last_success
+                    ''', (feed_url, json.dumps(samples), state, stamp))
+                else:
+                    consecutive += 1
+                    open_until = None
+                    # A failed probe re-opens immediately with a longer backoff
+                    if consecutive >= self.failure_threshold or state == STATE_HALF_OPEN:
+                        if state == STATE_CLOSED:
+                            logger.warning(f"Opening circuit after {consecutive} failures: {feed_url}")
+                        state = STATE_OPEN
+                        open_until = now + self._backoff(consecutive)
+                    cursor.execute('''
+                        INSERT INTO feed_health (feed_url, failures, consecutive_failures, latencies,
+                                                 state, open_until, last_failure, last_error)
+                        VALUES (?, 1, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(feed_url) DO UPDATE SET
+                            failures = failures + 1, consecutive_failures = excluded.consecutive_failures,
+                            latencies = excluded.latencies, state = excluded.state,
+                            open_until = excluded.open_until, last_failure = excluded.last_failure,
+                            last_error = excluded.last_error
+                    ''', (feed_url, consecutive, json.dumps(samples), state, open_until, stamp,
+                          (outcome.get('error') or '')[:300]))
+
+            conn.commit()
+            conn.close()
+
+    def record(self, feed_url: str, ok: bool, latency_ms: Optional[float] = None, error: Optional[str] = None):
+        """Apply a single fetch outcome"""
+        self.record_many([{'feed_url': feed_url, 'ok': ok, 'latency_ms': latency_ms, 'error': error}])
+
+    def get_report(self) -> List[Dict]:
+        """Health of every known feed, unhealthiest first"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT feed_url, successes, failures, consecutive_failures, latencies, state,
+                   open_until, last_success, last_failure, last_error
+            FROM feed_health
+            ORDER BY consecutive_failures DESC, failures DESC
+        ''')
+        report = []
+        for (feed_url, successes, failures, consecutive, latencies, state,
+             open_until, last_success, last_failure, last_error) in cursor.fetchall():
+            samples = json.loads(latencies) if latencies else []
+            total = (successes or 0) + (failures or 0)
+            report.append({
+                'feed_url': feed_url,
+                'state': state,
+                'success_rate': round(successes / total, 3) if total else None,
+                'successes': successes,
+                'failures': failures,
+                'consecutive_failures': consecutive,
+                'latency_p50_ms': _percentile(samples, 50),
+                'latency_p90_ms': _percentile(samples, 90),
+                'latency_p99_ms': _percentile(samples, 99),
+                'open_until': datetime.fromtimestamp(open_until).isoformat() if open_until else None,
+                'last_success': last_success,
+                'last_failure': last_failure,
+                'last_error': last_error
+            })
+        conn.close()
+        return report
+
+    def get_summary(self) -> Dict:
+        """Counts of feeds per circuit state"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT state, COUNT(*) FROM feed_health GROUP BY state')
+        summary = {STATE_CLOSED: 0, STATE_OPEN: 0, STATE_HALF_OPEN: 0}
+        summary.update(dict(cursor.fetchall()))
+        conn.close()
+        return summary
@@ -0,0 +1,213 @@
+"""
+Adaptive Feed Scheduler for WiseNews
+Learns how often each RSS feed publishes from the entries it returns and polls
+every feed on its own interval (with jitter) instead of one fixed timer, so
+wire services are checked often and quiet feeds rarely
+"""
+
+import calendar
+import logging
+import random
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Weight given to the newest publish-rate observation
+RATE_SMOOTHING = 0.3
+# Fraction of the interval used as random jitter either way
+INTERVAL_JITTER = 0.15
+# Aim to find about this many new entries per poll
+TARGET_ENTRIES_PER_POLL = 1.0
+
+# Polling bounds in minutes when a category has none configured
+DEFAULT_BOUNDS = (15, 360)
+
+def entry_timestamp(entry) -> Optional[float]:
+    """Unix publish time of a feedparser entry, if it has one"""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        return float(calendar.timegm(parsed))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+class AdaptiveFeedScheduler:
+    """Per-feed polling intervals derived from an EWMA of the publish rate"""
+
+    def __init__(self, db_path: str = 'news_database.db',
+                 category_bounds: Optional[Dict[str, Tuple[int, int]]] = None,
+                 smoothing: float = RATE_SMOOTHING, jitter: float = INTERVAL_JITTER):
+        self.db_path = db_path
+        self.category_bounds = category_bounds or {}
+        self.smoothing = smoothing
+        self.jitter = jitter
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create the feed schedule table if needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS feed_schedule (
+                feed_url TEXT PRIMARY KEY,
+                category TEXT,
+                rate_per_hour REAL, -- smoothed new entries per hour, NULL until observed
+                interval_minutes REAL,
+                last_polled REAL, -- unix time
+                next_due REAL, -- unix time
+                polls INTEGER DEFAULT 0,
+                new_entries INTEGER DEFAULT 0,
+                active INTEGER DEFAULT 1
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_feed_schedule_next_due ON feed_schedule(active, next_due)')
+        conn.commit()
+        conn.close()
+
+    def bounds_for(self, category: Optional[str]) -> Tuple[float, float]:
+        """(min, max) polling interval in minutes for a category"""
+        return self.category_bounds.get(category, DEFAULT_BOUNDS)
+
+    def sync_feeds(self, feeds: Dict[str, str]):
+        """Register enabled feeds ({url: category}) and deactivate the rest.
+
+        New feeds are due immediately so their rate can be learned.
+        """
+        now = time.time()
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('UPDATE feed_schedule SET active = 0')
+        cursor.executemany('''
+            INSERT INTO feed_schedule (feed_url, category, next_due, active)
+            VALUES (?, ?, ?, 1)
+            ON CONFLICT(feed_url) DO UPDATE SET category = excluded.category, active = 1
+        ''', [(url, category, now) for url, category in feeds.items()])
+        conn.commit()
+        conn.close()
+
+    def due_feeds(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[str]:
+        """Feeds whose next poll time has passed, most overdue first"""
+        now = now or time.time()
+        conn = self._connect()
+        cursor = conn.cursor()
+        query = 'SELECT feed_url FROM feed_schedule WHERE active = 1 AND next_due <= ? ORDER BY next_due'
+        params = [now]
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor.execute(query, params)
+        due = [row[0] for row in cursor.fetchall()]
+        conn.close()
+        return due
+
+    @staticmethod
+    def _observed_rate(entry_times: List[float], since: Optional[float], now: float) -> Optional[float]:
+        """New entries per hour seen in one poll"""
+        if since:
+            hours = max((now - since) / 3600.0, 1 / 60.0)
+            # Entries without a date count as new; dated ones only if published since the last poll
+            fresh = sum(1 for t in entry_times if not t or t > since)
+            return fresh / hours
+
+        # First poll: estimate from how the returned entries are spread out
+        entry_times = sorted(t for t in entry_times if t and t <= now)
+        if len(entry_times) < 2:
+            return None
+        span_hours = max((entry_times[-1] - entry_times[0]) / 3600.0, 1 / 60.0)
+        return (len(entry_times) - 1) / span_hours
+
+    def _interval(self, rate: Optional[float], category: Optional[str]) -> float:
+        """Polling interval in minutes for a smoothed rate, clamped to the category bounds"""
+        low, high = self.bounds_for(category)
+        if not rate:
+            return high
+        return min(high, max(low, 60.0 * TARGET_ENTRIES_PER_POLL / rate))
+
+    def record_polls(self, observations: Dict[str, Optional[Iterable[float]]], now: Optional[float] = None):
+        """Update rates and next-due times after a polling pass.
+
+        ``observations`` maps feed URL to the publish timestamps of the entries
+        that were new on this poll (an empty list for 304 / nothing new), or
+        None when the fetch failed and nothing should be learned.
+        """
+        if not observations:
+            return
+        now = now or time.time()
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(observations))
+        cursor.execute(f'''
+            SELECT feed_url, category, rate_per_hour, last_polled
+            FROM feed_schedule WHERE feed_url IN ({placeholders})
+        ''', list(observations))
+        state = {row[0]: row[1:] for row in cursor.fetchall()}
+
+        updates = []
+        for feed_url, entry_times in observations.items():
+            category, rate, last_polled = state.get(feed_url, (None, None, None))
+            entry_times = list(entry_times) if entry_times is not None else None
+
+            if entry_times is not None:
+                observed = self._observed_rate(entry_times, last_polled, now)
+                if observed is not None:
+                    rate = observed if rate is None else self.smoothing * observed + (1 - self.smoothing) * rate
+
+            interval = self._interval(rate, category)
+            jittered = interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+            updates.append((rate, interval, now if entry_times is not None else last_polled,
+                            now + jittered * 60, len(entry_times or []), feed_url))
+
+        cursor.executemany('''
+            UPDATE feed_schedule
+            SET rate_per_hour = ?, interval_minutes = ?, last_polled = ?, next_due = ?,
+                polls = polls + 1, new_entries = new_entries + ?
+            WHERE feed_url = ?
+        ''', updates)
+        conn.commit()
+        conn.close()
+
+    def next_due_queue(self, limit: Optional[int] = None) -> List[Dict]:
+        """The active schedule ordered by next poll time, for inspection"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        query = '''
+            SELECT feed_url, category, rate_per_hour, interval_minutes, last_polled, next_due, polls, new_entries
+            FROM feed_schedule WHERE active = 1 ORDER BY next_due
+        '''
+        params = []
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        cursor.execute(query, params)
+        now = time.time()
+        queue = []
+        for feed_url, category, rate, interval, last_polled, next_due, polls, new_entries in cursor.fetchall():
+            queue.append({
+                'feed_url': feed_url,
+                'category': category,
+                'rate_per_hour': round(rate, 3) if rate is not None else None,
+                'interval_minutes': round(interval, 1) if interval is not None else None,
+                'last_polled': datetime.fromtimestamp(last_polled).isoformat() if last_polled else None,
+                'next_due': datetime.fromtimestamp(next_due).isoformat() if next_due else None,
+                'due_in_seconds': round(next_due - now) if next_due else 0,
+                'polls': polls,
+                'new_entries': new_entries
+            })
+        conn.close()
+        return queue
+
+if __name__ == "__main__":
+    scheduler = AdaptiveFeedScheduler()
+    queue = scheduler.next_due_queue()
+    print(f"📅 {len(queue)} feeds scheduled")
+    for item in queue[:50]:
+        print(f"  {item['due_in_seconds']:>7}s  every {item['interval_minutes'] or '-':>6} min  "
+              f"{item['rate_per_hour'] or 0:>7}/h  [{item['category']}] {item['feed_url']}")
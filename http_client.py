@@ -0,0 +1,143 @@
+"""
+Shared HTTP Client for WiseNews
+One pooled, keep-alive requests.Session used by every synchronous fetcher so
+repeated requests to the same host reuse connections instead of paying a new
+TCP/TLS handshake. Retries, timeouts and per-host rate limits live here.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Connection pooling
+POOL_CONNECTIONS = 100  # Hosts kept in the pool cache
+POOL_MAXSIZE = 10  # Keep-alive connections kept per host
+
+# Retries - idempotent requests only, honouring Retry-After
+MAX_RETRIES = 3
+# Read timeouts are not retried: a hung host would otherwise hold a pool slot
+# for (MAX_READ_RETRIES + 1) x the read timeout plus backoff
+MAX_READ_RETRIES = 0
+RETRY_BACKOFF = 0.5  # 0.5s, 1s, 2s ...
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Timeouts as (connect, read) seconds when the caller gives none
+DEFAULT_TIMEOUT = (5, 15)
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (compatible; WiseNews/1.0)'
+
+# Minimum seconds between requests to the same host
+DEFAULT_HOST_DELAY = 0.0
+HOST_RATE_LIMITS = {
+    'feeds.feedburner.com': 0.2,
+    'www.reddit.com': 1.0,
+    'api.unsplash.com': 1.0,
+    'newsapi.org': 1.0,
+    'api.coingecko.com': 1.5,
+}
+
+class HttpClient:
+    """Thread-safe wrapper around a pooled requests.Session"""
+
+    def __init__(self, pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE,
+                 max_retries: int = MAX_RETRIES, max_read_retries: int = MAX_READ_RETRIES,
+                 backoff_factor: float = RETRY_BACKOFF,
+                 timeout=DEFAULT_TIMEOUT, user_agent: str = DEFAULT_USER_AGENT,
+                 host_rate_limits: Optional[Dict[str, float]] = None,
+                 default_host_delay: float = DEFAULT_HOST_DELAY):
+        self.timeout = timeout
+        self.default_host_delay = default_host_delay
+        self.host_rate_limits = dict(HOST_RATE_LIMITS if host_rate_limits is None else host_rate_limits)
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_read_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False  # Hand the last response back to the caller
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = user_agent
+
+        self._host_locks = defaultdict(threading.Lock)
+        self._host_next_slot = defaultdict(float)
+        self._stats_lock = threading.Lock()
+        self.stats = defaultdict(lambda: {'requests': 0, 'errors': 0, 'wait_seconds': 0.0})
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    def set_host_delay(self, host: str, seconds: float):
+        """Override the minimum spacing between requests to one host"""
+        self.host_rate_limits[host.lower()] = seconds
+
+    def _wait_for_host_slot(self, host: str) -> float:
+        """Sleep until the host's rate limit allows another request"""
+        delay = self.host_rate_limits.get(host, self.default_host_delay)
+        if delay <= 0:
+            return 0.0
+
+        with self._host_locks[host]:
+            wait = self._host_next_slot[host] - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._host_next_slot[host] = time.monotonic() + delay
+        return max(wait, 0.0)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session"""
+        host = self._host(url)
+        kwargs.setdefault('timeout', self.timeout)
+        waited = self._wait_for_host_slot(host)
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._stats_lock:
+                self.stats[host]['requests'] += 1
+                self.stats[host]['errors'] += 1
+                self.stats[host]['wait_seconds'] += waited
+            raise
+
+        with self._stats_lock:
+            self.stats[host]['requests'] += 1
+            self.stats[host]['wait_seconds'] += waited
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def get_statistics(self) -> Dict:
+        """Per-host request counts, errors and time spent waiting on rate limits"""
+        with self._stats_lock:
+            return {host: dict(values) for host, values in self.stats.items()}
+
+    def close(self):
+        self.session.close()
+
+# Global HTTP client instance
+http_client = HttpClient()
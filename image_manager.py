@@ -3,7 +3,7 @@ Image Manager for WiseNews
 Automatically finds and adds relevant images for articles featuring events and people
 """
 
-import requests
+from http_client import http_client
 import json
 import sqlite3
 import logging
@@ -402,7 +402,7 @@ class ImageManager:
                 'orientation': 'landscape'
             }
             
-            response = requests.get(
+            response = http_client.get(
                 f'{self.api_configs["unsplash"]["base_url"]}{self.api_configs["unsplash"]["endpoints"]["search"]}',
                 headers=headers,
                 params=params
@@ -538,7 +538,7 @@ class ImageManager:
     def _download_image(self, url: str, article_id: int, search_term: str) -> Tuple[str, int]:
         """Download image locally and return path and file size"""
         try:
-            response = requests.get(url, timeout=30)
+            response = http_client.get(url, timeout=30)
             response.raise_for_status()
             
             # Generate filename
@@ -0,0 +1,165 @@
+"""
+Import Manifest for WiseNews
+Tracks how far load_articles_to_db has got through downloads/ so each refresh
+only reads and queries files written since the last import instead of every
+file ever saved. Files that failed to import are remembered and offered again
+on later refreshes, up to MAX_IMPORT_ATTEMPTS times.
+
+A refresh after new files arrive still lists (and stats) the whole directory
+to find them; only the reading, parsing and database work is proportional to
+the new files.
+"""
+
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Imports tried per file before it is left out for good
+MAX_IMPORT_ATTEMPTS = 5
+
+class ImportManifest:
+    """mtime watermark over the downloads directory, stored in SQLite"""
+
+    def __init__(self, db_path: str = 'news_database.db', downloads_dir: str = 'downloads'):
+        self.db_path = db_path
+        self.downloads_dir = downloads_dir
+        self._init_db()
+
+    def _init_db(self):
+        """Create the import state table if needed"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_import_state (
+                downloads_dir TEXT PRIMARY KEY,
+                last_mtime REAL DEFAULT 0, -- newest file mtime already imported
+                dir_mtime REAL DEFAULT 0, -- directory mtime when the last scan finished
+                files_imported INTEGER DEFAULT 0,
+                updated_at DATETIME
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_import_failures (
+                downloads_dir TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                mtime REAL,
+                attempts INTEGER DEFAULT 1,
+                last_error TEXT,
+                updated_at DATETIME,
+                PRIMARY KEY (downloads_dir, filename)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _state(self) -> Tuple[float, float]:
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('SELECT last_mtime, dir_mtime FROM file_import_state WHERE downloads_dir = ?',
+                       (self.downloads_dir,))
+        row = cursor.fetchone()
+        conn.close()
+        return (row[0] or 0.0, row[1] or 0.0) if row else (0.0, 0.0)
+
+    def _failed_files(self) -> List[Tuple[str, str, float]]:
+        """Files that failed before and are still worth retrying"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT filename, mtime FROM file_import_failures
+            WHERE downloads_dir = ? AND attempts < ?
+        ''', (self.downloads_dir, MAX_IMPORT_ATTEMPTS))
+        rows = cursor.fetchall()
+        conn.close()
+        return [(filename, os.path.join(self.downloads_dir, filename), mtime or 0.0)
+                for filename, mtime in rows]
+
+    def new_files(self) -> Optional[List[Tuple[str, str, float]]]:
+        """(filename, path, mtime) of files newer than the watermark plus earlier failures, oldest first.
+
+        Returns None without listing the directory when its mtime shows that
+        no file was added since the last completed scan and nothing is
+        waiting for a retry.
+        """
+        if not os.path.isdir(self.downloads_dir):
+            return []
+
+        last_mtime, last_dir_mtime = self._state()
+        retries = self._failed_files()
+        self._scan_dir_mtime = os.stat(self.downloads_dir).st_mtime
+        if last_dir_mtime and self._scan_dir_mtime == last_dir_mtime:
+            return retries or None
+
+        candidates = []
+        with os.scandir(self.downloads_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.txt'):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                # >= so files sharing the watermark second are re-checked by name
+                if mtime >= last_mtime:
+                    candidates.append((entry.name, entry.path, mtime))
+
+        listed = {filename for filename, _, _ in candidates}
+        candidates.extend(retry for retry in retries if retry[0] not in listed)
+        candidates.sort(key=lambda item: item[2])
+        return candidates
+
+    def record_outcomes(self, filenames: Iterable[str], failures: List[Tuple[str, float, str]]):
+        """After a chunk is committed: forget earlier failures that went through, count new ones.
+
+        ``failures`` holds (filename, mtime, error) for files that raised.
+        """
+        failed = {filename for filename, _, _ in failures}
+        done = [(self.downloads_dir, filename) for filename in filenames if filename not in failed]
+        now = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.executemany('DELETE FROM file_import_failures WHERE downloads_dir = ? AND filename = ?', done)
+        conn.executemany('''
+            INSERT INTO file_import_failures (downloads_dir, filename, mtime, attempts, last_error, updated_at)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT(downloads_dir, filename) DO UPDATE SET
+                attempts = file_import_failures.attempts + 1,
+                last_error = excluded.last_error,
+                updated_at = excluded.updated_at
+        ''', [(self.downloads_dir, filename, mtime, error[:500], now) for filename, mtime, error in failures])
+        conn.commit()
+        conn.close()
+        for filename, _, error in failures:
+            logger.warning(f"Import of {filename} failed, will retry: {error}")
+
+    def advance(self, last_mtime: float, files_imported: int = 0):
+        """Move the watermark forward after a chunk has been committed"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute('''
+            INSERT INTO file_import_state (downloads_dir, last_mtime, files_imported, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(downloads_dir) DO UPDATE SET
+                last_mtime = MAX(file_import_state.last_mtime, excluded.last_mtime),
+                files_imported = file_import_state.files_imported + excluded.files_imported,
+                updated_at = excluded.updated_at
+        ''', (self.downloads_dir, last_mtime, files_imported, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+
+    def finish_scan(self):
+        """Record the directory mtime seen at the start of a fully processed scan"""
+        dir_mtime = getattr(self, '_scan_dir_mtime', None)
+        if dir_mtime is None:
+            return
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute('''
+            INSERT INTO file_import_state (downloads_dir, dir_mtime, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(downloads_dir) DO UPDATE SET
+                dir_mtime = excluded.dir_mtime,
+                updated_at = excluded.updated_at
+        ''', (self.downloads_dir, dir_mtime, datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,201 @@
+"""
+Staged Ingestion Pipeline for WiseNews
+Runs ingestion work as explicit stages connected by bounded queues. Each stage
+has its own worker count and runs on threads (I/O-bound work) or a process
+pool (CPU-bound work); full queues push back on the stage before them, and
+per-stage throughput and queue depth are tracked for tuning.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class Stage:
+    """One pipeline step.
+
+    ``func`` takes an item and returns the item for the next stage, or None to
+    drop it. ``kind`` is 'thread' or 'process'; a process stage's func must be
+    picklable and live in a small standalone module, since spawned workers
+    import it (never the Flask app module).
+    With ``overflow='drop'`` items are discarded instead of blocking when the
+    stage's queue is full, for best-effort work that must never hold up the
+    stages before it.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1,
+                 kind: str = 'thread', queue_size: int = 100, overflow: str = 'block'):
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown stage kind: {kind}")
+        if overflow not in ('block', 'drop'):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.kind = kind
+        self.overflow = overflow
+        self.queue = queue.Queue(maxsize=queue_size)
+
+        self.next_stage: Optional['Stage'] = None
+        self._executor = None
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.metrics = {
+            'processed': 0,
+            'dropped': 0,
+            'overflowed': 0,
+            'errors': 0,
+            'busy_seconds': 0.0,
+            'blocked_seconds': 0.0
+        }
+
+    def put(self, item) -> bool:
+        """Hand an item to this stage, applying its overflow policy"""
+        if self.overflow == 'drop':
+            try:
+                self.queue.put_nowait(item)
+                return True
+            except queue.Full:
+                with self._lock:
+                    self.metrics['overflowed'] += 1
+                return False
+
+        started = time.time()
+        self.queue.put(item)
+        waited = time.time() - started
+        if waited > 0.001:
+            with self._lock:
+                self.metrics['blocked_seconds'] += waited
+        return True
+
+    def start(self):
+        if self.kind == 'process':
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"pipeline-{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _run(self, item):
+        if self._executor:
+            return self._executor.submit(self.func, item).result()
+        return self.func(item)
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                self.queue.task_done()
+                return
+
+            started = time.time()
+            try:
+                result = self._run(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage '{self.name}' failed: {e}")
+                result = None
+                with self._lock:
+                    self.metrics['errors'] += 1
+
+            with self._lock:
+                self.metrics['busy_seconds'] += time.time() - started
+                if result is None:
+                    self.metrics['dropped'] += 1
+                else:
+                    self.metrics['processed'] += 1
+
+            if result is not None and self.next_stage:
+                # Blocks here when the next stage is full - that is the backpressure
+                self.next_stage.put(result)
+            self.queue.task_done()
+
+    def stop(self):
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def get_metrics(self, elapsed: float) -> Dict:
+        with self._lock:
+            metrics = dict(self.metrics)
+        metrics['name'] = self.name
+        metrics['kind'] = self.kind
+        metrics['workers'] = self.workers
+        metrics['queue_depth'] = self.queue.qsize()
+        metrics['queue_capacity'] = self.queue.maxsize
+        metrics['items_per_second'] = round(metrics['processed'] / elapsed, 2) if elapsed > 0 else 0.0
+        handled = metrics['processed'] + metrics['dropped']
+        metrics['avg_item_ms'] = round(metrics['busy_seconds'] / handled * 1000, 1) if handled else None
+        metrics['busy_seconds'] = round(metrics['busy_seconds'], 2)
+        metrics['blocked_seconds'] = round(metrics['blocked_seconds'], 2)
+        return metrics
+
+class Pipeline:
+    """Linear chain of stages; items go in at the first stage"""
+
+    def __init__(self, stages: List[Stage], name: str = 'ingest'):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.name = name
+        self.stages = stages
+        for current, following in zip(stages, stages[1:]):
+            current.next_stage = following
+        self._started = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._started is not None
+
+    def start(self):
+        with self._lock:
+            if self._started is None:
+                for stage in self.stages:
+                    stage.start()
+                self._started = time.time()
+                logger.info(f"Pipeline '{self.name}' started: "
+                            + ', '.join(f"{s.name}x{s.workers}({s.kind})" for s in self.stages))
+        return self
+
+    def submit(self, item) -> bool:
+        """Feed an item into the first stage, blocking while it is full"""
+        if not self.running:
+            self.start()
+        return self.stages[0].put(item)
+
+    def wait_for(self, stage_name: Optional[str] = None):
+        """Block until everything submitted so far has passed the given stage (default: all)"""
+        for stage in self.stages:
+            stage.queue.join()
+            if stage.name == stage_name:
+                return
+
+    def stop(self):
+        """Drain every stage in order and stop the workers"""
+        with self._lock:
+            if self._started is None:
+                return
+            for stage in self.stages:
+                stage.queue.join()
+                stage.stop()
+            self._started = None
+
+    def get_metrics(self) -> Dict:
+        """Per-stage throughput, latency and queue depth"""
+        elapsed = time.time() - self._started if self._started else 0.0
+        return {
+            'pipeline': self.name,
+            'running': self.running,
+            'uptime_seconds': round(elapsed, 1),
+            'stages': [stage.get_metrics(elapsed) for stage in self.stages]
+        }
@@ -3,7 +3,7 @@ Enhanced News Aggregator Integration
 Integrates all data sources with existing WiseNews system
 """
 
-import requests
+from http_client import http_client
 import json
 import sqlite3
 import logging
@@ -16,10 +16,14 @@ from bs4 import BeautifulSoup
 import schedule
 from collections import defaultdict
 from database_manager import db_manager
+from article_fingerprints import generate_title_hash
 
 logger = logging.getLogger(__name__)
 
 class IntegratedDataAggregator:
+    # Fields bulk_save_articles reads without a default
+    REQUIRED_ARTICLE_KEYS = ('title', 'content', 'source', 'category', 'data_source')
+    
     def __init__(self):
         # API Keys (to be configured)
         self.api_keys = {
@@ -80,7 +84,7 @@ class IntegratedDataAggregator:
         """Initialize enhanced database tables"""
         try:
             # Check if columns already exist before adding them
-            existing_columns = db_manager.execute_query("PRAGMA table_info(articles)")
+            existing_columns = db_manager.execute_query("PRAGMA table_info(articles)", fetch='all')
             column_names = [col[1] for col in existing_columns] if existing_columns else []
             
             # Only add columns if they don't exist
@@ -102,6 +106,9 @@ class IntegratedDataAggregator:
                 else:
                     logger.debug(f"Column {col_name} already exists")
             
+            # Title hashes live in url_hash like every other writer; drop the old bulk-save-only index
+            db_manager.execute_query('DROP INDEX IF EXISTS idx_articles_source_title_hash')
+            
             logger.info("Enhanced database structure initialized")
             
         except Exception as e:
@@ -133,7 +140,7 @@ class IntegratedDataAggregator:
             return []
         
         try:
-            response = requests.get(
+            response = http_client.get(
                 'https://newsapi.org/v2/everything',
                 params=self._newsapi_params(),
                 timeout=30
@@ -165,7 +172,7 @@ class IntegratedDataAggregator:
     def fetch_coingecko_data(self):
         """Fetch cryptocurrency data from CoinGecko"""
         try:
-            response = requests.get(
+            response = http_client.get(
                 'https://api.coingecko.com/api/v3/coins/markets',
                 params=self._coingecko_params(),
                 timeout=30
@@ -208,7 +215,7 @@ class IntegratedDataAggregator:
                     url = f"https://www.reddit.com/r/{subreddit}/hot.json"
                     headers = {'User-Agent': 'WiseNews/1.0'}
                     
-                    response = requests.get(url, headers=headers, params={'limit': 5}, timeout=30)
+                    response = http_client.get(url, headers=headers, params={'limit': 5}, timeout=30)
                     
                     if response.status_code == 200:
                         data = response.json()
@@ -251,7 +258,8 @@ class IntegratedDataAggregator:
         for source in self.enhanced_sources['government_sources']:
             try:
                 if source['type'] == 'rss':
-                    feed = feedparser.parse(source['url'])
+                    response = http_client.get(source['url'], timeout=30)
+                    feed = feedparser.parse(response.content)
                     
                     for entry in feed.entries[:5]:  # Limit per source
                         articles.append({
@@ -278,55 +286,95 @@ class IntegratedDataAggregator:
         if not articles:
             return 0
         
-        saved_count = 0
+        report = self.bulk_save_articles(articles)
+        logger.info(f"Saved enhanced articles: {report['inserted']} inserted, "
+                    f"{report['skipped_existing']} already stored, {report['skipped_duplicate']} repeated in batch, "
+                    f"{report['errors']} errors")
+        return report['inserted']
+    
+    def bulk_save_articles(self, articles):
+        """Insert a batch with one set-based existence check and one transaction"""
+        report = {'inserted': 0, 'skipped_existing': 0, 'skipped_duplicate': 0, 'errors': 0}
         
+        # Validate up front so one malformed item can't roll back the whole batch
+        records = []
         for article in articles:
-            try:
-                # Check for duplicates
-                existing = db_manager.execute_query(
-                    'SELECT id FROM articles WHERE title = ? AND source_name = ?', 
-                    (article['title'], article['source']),
-                    fetch='one'
-                )
-                
-                if existing:
-                    continue  # Skip duplicates
-                
-                # Generate filename
-                safe_title = "".join(c for c in article['title'][:50] if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f"{article['data_source']}_{safe_title}_{timestamp}.txt"
+            missing = [key for key in self.REQUIRED_ARTICLE_KEYS if article.get(key) is None]
+            if missing or not article['title'] or not article['source']:
+                logger.warning(f"Skipping malformed article {article.get('title')!r}: missing {missing or ['title/source']}")
+                report['errors'] += 1
+                continue
+            records.append((article, generate_title_hash(article['title'])))
+        if not records:
+            return report
+        
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        try:
+            with db_manager.transaction() as cursor:
+                # Existing (source, title hash) pairs: url_hash holds the title hash for every writer,
+                # exact titles catch rows this path saved with the raw URL there instead
+                existing = set()
+                hashes = list({title_hash for _, title_hash in records})
+                titles = list({article['title'] for article, _ in records})
+                for start in range(0, len(hashes), 500):
+                    chunk = hashes[start:start + 500]
+                    cursor.execute(f'''
+                        SELECT source_name, url_hash FROM articles
+                        WHERE url_hash IN ({','.join('?' * len(chunk))})
+                    ''', chunk)
+                    existing.update(cursor.fetchall())
+                for start in range(0, len(titles), 500):
+                    chunk = titles[start:start + 500]
+                    cursor.execute(f'''
+                        SELECT source_name, title FROM articles
+                        WHERE title IN ({','.join('?' * len(chunk))})
+                    ''', chunk)
+                    existing.update((source, generate_title_hash(title)) for source, title in cursor.fetchall())
                 
-                # Insert article with all required fields
-                file_path = f"articles/{filename}"  # Create file path
-                source_type = article.get('source_type', 'api')  # Default to 'api' type
+                rows = []
+                batch_keys = set()
+                for article, title_hash in records:
+                    key = (article['source'], title_hash)
+                    if key in existing:
+                        report['skipped_existing'] += 1
+                        continue
+                    if key in batch_keys:
+                        report['skipped_duplicate'] += 1
+                        continue
+                    batch_keys.add(key)
+                    
+                    # Generate filename
+                    safe_title = "".join(c for c in article['title'][:50] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                    filename = f"{article['data_source']}_{safe_title}_{timestamp}.txt"
+                    
+                    rows.append((
+                        article['title'],
+                        article['content'],
+                        article.get('source_type', 'api'),  # Default to 'api' type
+                        article['source'],
+                        article['category'],
+                        title_hash,
+                        filename,
+                        f"articles/{filename}",
+                        article.get('sentiment_score', 0.0),
+                        article.get('importance_score', 5),
+                        article['data_source'],
+                        article.get('tags', '')
+                    ))
                 
-                db_manager.execute_query('''
-                    INSERT INTO articles (title, content, source_type, source_name, category, url_hash, 
-                                        filename, file_path, sentiment_score, importance_score, data_source, tags)
+                # BEGIN IMMEDIATE holds the write lock, so no other writer can slip in between check and insert
+                cursor.executemany('''
+                    INSERT INTO articles (title, content, source_type, source_name, category, url_hash,
+                                          filename, file_path, sentiment_score, importance_score, data_source, tags)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    article['title'],
-                    article['content'],
-                    source_type,
-                    article['source'],
-                    article['category'],
-                    article.get('url', ''),
-                    filename,
-                    file_path,
-                    article.get('sentiment_score', 0.0),
-                    article.get('importance_score', 5),
-                    article['data_source'],
-                    article.get('tags', '')
-                ))
-                
-                saved_count += 1
-                
-            except Exception as e:
-                logger.error(f"Error saving article: {e}")
-                continue
+                ''', rows)
+                report['inserted'] = len(rows)
+        
+        except Exception as e:
+            logger.error(f"Error saving article batch: {e}")
+            report['errors'] += len(records)
         
-        return saved_count
+        return report
     
     def create_live_feed_update(self, article):
         """Create live feed update from article"""
@@ -0,0 +1,78 @@
+"""
+Keyset Pagination for WiseNews
+Article listings page on (date, id) instead of LIMIT/OFFSET: a page starts
+right after the last row of the previous one, found through the (date, id)
+index, so page 500 costs the same as page 1. Positions are passed around as
+opaque URL-safe cursors.
+"""
+
+import base64
+import json
+import logging
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+def encode_cursor(date_value, row_id: int, backwards: bool = False) -> str:
+    """Opaque token for the position just past (date_value, row_id)"""
+    payload = json.dumps([date_value, row_id, int(backwards)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[str, int, bool]]:
+    """(date, id, backwards) from a cursor; None for a missing or malformed one"""
+    if not token:
+        return None
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        date_value, row_id, backwards = json.loads(payload)
+        # Only scalars can be bound as SQL parameters
+        if date_value is not None and not isinstance(date_value, (str, int, float)):
+            raise TypeError(f"cursor date is a {type(date_value).__name__}")
+        return date_value, int(row_id), bool(backwards)
+    except (ValueError, TypeError):
+        logger.debug(f"Ignoring malformed page cursor {token!r}")
+        return None
+
+def seek(token: Optional[str], date_column: str = 'date_added',
+         id_column: str = 'id') -> Tuple[Optional[str], List, str, bool]:
+    """WHERE condition, its params, ORDER BY and direction for the page at ``token``.
+
+    Listings run newest first; a backwards cursor (the "newer" link) reads the
+    rows just above it in ascending order and ``paginate`` flips them back.
+    """
+    position = decode_cursor(token)
+    if position is None:
+        return None, [], f'{date_column} DESC, {id_column} DESC', False
+    date_value, row_id, backwards = position
+    op = '>' if backwards else '<'
+    direction = 'ASC' if backwards else 'DESC'
+    # Row-value comparison, so SQLite seeks the (date, id) index instead of scanning it
+    condition = f'({date_column}, {id_column}) {op} (?, ?)'
+    return condition, [date_value, row_id], f'{date_column} {direction}, {id_column} {direction}', backwards
+
+def paginate(rows: Sequence, per_page: int, token: Optional[str], date_index: int,
+             id_index: int = 0) -> Tuple[List, Optional[str], Optional[str]]:
+    """Trim rows fetched with LIMIT per_page + 1; returns (rows, next_cursor, prev_cursor)"""
+    position = decode_cursor(token)
+    backwards = bool(position and position[2])
+    more = len(rows) > per_page
+    rows = list(rows[:per_page])
+    if backwards:
+        rows.reverse()
+    if not rows:
+        return rows, None, None
+
+    first, last = rows[0], rows[-1]
+    has_older = more if not backwards else True
+    has_newer = more if backwards else position is not None
+    next_cursor = encode_cursor(last[date_index], last[id_index]) if has_older else None
+    prev_cursor = encode_cursor(first[date_index], first[id_index], backwards=True) if has_newer else None
+    return rows, next_cursor, prev_cursor
+
+def ensure_seek_index(cursor, table: str = 'articles', date_column: str = 'date_added',
+                      id_column: str = 'id'):
+    """Index the (date, id) order the listings seek on"""
+    cursor.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_{table}_{date_column}_{id_column}
+        ON {table}({date_column}, {id_column})
+    ''')
@@ -11,6 +11,46 @@ from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Article listings: hide articles of live events that are still running
+COMPLETED_LIVE_EVENT_CONDITION = '''
+    (source_type != 'live_event' OR 
+     live_event_id IN (SELECT id FROM live_events WHERE status = 'completed'))
+'''
+
+_LIVE_EVENT_FILENAME = re.compile(r'^live_event_(\d+)_')
+
+def ensure_live_event_column(cursor) -> int:
+    """Add the indexed articles.live_event_id column and fill it from live_event_<id>_ filenames.
+
+    Returns how many articles were backfilled; later calls only pick up rows
+    written by code that still leaves the column empty.
+    """
+    cursor.execute("PRAGMA table_info(articles)")
+    columns = {column[1] for column in cursor.fetchall()}
+    if not columns:
+        return 0
+    if 'live_event_id' not in columns:
+        cursor.execute('ALTER TABLE articles ADD COLUMN live_event_id INTEGER REFERENCES live_events(id)')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_articles_live_event_id
+        ON articles(live_event_id)
+    ''')
+    
+    # Range on filename rather than LIKE, so idx_filename can serve it
+    cursor.execute('''
+        SELECT id, filename FROM articles
+        WHERE filename >= 'live_event_' AND filename < 'live_event`' AND live_event_id IS NULL
+    ''')
+    backfill = []
+    for article_id, filename in cursor.fetchall():
+        match = _LIVE_EVENT_FILENAME.match(filename)
+        if match:
+            backfill.append((int(match.group(1)), article_id))
+    if backfill:
+        cursor.executemany('UPDATE articles SET live_event_id = ? WHERE id = ?', backfill)
+        logger.info(f"Linked {len(backfill)} articles to their live events")
+    return len(backfill)
+
 class LiveEventsArchiver:
     def __init__(self):
         self.min_article_length = 200  # Minimum characters for a full article
@@ -18,6 +58,7 @@ class LiveEventsArchiver:
             'score', 'final', 'ended', 'completed', 'finished', 'result',
             'update', 'brief', 'quick', 'short', 'announcement'
         ]
+        self._column_checked = False
     
     def is_small_update(self, title: str, content: str) -> bool:
         """Determine if content should be a notification vs full article"""
@@ -46,17 +87,18 @@ class LiveEventsArchiver:
             conn = sqlite3.connect('news_database.db')
             cursor = conn.cursor()
             
-            # Get completed events that haven't been archived
+            if not self._column_checked:
+                ensure_live_event_column(cursor)
+                self._column_checked = True
+            
+            # Get completed events that haven't been archived (indexed lookup on live_event_id)
             cursor.execute('''
                 SELECT id, event_name, event_type, category, description, 
                        start_time, end_time, venue, metadata
                 FROM live_events 
                 WHERE status = 'completed' 
+                AND NOT EXISTS (SELECT 1 FROM articles WHERE articles.live_event_id = live_events.id)
                 AND id NOT IN (
-                    SELECT DISTINCT CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER)
-                    FROM articles 
-                    WHERE source_type = 'live_event' AND filename LIKE 'live_event_%'
-                    UNION
                     SELECT DISTINCT id FROM notifications 
                     WHERE notification_type = 'live_event'
                 )
@@ -161,8 +203,8 @@ class LiveEventsArchiver:
                 INSERT INTO articles (
                     title, content, source_type, source_name, filename, 
                     date_added, file_path, category, keywords, data_source, tags,
-                    importance_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    importance_score, live_event_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 title,
                 content,
@@ -175,7 +217,8 @@ class LiveEventsArchiver:
                 f"{event_type},{category},live_event_archive",
                 'live_events_archive',
                 f"live_event,{category},{event_type}",
-                0.85  # High importance for archived live events
+                0.85,  # High importance for archived live events
+                event_id
             ))
             
         except Exception as e:
@@ -207,8 +250,8 @@ class LiveEventsArchiver:
                 INSERT INTO articles (
                     title, content, source_type, source_name, filename, 
                     date_added, file_path, category, keywords, data_source, tags,
-                    importance_score
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    importance_score, live_event_id
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (
                 title,
                 content,
@@ -221,7 +264,8 @@ class LiveEventsArchiver:
                 keywords,
                 'live_events_archive',
                 f"sports,{category},{event_type},match_report",
-                0.9  # Very high importance for comprehensive sports articles
+                0.9,  # Very high importance for comprehensive sports articles
+                event_id
             ))
             
         except Exception as e:
@@ -489,11 +533,7 @@ class LiveEventsArchiver:
                 WHERE status = 'completed' 
                 AND created_at < ?
                 AND (
-                    id IN (
-                        SELECT DISTINCT CAST(SUBSTR(filename, 12, INSTR(filename, '_') - 12) AS INTEGER)
-                        FROM articles 
-                        WHERE source_type = 'live_event' AND filename LIKE 'live_event_%'
-                    )
+                    EXISTS (SELECT 1 FROM articles WHERE articles.live_event_id = live_events.id)
                     OR 
                     id IN (SELECT DISTINCT id FROM notifications 
                            WHERE notification_type = 'live_event')
@@ -0,0 +1,284 @@
+"""
+MinHash / LSH Duplicate Index for WiseNews
+Stores a MinHash signature per article when it is ingested and an LSH banding
+index over the signatures, so near-duplicate candidates come from a few
+indexed bucket lookups instead of comparing every pair of articles
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 128
+# 32 bands of 4 rows: pairs with a Jaccard similarity around 0.4 and up
+# share at least one bucket with high probability
+BANDS = 32
+# Word n-grams hashed per article, and how much of the body is used
+SHINGLE_SIZE = 2
+MAX_SHINGLE_WORDS = 400
+# Buckets bigger than this are boilerplate (empty bodies, feed footers) and are
+# not expanded into candidate pairs
+MAX_BUCKET_SIZE = 500
+
+_VALUE_BITS = 57  # the top 7 bits of each 64-bit shingle hash pick one of 128 bins
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_FILL_STEP = 0x9E3779B97F4A7C15
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase, collapse whitespace and drop punctuation (as DuplicateDetector does)"""
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text.lower())
+    return re.sub(r'[^\w\s]', '', text).strip()
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def shingles(text: str, size: int = SHINGLE_SIZE, max_words: int = MAX_SHINGLE_WORDS) -> Set[int]:
+    """64-bit hashes of the word n-grams of already normalized text"""
+    words = text.split()[:max_words]
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {_hash64(' '.join(words))}
+    return {_hash64(' '.join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+def minhash_signature(shingle_hashes: Iterable[int], num_perm: int = NUM_PERM) -> Optional[array]:
+    """MinHash signature using one-permutation hashing.
+
+    Each shingle hash lands in one of ``num_perm`` bins and every bin keeps its
+    minimum, which costs one pass over the shingles instead of one per
+    permutation. Empty bins (short texts) borrow the next filled bin so two
+    signatures still agree with probability close to their Jaccard similarity.
+    """
+    bits = num_perm.bit_length() - 1
+    if num_perm != 1 << bits or bits > 64 - _VALUE_BITS:
+        raise ValueError("num_perm must be a power of two no larger than 128")
+
+    bins = [None] * num_perm
+    shift = 64 - bits
+    for value in shingle_hashes:
+        index = value >> shift
+        value &= _VALUE_MASK
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+
+    filled = [i for i, value in enumerate(bins) if value is not None]
+    if not filled:
+        return None
+    if len(filled) < num_perm:
+        densified = list(bins)
+        for i in range(num_perm):
+            if bins[i] is None:
+                distance = 1
+                while bins[(i + distance) % num_perm] is None:
+                    distance += 1
+                densified[i] = (bins[(i + distance) % num_perm] + distance * _FILL_STEP) & _VALUE_MASK
+        bins = densified
+    return array('Q', bins)
+
+def estimate_jaccard(sig1: array, sig2: array) -> float:
+    if sig1 is None or sig2 is None:
+        return 0.0
+    return sum(1 for a, b in zip(sig1, sig2) if a == b) / len(sig1)
+
+class MinHashLSHIndex:
+    """Persistent MinHash signatures plus LSH buckets for the articles table"""
+
+    def __init__(self, db_path: str = 'news_database.db', num_perm: int = NUM_PERM, bands: int = BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.db_path = db_path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create the signature and bucket tables if needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_minhash (
+                article_id INTEGER PRIMARY KEY,
+                signature BLOB -- NULL for articles without any text
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_lsh_buckets (
+                bucket INTEGER NOT NULL, -- hash of (band number, band values)
+                article_id INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON article_lsh_buckets(bucket)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_lsh_article ON article_lsh_buckets(article_id)')
+        conn.commit()
+        conn.close()
+
+    def signature_for(self, title: Optional[str], content: Optional[str]) -> Optional[array]:
+        """Signature of an article's normalized title and body"""
+        text = f"{normalize_text(title)} {normalize_text(content)}"
+        return minhash_signature(shingles(text), self.num_perm)
+
+    def band_keys(self, signature: Optional[array]) -> List[int]:
+        """One signed 64-bit bucket key per band"""
+        if signature is None:
+            return []
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            digest = hashlib.blake2b(bytes([band]) + chunk.tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'big', signed=True))
+        return keys
+
+    def add_many(self, articles: Iterable[Tuple[int, Optional[str], Optional[str]]],
+                 conn: Optional[sqlite3.Connection] = None) -> int:
+        """Index (id, title, content) rows; already indexed ids are replaced"""
+        signatures = []
+        buckets = []
+        for article_id, title, content in articles:
+            signature = self.signature_for(title, content)
+            signatures.append((article_id, signature.tobytes() if signature is not None else None))
+            buckets.extend((key, article_id) for key in self.band_keys(signature))
+        if not signatures:
+            return 0
+
+        own_conn = conn is None
+        conn = conn or self._connect()
+        try:
+            cursor = conn.cursor()
+            ids = [(article_id,) for article_id, _ in signatures]
+            cursor.executemany('DELETE FROM article_lsh_buckets WHERE article_id = ?', ids)
+            cursor.executemany('INSERT OR REPLACE INTO article_minhash (article_id, signature) VALUES (?, ?)',
+                               signatures)
+            cursor.executemany('INSERT INTO article_lsh_buckets (bucket, article_id) VALUES (?, ?)', buckets)
+            if own_conn:
+                conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+        return len(signatures)
+
+    def sync(self, batch_size: int = 500) -> int:
+        """Index every article newer than the newest indexed one"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        indexed = 0
+        try:
+            while True:
+                cursor.execute('SELECT COALESCE(MAX(article_id), 0) FROM article_minhash')
+                watermark = cursor.fetchone()[0]
+                cursor.execute('SELECT id, title, content FROM articles WHERE id > ? ORDER BY id LIMIT ?',
+                               (watermark, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                indexed += self.add_many(rows, conn)
+                conn.commit()
+        finally:
+            conn.close()
+        if indexed:
+            logger.info(f"MinHash index: indexed {indexed} new articles")
+        return indexed
+
+    def remove(self, article_ids: Iterable[int], conn: Optional[sqlite3.Connection] = None):
+        """Drop deleted articles from the index"""
+        ids = [(article_id,) for article_id in article_ids]
+        if not ids:
+            return
+        own_conn = conn is None
+        conn = conn or self._connect()
+        try:
+            conn.executemany('DELETE FROM article_lsh_buckets WHERE article_id = ?', ids)
+            conn.executemany('DELETE FROM article_minhash WHERE article_id = ?', ids)
+            if own_conn:
+                conn.commit()
+        finally:
+            if own_conn:
+                conn.close()
+
+    def get_signatures(self, article_ids: Iterable[int]) -> Dict[int, array]:
+        ids = list(article_ids)
+        signatures = {}
+        conn = self._connect()
+        cursor = conn.cursor()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(f'''
+                SELECT article_id, signature FROM article_minhash
+                WHERE article_id IN ({','.join('?' * len(chunk))}) AND signature IS NOT NULL
+            ''', chunk)
+            for article_id, blob in cursor.fetchall():
+                signature = array('Q')
+                signature.frombytes(blob)
+                signatures[article_id] = signature
+        conn.close()
+        return signatures
+
+    def candidates(self, signature: Optional[array], exclude_id: Optional[int] = None) -> Set[int]:
+        """Indexed articles sharing at least one LSH bucket with the signature"""
+        keys = self.band_keys(signature)
+        if not keys:
+            return set()
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT DISTINCT article_id FROM article_lsh_buckets
+            WHERE bucket IN ({','.join('?' * len(keys))})
+        ''', keys)
+        found = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        found.discard(exclude_id)
+        return found
+
+    def query(self, title: Optional[str], content: Optional[str], min_jaccard: float = 0.0,
+              exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Candidates for an article with their estimated Jaccard similarity, best first"""
+        signature = self.signature_for(title, content)
+        found = self.candidates(signature, exclude_id)
+        stored = self.get_signatures(found)
+        scored = [(article_id, estimate_jaccard(signature, other)) for article_id, other in stored.items()]
+        return sorted([item for item in scored if item[1] >= min_jaccard], key=lambda item: -item[1])
+
+    def load_buckets(self, article_ids: Optional[Set[int]] = None) -> Dict[int, List[int]]:
+        """Stored bucket membership (bucket -> ids), optionally limited to some articles"""
+        buckets = defaultdict(list)
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT bucket, article_id FROM article_lsh_buckets')
+        for bucket, article_id in cursor:
+            if article_ids is None or article_id in article_ids:
+                buckets[bucket].append(article_id)
+        conn.close()
+        return buckets
+
+    def indexed_ids(self) -> Set[int]:
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT article_id FROM article_minhash')
+        ids = {row[0] for row in cursor.fetchall()}
+        conn.close()
+        return ids
+
+def candidate_neighbours(buckets: Dict[int, List[int]],
+                         max_bucket_size: int = MAX_BUCKET_SIZE) -> Dict[int, Set[int]]:
+    """Expand buckets into each article's set of candidate near-duplicates"""
+    neighbours = defaultdict(set)
+    for members in buckets.values():
+        if len(members) < 2 or len(members) > max_bucket_size:
+            continue
+        for article_id in members:
+            neighbours[article_id].update(members)
+    for article_id, others in neighbours.items():
+        others.discard(article_id)
+    return neighbours
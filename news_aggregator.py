@@ -1,24 +1,70 @@
 import os
+import time
 import requests
 import feedparser
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 # Optional: Twitter
 import tweepy
 
-# Optional: YouTube/Whisper
-import subprocess
-import whisper
+# Optional: concurrent RSS engine (needs aiohttp)
+try:
+    from async_rss_engine import AsyncRSSEngine
+    ASYNC_ENGINE_AVAILABLE = True
+except ImportError:
+    AsyncRSSEngine = None
+    ASYNC_ENGINE_AVAILABLE = False
+
+from feed_cache import FeedValidatorStore
+from seen_url_index import SeenUrlIndex
+from feed_health import FeedHealthRegistry
+from transcription_pool import TranscriptionPool
+from twitter_cursors import TwitterCursorStore
+from content_hash_index import ContentHashIndex, content_hash as hash_content
+from article_fingerprints import generate_content_hash
+from article_writer import ArticleWriter
+import article_extractor
+from http_client import http_client
+from feed_scheduler import entry_timestamp
 
 # --- CONFIG ---
 DOWNLOADS_DIR = "downloads"
 os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
+# YouTube Transcription - worker processes that each keep a Whisper model loaded
+WHISPER_MODEL = "base"
+TRANSCRIPTION_WORKERS = None  # None = one per CPU core (capped at the number of videos)
+
+# Ingestion Mode - where fetched articles are stored
+#   "database": insert structured records straight into the articles table
+#   "files":    legacy downloads/*.txt dump, imported later by load_articles_to_db
+#   "both":     write the file and the database record
+INGEST_MODE = "database"
+DATABASE_BATCH_SIZE = 50  # Articles per insert transaction
+
 # Performance Configuration
 MAX_ARTICLES_PER_SOURCE = 3  # Reduced from 5 to handle more sources efficiently
 ENABLE_RATE_LIMITING = True  # Add delays between requests to avoid overwhelming servers
-REQUEST_DELAY = 0.5  # Seconds to wait between requests
+REQUEST_DELAY = 0.5  # Seconds between requests to a host without its own limit in http_client.HOST_RATE_LIMITS
+
+# Concurrency Configuration - used by the async RSS engine
+ENABLE_CONCURRENT_FETCHING = True  # Fall back to the sequential loop when False
+MAX_CONCURRENT_REQUESTS = 50  # Global cap on in-flight HTTP requests
+MAX_REQUESTS_PER_HOST = 2  # Per-host cap so no single site gets hammered
+
+# Article Extraction Budgets - the streaming extractor stops once any is reached
+ARTICLE_MAX_PARAGRAPHS = 60  # Paragraphs kept per article
+ARTICLE_MAX_CHARS = 20000  # Characters of article text kept
+ARTICLE_MAX_DOWNLOAD_BYTES = 1024 * 1024  # Bytes of HTML downloaded per article page
+
+# Conditional GET - send ETag/Last-Modified validators and skip unchanged feeds
+ENABLE_CONDITIONAL_GET = True
+
+# Seen-URL filter - never download the body of an article URL fetched before
+ENABLE_SEEN_URL_FILTER = True
+
+# Feed health - back off from feeds that keep failing or come back empty
+ENABLE_FEED_CIRCUIT_BREAKER = True
 
 # Regional Configuration - Enable/disable different regions
 ENABLE_US_SOURCES = True
@@ -38,307 +84,347 @@ ENABLE_WIRE_SERVICES = True
 ENABLE_SPECIALIZED_TOPICS = True
 
 # RSS feeds for major news
-RSS_URLS = [
-    # Major International News
-    "https://rss.cnn.com/rss/edition.rss",
-    "https://feeds.bbci.co.uk/news/rss.xml",
-    "https://feeds.skynews.com/feeds/rss/home.xml",
-    "https://feeds.reuters.com/reuters/topNews",
-    "https://www.theguardian.com/world/rss",
-    "https://feeds.npr.org/1001/rss.xml",
-    "https://www.aljazeera.com/xml/rss/all.xml",
-    
-    # US News Sources
-    "https://feeds.washingtonpost.com/rss/world",
-    "https://www.nytimes.com/services/xml/rss/nyt/World.xml",
-    "https://feeds.abcnews.go.com/abcnews/topstories",
-    "https://feeds.nbcnews.com/nbcnews/public/world",
-    "https://feeds.foxnews.com/foxnews/latest",
-    "https://feeds.usatoday.com/news/topstories",
-    "https://feeds.cbsnews.com/CBSNewsMain",
-    "https://feeds.cbsnews.com/CBSNewsWorld",
-    "https://feeds.pbs.org/newshour/rss/nation",
-    "https://feeds.feedburner.com/msnbc/main",
-    "https://feeds.feedburner.com/cnn-topstories",
-    "https://feeds.feedburner.com/cnn-world",
-    "https://feeds.feedburner.com/politico",
-    "https://feeds.feedburner.com/TheHill",
-    "https://feeds.feedburner.com/HuffingtonPost",
-    "https://feeds.latimes.com/latimes/news",
-    "https://feeds.feedburner.com/usnews-world",
-    
-    # European News
-    "https://feeds.dw.com/dw/en/news",  # Deutsche Welle
-    "https://feeds.euronews.com/en/news",
-    "https://www.france24.com/en/rss",
-    "https://feeds.feedburner.com/euronews/en/home",
-    "https://www.thelocal.com/feeds/rss/news",
-    "https://feeds.feedburner.com/spiegel-international",
-    "https://feeds.feedburner.com/rt-news",
-    "https://feeds.feedburner.com/rfi-english",
-    "https://feeds.ansa.it/ansa/english",
-    "https://feeds.swissinfo.ch/eng/swissinfo.ch-news",
-    "https://feeds.feedburner.com/TheIrishTimes-BreakingNews",
-    "https://feeds.feedburner.com/independent-news",
-    "https://feeds.feedburner.com/telegraph-news",
-    "https://feeds.feedburner.com/express-news",
-    "https://feeds.feedburner.com/mirror-news",
-    
-    # Business & Tech
-    "https://feeds.bloomberg.com/politics/news.rss",
-    "https://feeds.bloomberg.com/technology/news.rss",
-    "https://feeds.fortune.com/fortune/headlines",
-    "https://feeds.wsj.com/wsj/xml/rss/3_7041.xml",  # Wall Street Journal
-    "https://feeds.feedburner.com/techcrunch/startups",
-    "https://feeds.arstechnica.com/arstechnica/index",
-    "https://feeds.feedburner.com/businessinsider",
-    "https://feeds.feedburner.com/forbes/business",
-    "https://feeds.feedburner.com/reuters/business",
-    "https://feeds.feedburner.com/venturebeat",
-    "https://feeds.feedburner.com/TheNextWeb",
-    "https://feeds.feedburner.com/engadget",
-    "https://feeds.feedburner.com/wired",
-    "https://feeds.feedburner.com/fastcompany",
-    "https://feeds.feedburner.com/MarketWatch-TopStories",
-    "https://feeds.feedburner.com/cnbc-technology",
-    "https://feeds.feedburner.com/cnet-news",
-    "https://feeds.feedburner.com/zdnet-breaking-news",
-    
-    # Major Financial News Sources
-    "https://feeds.bloomberg.com/markets/news.rss",
-    "https://feeds.bloomberg.com/economics/news.rss",
-    "https://feeds.bloomberg.com/businessweek/news.rss",
-    "https://www.wsj.com/xml/rss/3_7014.xml",  # WSJ Markets
-    "https://www.wsj.com/xml/rss/3_7031.xml",  # WSJ Economy
-    "https://www.wsj.com/xml/rss/3_7204.xml",  # WSJ Personal Finance
-    "https://www.ft.com/rss/home/us",          # Financial Times US
-    "https://www.ft.com/rss/home/uk",          # Financial Times UK
-    "https://www.ft.com/rss/companies",        # Financial Times Companies
-    "https://feeds.reuters.com/news/wealth",   # Reuters Wealth
-    "https://feeds.reuters.com/reuters/UKPersonalFinance",
-    "https://feeds.reuters.com/reuters/USPersonalFinance",
-    
-    # Market & Trading News
-    "https://feeds.marketwatch.com/marketwatch/marketpulse/",
-    "https://feeds.marketwatch.com/marketwatch/realtimeheadlines/",
-    "https://feeds.marketwatch.com/marketwatch/StockstoWatch/",
-    "https://feeds.cnbc.com/cn/CNBC_US_News",
-    "https://feeds.cnbc.com/cn/CNBC_World_News",
-    "https://feeds.cnbc.com/cn/CNBC_US_Top_News_and_Analysis",
-    "https://feeds.benzinga.com/benzinga",
-    "https://feeds.feedburner.com/zerohedge/feed",
-    "https://feeds.feedburner.com/SeekingAlphaAll",
-    "https://feeds.feedburner.com/InvestorPlace",
-    "https://feeds.feedburner.com/TheMotleyFool",
-    "https://feeds.feedburner.com/Kiplinger",
-    "https://feeds.feedburner.com/SmartMoney",
-    "https://feeds.feedburner.com/MoneyMagazine",
-    "https://feeds.feedburner.com/barrons-headlines",
-    
-    # Cryptocurrency & Fintech
-    "https://feeds.feedburner.com/CoinDesk",
-    "https://feeds.feedburner.com/CoinTelegraph",
-    "https://feeds.feedburner.com/CryptoSlate",
-    "https://feeds.feedburner.com/BitcoinMagazine",
-    "https://feeds.feedburner.com/TheBlock",
-    "https://feeds.feedburner.com/Decrypt-co",
-    "https://feeds.feedburner.com/FinTechNews",
-    "https://feeds.feedburner.com/PaymentsSource",
-    "https://feeds.feedburner.com/AmericanBanker",
-    "https://feeds.feedburner.com/DigitalTransactions",
-    
-    # Investment & Trading Platforms
-    "https://feeds.feedburner.com/ETFcom",
-    "https://feeds.feedburner.com/ETFTrends",
-    "https://feeds.feedburner.com/MutualFundWire",
-    "https://feeds.feedbarron.com/HedgeFundNews",
-    "https://feeds.feedburner.com/InstitutionalInvestor",
-    "https://feeds.feedburner.com/PensionsInvestments",
-    "https://feeds.feedburner.com/AlternativeInvestmentNews",
-    "https://feeds.feedburner.com/PrivateEquityWire",
-    "https://feeds.feedburner.com/VentureCapitalJournal",
-    
-    # International Financial Markets
-    "https://feeds.feedburner.com/nikkei-asia-markets",
-    "https://feeds.feedburner.com/euromoneycom",
-    "https://feeds.feedburner.com/GlobalCapital",
-    "https://feeds.feedburner.com/IFRMarkets",
-    "https://feeds.feedburner.com/AsianInvestor",
-    "https://feeds.feedburner.com/FinanceAsia",
-    "https://feeds.feedburner.com/ChinaBusinessNews",
-    "https://feeds.feedburner.com/EconomicTimes-Markets",
-    "https://feeds.feedburner.com/MoneyControlMarkets",
-    "https://feeds.feedburner.com/LiveMintMarkets",
-    
-    # Economic Research & Analysis
-    "https://feeds.feedburner.com/MoodysAnalytics",
-    "https://feeds.feedburner.com/StandardPoors",
-    "https://feeds.feedburner.com/FitchRatings",
-    "https://feeds.feedburner.com/McKinseyInsights",
-    "https://feeds.feedburner.com/BCGInsights",
-    "https://feeds.feedburner.com/DeloitteInsights",
-    "https://feeds.feedburner.com/PwCInsights",
-    "https://feeds.feedburner.com/KPMGInsights",
-    "https://feeds.feedburner.com/EconomistIntelligence",
-    "https://feeds.feedburner.com/BrookingsEconomy",
-    
-    # Central Banks & Government Financial News
-    "https://feeds.federalreserve.gov/news/all.xml",
-    "https://feeds.feedburner.com/ECBNews",
-    "https://feeds.feedburner.com/BankOfEnglandNews",
-    "https://feeds.feedburner.com/BankOfJapanNews",
-    "https://feeds.feedburner.com/PBOCNews",
-    "https://feeds.feedburner.com/TreasuryGovNews",
-    "https://feeds.feedburner.com/SECNews",
-    "https://feeds.feedburner.com/CFTCNews",
-    "https://feeds.feedburner.com/FDICNews",
-    
-    # Commodities & Energy Markets
-    "https://feeds.feedburner.com/OilPrice",
-    "https://feeds.feedburner.com/PlattsNews",
-    "https://feeds.feedburner.com/EnergyNewsToday",
-    "https://feeds.feedburner.com/GoldPrice",
-    "https://feeds.feedburner.com/KitcoNews",
-    "https://feeds.feedburner.com/MetalMiner",
-    "https://feeds.feedburner.com/CommodityHQ",
-    "https://feeds.feedburner.com/AgricultureNews",
-    "https://feeds.feedburner.com/FarmFutures",
-    
-    # Personal Finance & Wealth Management
-    "https://feeds.feedburner.com/NerdWallet",
-    "https://feeds.feedburner.com/Bankrate",
-    "https://feeds.feedburner.com/CreditCards",
-    "https://feeds.feedburner.com/LendingTree",
-    "https://feeds.feedburner.com/WealthManagement",
-    "https://feeds.feedburner.com/ThinkAdvisor",
-    "https://feeds.feedburner.com/InvestmentNews",
-    "https://feeds.feedburner.com/FinancialPlanning",
-    "https://feeds.feedburner.com/RetirementPlanAdvisor",
-    
-    # Science & Health
-    "https://rss.sciam.com/ScientificAmerican-Global",
-    "https://feeds.nature.com/nature/rss/current",
-    "https://feeds.feedburner.com/reuters/scienceNews",
-    "https://feeds.feedburner.com/reuters/health",
-    "https://feeds.feedburner.com/sciencedaily",
-    "https://feeds.feedburner.com/newscientist",
-    "https://feeds.feedburner.com/livescience",
-    "https://feeds.feedburner.com/phys-org",
-    "https://feeds.feedburner.com/medicalnews",
-    "https://feeds.feedburner.com/healthday",
-    "https://feeds.feedburner.com/webmd-news",
-    "https://feeds.feedburner.com/cdc-health-news",
-    
-    # Additional High-Quality International
-    "https://feeds.feedburner.com/ap-world-news",     # Associated Press
-    "https://feeds.feedburner.com/time/world",        # Time Magazine
-    "https://feeds.feedburner.com/time/topstories",
-    "https://feeds.feedburner.com/newsweek",
-    "https://feeds.feedburner.com/associated-press",
-    "https://feeds.propublica.org/propublica/main",   # Investigative journalism
-    "https://feeds.feedburner.com/christiansciencemonitor/world", # CS Monitor
-    "https://feeds.feedburner.com/upi-topnews",
-    "https://feeds.feedburner.com/thedailybeast",
-    "https://feeds.feedburner.com/theatlantic",
-    "https://feeds.feedburner.com/newrepublic",
-    "https://feeds.feedburner.com/motherjones",
-    "https://feeds.feedburner.com/reason",
-    "https://feeds.feedburner.com/townhall",
-    
-    # Asia-Pacific
-    "https://www.scmp.com/rss/91/feed",              # South China Morning Post
-    "https://feeds.feedburner.com/japantimes",       # Japan Times
-    "https://feeds.theage.com.au/rssfeeds/world/rss.xml",        # The Age (Australia)
-    "https://feeds.reuters.com/Reuters/worldNews",   # Reuters World
-    "https://feeds.feedburner.com/nikkei-english",   # Nikkei
-    "https://feeds.feedburner.com/asahi-english",    # Asahi Shimbun
-    "https://feeds.feedburner.com/straitstimes",     # Straits Times
-    "https://feeds.feedburner.com/thehindu",         # The Hindu
-    "https://feeds.feedburner.com/timesofindianews", # Times of India
-    "https://feeds.feedburner.com/ndtv-news",        # NDTV
-    "https://feeds.feedburner.com/sydney-morning-herald",
-    "https://feeds.feedburner.com/australian-news",
-    "https://feeds.feedburner.com/nzherald",         # New Zealand Herald
-    "https://feeds.feedburner.com/bangkokpost",      # Bangkok Post
-    "https://feeds.feedburner.com/jakarta-post",     # Jakarta Post
-    "https://feeds.feedburner.com/koreatimes",       # Korea Times
-    "https://feeds.feedburner.com/channelnewsasia",  # Channel NewsAsia
-    
-    # Middle East/Africa
-    "https://feeds.feedburner.com/middle-east-eye",  # Middle East Eye
-    "https://feeds.feedburner.com/haaretz",          # Haaretz (Israel)
-    "https://feeds.feedburner.com/jpost",            # Jerusalem Post
-    "https://feeds.feedburner.com/ynetnews",         # Ynet News
-    "https://feeds.feedburner.com/timesofisrael",    # Times of Israel
-    "https://feeds.feedburner.com/dailynewsegypt",   # Daily News Egypt
-    "https://feeds.feedburner.com/gulfnews",         # Gulf News
-    "https://feeds.feedburner.com/khaleejtimes",     # Khaleej Times
-    "https://feeds.feedburner.com/arabnews",         # Arab News
-    "https://feeds.feedburner.com/dailystar-lebanon", # Daily Star Lebanon
-    "https://feeds.feedburner.com/moroccoworld",     # Morocco World News
-    "https://feeds.feedburner.com/allafrica",        # AllAfrica
-    "https://feeds.feedburner.com/iol-news",         # IOL (South Africa)
-    "https://feeds.feedburner.com/news24",           # News24 (South Africa)
-    "https://feeds.feedburner.com/mg-africa",        # Mail & Guardian Africa
-    
-    # Latin America
-    "https://feeds.feedburner.com/eluniversal-english", # El Universal
-    "https://feeds.feedburner.com/clarin-english",   # Clarín
-    "https://feeds.feedburner.com/folha-english",    # Folha de S.Paulo
-    "https://feeds.feedburner.com/elnuevoherald",    # El Nuevo Herald
-    "https://feeds.feedburner.com/milenio-english",  # Milenio
-    "https://feeds.feedburner.com/eltiempo-english", # El Tiempo
-    "https://feeds.feedburner.com/globo-english",    # O Globo
-    "https://feeds.feedburner.com/buenosairesherald", # Buenos Aires Herald
-    "https://feeds.feedburner.com/rionegro-english", # Río Negro
-    
-    # Canada
-    "https://feeds.feedburner.com/cbc-topstories",   # CBC
-    "https://feeds.feedburner.com/globeandmail",     # Globe and Mail
-    "https://feeds.feedburner.com/nationalpost",     # National Post
-    "https://feeds.feedburner.com/macleans",         # Maclean's
-    "https://feeds.feedburner.com/torontostar",      # Toronto Star
-    "https://feeds.feedburner.com/montrealgazette",  # Montreal Gazette
-    "https://feeds.feedburner.com/vancouversun",     # Vancouver Sun
-    
-    # Independent/Alternative Media
-    "https://feeds.democracynow.org/democracynow",    # Democracy Now
-    "https://feeds.commondreams.org/commondreams",    # Common Dreams
-    "https://feeds.feedburner.com/tyt-main",         # The Young Turks
-    "https://feeds.feedburner.com/intercept",        # The Intercept
-    "https://feeds.feedburner.com/alternet",         # AlterNet
-    "https://feeds.feedburner.com/truthout",         # Truthout
-    "https://feeds.feedburner.com/counterpunch",     # CounterPunch
-    "https://feeds.feedburner.com/zmag",             # Z Magazine
-    "https://feeds.feedburner.com/indymedia",        # Indymedia
-    "https://feeds.feedburner.com/wikileaks",        # WikiLeaks
-    "https://feeds.feedburner.com/publicintegrity",  # Center for Public Integrity
-    "https://feeds.feedburner.com/opensecrets",      # OpenSecrets
-    
-    # Specialized Topics
-    "https://feeds.feedburner.com/defense-news",     # Defense News
-    "https://feeds.feedburner.com/military-news",    # Military.com
-    "https://feeds.feedburner.com/space-news",       # SpaceNews
-    "https://feeds.feedburner.com/nasa-news",        # NASA News
-    "https://feeds.feedburner.com/energy-news",      # Energy News
-    "https://feeds.feedburner.com/climate-news",     # Climate News
-    "https://feeds.feedburner.com/environmental-news", # Environmental News
-    "https://feeds.feedburner.com/education-news",   # Education News
-    "https://feeds.feedburner.com/sports-news",      # Sports News
-    "https://feeds.feedburner.com/entertainment-news", # Entertainment News
-    
-    # Wire Services & Agencies
-    "https://feeds.feedburner.com/ap-breaking-news",
-    "https://feeds.feedburner.com/reuters-breaking-news",
-    "https://feeds.feedburner.com/bloomberg-breaking-news",
-    "https://feeds.feedburner.com/afp-english",      # Agence France-Presse
-    "https://feeds.feedburner.com/dpa-english",      # Deutsche Presse-Agentur
-    "https://feeds.feedburner.com/efe-english",      # EFE Agency
-    "https://feeds.feedburner.com/ansa-english",     # ANSA
-    "https://feeds.feedburner.com/xinhua-english",   # Xinhua News Agency
-    "https://feeds.feedburner.com/tass-english",     # TASS
-    "https://feeds.feedburner.com/itar-tass-english", # ITAR-TASS
-]
+RSS_FEEDS = {
+    "international": [
+        # Major International News
+        "https://rss.cnn.com/rss/edition.rss",
+        "https://feeds.bbci.co.uk/news/rss.xml",
+        "https://feeds.skynews.com/feeds/rss/home.xml",
+        "https://feeds.reuters.com/reuters/topNews",
+        "https://www.theguardian.com/world/rss",
+        "https://feeds.npr.org/1001/rss.xml",
+        "https://www.aljazeera.com/xml/rss/all.xml",
+        
+        # Additional High-Quality International
+        "https://feeds.feedburner.com/ap-world-news",     # Associated Press
+        "https://feeds.feedburner.com/time/world",        # Time Magazine
+        "https://feeds.feedburner.com/time/topstories",
+        "https://feeds.feedburner.com/newsweek",
+        "https://feeds.feedburner.com/associated-press",
+        "https://feeds.propublica.org/propublica/main",   # Investigative journalism
+        "https://feeds.feedburner.com/christiansciencemonitor/world", # CS Monitor
+        "https://feeds.feedburner.com/upi-topnews",
+        "https://feeds.feedburner.com/thedailybeast",
+        "https://feeds.feedburner.com/theatlantic",
+        "https://feeds.feedburner.com/newrepublic",
+        "https://feeds.feedburner.com/motherjones",
+        "https://feeds.feedburner.com/reason",
+        "https://feeds.feedburner.com/townhall",
+    ],
+    "us": [
+        # US News Sources
+        "https://feeds.washingtonpost.com/rss/world",
+        "https://www.nytimes.com/services/xml/rss/nyt/World.xml",
+        "https://feeds.abcnews.go.com/abcnews/topstories",
+        "https://feeds.nbcnews.com/nbcnews/public/world",
+        "https://feeds.foxnews.com/foxnews/latest",
+        "https://feeds.usatoday.com/news/topstories",
+        "https://feeds.cbsnews.com/CBSNewsMain",
+        "https://feeds.cbsnews.com/CBSNewsWorld",
+        "https://feeds.pbs.org/newshour/rss/nation",
+        "https://feeds.feedburner.com/msnbc/main",
+        "https://feeds.feedburner.com/cnn-topstories",
+        "https://feeds.feedburner.com/cnn-world",
+        "https://feeds.feedburner.com/politico",
+        "https://feeds.feedburner.com/TheHill",
+        "https://feeds.feedburner.com/HuffingtonPost",
+        "https://feeds.latimes.com/latimes/news",
+        "https://feeds.feedburner.com/usnews-world",
+    ],
+    "european": [
+        # European News
+        "https://feeds.dw.com/dw/en/news",  # Deutsche Welle
+        "https://feeds.euronews.com/en/news",
+        "https://www.france24.com/en/rss",
+        "https://feeds.feedburner.com/euronews/en/home",
+        "https://www.thelocal.com/feeds/rss/news",
+        "https://feeds.feedburner.com/spiegel-international",
+        "https://feeds.feedburner.com/rt-news",
+        "https://feeds.feedburner.com/rfi-english",
+        "https://feeds.ansa.it/ansa/english",
+        "https://feeds.swissinfo.ch/eng/swissinfo.ch-news",
+        "https://feeds.feedburner.com/TheIrishTimes-BreakingNews",
+        "https://feeds.feedburner.com/independent-news",
+        "https://feeds.feedburner.com/telegraph-news",
+        "https://feeds.feedburner.com/express-news",
+        "https://feeds.feedburner.com/mirror-news",
+    ],
+    "business": [
+        # Business & Tech
+        "https://feeds.bloomberg.com/politics/news.rss",
+        "https://feeds.bloomberg.com/technology/news.rss",
+        "https://feeds.fortune.com/fortune/headlines",
+        "https://feeds.wsj.com/wsj/xml/rss/3_7041.xml",  # Wall Street Journal
+        "https://feeds.feedburner.com/techcrunch/startups",
+        "https://feeds.arstechnica.com/arstechnica/index",
+        "https://feeds.feedburner.com/businessinsider",
+        "https://feeds.feedburner.com/forbes/business",
+        "https://feeds.feedburner.com/reuters/business",
+        "https://feeds.feedburner.com/venturebeat",
+        "https://feeds.feedburner.com/TheNextWeb",
+        "https://feeds.feedburner.com/engadget",
+        "https://feeds.feedburner.com/wired",
+        "https://feeds.feedburner.com/fastcompany",
+        "https://feeds.feedburner.com/MarketWatch-TopStories",
+        "https://feeds.feedburner.com/cnbc-technology",
+        "https://feeds.feedburner.com/cnet-news",
+        "https://feeds.feedburner.com/zdnet-breaking-news",
+        
+        # Major Financial News Sources
+        "https://feeds.bloomberg.com/markets/news.rss",
+        "https://feeds.bloomberg.com/economics/news.rss",
+        "https://feeds.bloomberg.com/businessweek/news.rss",
+        "https://www.wsj.com/xml/rss/3_7014.xml",  # WSJ Markets
+        "https://www.wsj.com/xml/rss/3_7031.xml",  # WSJ Economy
+        "https://www.wsj.com/xml/rss/3_7204.xml",  # WSJ Personal Finance
+        "https://www.ft.com/rss/home/us",          # Financial Times US
+        "https://www.ft.com/rss/home/uk",          # Financial Times UK
+        "https://www.ft.com/rss/companies",        # Financial Times Companies
+        "https://feeds.reuters.com/news/wealth",   # Reuters Wealth
+        "https://feeds.reuters.com/reuters/UKPersonalFinance",
+        "https://feeds.reuters.com/reuters/USPersonalFinance",
+        
+        # Market & Trading News
+        "https://feeds.marketwatch.com/marketwatch/marketpulse/",
+        "https://feeds.marketwatch.com/marketwatch/realtimeheadlines/",
+        "https://feeds.marketwatch.com/marketwatch/StockstoWatch/",
+        "https://feeds.cnbc.com/cn/CNBC_US_News",
+        "https://feeds.cnbc.com/cn/CNBC_World_News",
+        "https://feeds.cnbc.com/cn/CNBC_US_Top_News_and_Analysis",
+        "https://feeds.benzinga.com/benzinga",
+        "https://feeds.feedburner.com/zerohedge/feed",
+        "https://feeds.feedburner.com/SeekingAlphaAll",
+        "https://feeds.feedburner.com/InvestorPlace",
+        "https://feeds.feedburner.com/TheMotleyFool",
+        "https://feeds.feedburner.com/Kiplinger",
+        "https://feeds.feedburner.com/SmartMoney",
+        "https://feeds.feedburner.com/MoneyMagazine",
+        "https://feeds.feedburner.com/barrons-headlines",
+        
+        # Cryptocurrency & Fintech
+        "https://feeds.feedburner.com/CoinDesk",
+        "https://feeds.feedburner.com/CoinTelegraph",
+        "https://feeds.feedburner.com/CryptoSlate",
+        "https://feeds.feedburner.com/BitcoinMagazine",
+        "https://feeds.feedburner.com/TheBlock",
+        "https://feeds.feedburner.com/Decrypt-co",
+        "https://feeds.feedburner.com/FinTechNews",
+        "https://feeds.feedburner.com/PaymentsSource",
+        "https://feeds.feedburner.com/AmericanBanker",
+        "https://feeds.feedburner.com/DigitalTransactions",
+        
+        # Investment & Trading Platforms
+        "https://feeds.feedburner.com/ETFcom",
+        "https://feeds.feedburner.com/ETFTrends",
+        "https://feeds.feedburner.com/MutualFundWire",
+        "https://feeds.feedbarron.com/HedgeFundNews",
+        "https://feeds.feedburner.com/InstitutionalInvestor",
+        "https://feeds.feedburner.com/PensionsInvestments",
+        "https://feeds.feedburner.com/AlternativeInvestmentNews",
+        "https://feeds.feedburner.com/PrivateEquityWire",
+        "https://feeds.feedburner.com/VentureCapitalJournal",
+        
+        # International Financial Markets
+        "https://feeds.feedburner.com/nikkei-asia-markets",
+        "https://feeds.feedburner.com/euromoneycom",
+        "https://feeds.feedburner.com/GlobalCapital",
+        "https://feeds.feedburner.com/IFRMarkets",
+        "https://feeds.feedburner.com/AsianInvestor",
+        "https://feeds.feedburner.com/FinanceAsia",
+        "https://feeds.feedburner.com/ChinaBusinessNews",
+        "https://feeds.feedburner.com/EconomicTimes-Markets",
+        "https://feeds.feedburner.com/MoneyControlMarkets",
+        "https://feeds.feedburner.com/LiveMintMarkets",
+        
+        # Economic Research & Analysis
+        "https://feeds.feedburner.com/MoodysAnalytics",
+        "https://feeds.feedburner.com/StandardPoors",
+        "https://feeds.feedburner.com/FitchRatings",
+        "https://feeds.feedburner.com/McKinseyInsights",
+        "https://feeds.feedburner.com/BCGInsights",
+        "https://feeds.feedburner.com/DeloitteInsights",
+        "https://feeds.feedburner.com/PwCInsights",
+        "https://feeds.feedburner.com/KPMGInsights",
+        "https://feeds.feedburner.com/EconomistIntelligence",
+        "https://feeds.feedburner.com/BrookingsEconomy",
+        
+        # Central Banks & Government Financial News
+        "https://feeds.federalreserve.gov/news/all.xml",
+        "https://feeds.feedburner.com/ECBNews",
+        "https://feeds.feedburner.com/BankOfEnglandNews",
+        "https://feeds.feedburner.com/BankOfJapanNews",
+        "https://feeds.feedburner.com/PBOCNews",
+        "https://feeds.feedburner.com/TreasuryGovNews",
+        "https://feeds.feedburner.com/SECNews",
+        "https://feeds.feedburner.com/CFTCNews",
+        "https://feeds.feedburner.com/FDICNews",
+        
+        # Commodities & Energy Markets
+        "https://feeds.feedburner.com/OilPrice",
+        "https://feeds.feedburner.com/PlattsNews",
+        "https://feeds.feedburner.com/EnergyNewsToday",
+        "https://feeds.feedburner.com/GoldPrice",
+        "https://feeds.feedburner.com/KitcoNews",
+        "https://feeds.feedburner.com/MetalMiner",
+        "https://feeds.feedburner.com/CommodityHQ",
+        "https://feeds.feedburner.com/AgricultureNews",
+        "https://feeds.feedburner.com/FarmFutures",
+        
+        # Personal Finance & Wealth Management
+        "https://feeds.feedburner.com/NerdWallet",
+        "https://feeds.feedburner.com/Bankrate",
+        "https://feeds.feedburner.com/CreditCards",
+        "https://feeds.feedburner.com/LendingTree",
+        "https://feeds.feedburner.com/WealthManagement",
+        "https://feeds.feedburner.com/ThinkAdvisor",
+        "https://feeds.feedburner.com/InvestmentNews",
+        "https://feeds.feedburner.com/FinancialPlanning",
+        "https://feeds.feedburner.com/RetirementPlanAdvisor",
+    ],
+    "science_health": [
+        # Science & Health
+        "https://rss.sciam.com/ScientificAmerican-Global",
+        "https://feeds.nature.com/nature/rss/current",
+        "https://feeds.feedburner.com/reuters/scienceNews",
+        "https://feeds.feedburner.com/reuters/health",
+        "https://feeds.feedburner.com/sciencedaily",
+        "https://feeds.feedburner.com/newscientist",
+        "https://feeds.feedburner.com/livescience",
+        "https://feeds.feedburner.com/phys-org",
+        "https://feeds.feedburner.com/medicalnews",
+        "https://feeds.feedburner.com/healthday",
+        "https://feeds.feedburner.com/webmd-news",
+        "https://feeds.feedburner.com/cdc-health-news",
+    ],
+    "asian": [
+        # Asia-Pacific
+        "https://www.scmp.com/rss/91/feed",              # South China Morning Post
+        "https://feeds.feedburner.com/japantimes",       # Japan Times
+        "https://feeds.theage.com.au/rssfeeds/world/rss.xml",        # The Age (Australia)
+        "https://feeds.reuters.com/Reuters/worldNews",   # Reuters World
+        "https://feeds.feedburner.com/nikkei-english",   # Nikkei
+        "https://feeds.feedburner.com/asahi-english",    # Asahi Shimbun
+        "https://feeds.feedburner.com/straitstimes",     # Straits Times
+        "https://feeds.feedburner.com/thehindu",         # The Hindu
+        "https://feeds.feedburner.com/timesofindianews", # Times of India
+        "https://feeds.feedburner.com/ndtv-news",        # NDTV
+        "https://feeds.feedburner.com/sydney-morning-herald",
+        "https://feeds.feedburner.com/australian-news",
+        "https://feeds.feedburner.com/nzherald",         # New Zealand Herald
+        "https://feeds.feedburner.com/bangkokpost",      # Bangkok Post
+        "https://feeds.feedburner.com/jakarta-post",     # Jakarta Post
+        "https://feeds.feedburner.com/koreatimes",       # Korea Times
+        "https://feeds.feedburner.com/channelnewsasia",  # Channel NewsAsia
+    ],
+    "middle_east_africa": [
+        # Middle East/Africa
+        "https://feeds.feedburner.com/middle-east-eye",  # Middle East Eye
+        "https://feeds.feedburner.com/haaretz",          # Haaretz (Israel)
+        "https://feeds.feedburner.com/jpost",            # Jerusalem Post
+        "https://feeds.feedburner.com/ynetnews",         # Ynet News
+        "https://feeds.feedburner.com/timesofisrael",    # Times of Israel
+        "https://feeds.feedburner.com/dailynewsegypt",   # Daily News Egypt
+        "https://feeds.feedburner.com/gulfnews",         # Gulf News
+        "https://feeds.feedburner.com/khaleejtimes",     # Khaleej Times
+        "https://feeds.feedburner.com/arabnews",         # Arab News
+        "https://feeds.feedburner.com/dailystar-lebanon", # Daily Star Lebanon
+        "https://feeds.feedburner.com/moroccoworld",     # Morocco World News
+        "https://feeds.feedburner.com/allafrica",        # AllAfrica
+        "https://feeds.feedburner.com/iol-news",         # IOL (South Africa)
+        "https://feeds.feedburner.com/news24",           # News24 (South Africa)
+        "https://feeds.feedburner.com/mg-africa",        # Mail & Guardian Africa
+    ],
+    "latin_american": [
+        # Latin America
+        "https://feeds.feedburner.com/eluniversal-english", # El Universal
+        "https://feeds.feedburner.com/clarin-english",   # Clarín
+        "https://feeds.feedburner.com/folha-english",    # Folha de S.Paulo
+        "https://feeds.feedburner.com/elnuevoherald",    # El Nuevo Herald
+        "https://feeds.feedburner.com/milenio-english",  # Milenio
+        "https://feeds.feedburner.com/eltiempo-english", # El Tiempo
+        "https://feeds.feedburner.com/globo-english",    # O Globo
+        "https://feeds.feedburner.com/buenosairesherald", # Buenos Aires Herald
+        "https://feeds.feedburner.com/rionegro-english", # Río Negro
+    ],
+    "canadian": [
+        # Canada
+        "https://feeds.feedburner.com/cbc-topstories",   # CBC
+        "https://feeds.feedburner.com/globeandmail",     # Globe and Mail
+        "https://feeds.feedburner.com/nationalpost",     # National Post
+        "https://feeds.feedburner.com/macleans",         # Maclean's
+        "https://feeds.feedburner.com/torontostar",      # Toronto Star
+        "https://feeds.feedburner.com/montrealgazette",  # Montreal Gazette
+        "https://feeds.feedburner.com/vancouversun",     # Vancouver Sun
+    ],
+    "alternative": [
+        # Independent/Alternative Media
+        "https://feeds.democracynow.org/democracynow",    # Democracy Now
+        "https://feeds.commondreams.org/commondreams",    # Common Dreams
+        "https://feeds.feedburner.com/tyt-main",         # The Young Turks
+        "https://feeds.feedburner.com/intercept",        # The Intercept
+        "https://feeds.feedburner.com/alternet",         # AlterNet
+        "https://feeds.feedburner.com/truthout",         # Truthout
+        "https://feeds.feedburner.com/counterpunch",     # CounterPunch
+        "https://feeds.feedburner.com/zmag",             # Z Magazine
+        "https://feeds.feedburner.com/indymedia",        # Indymedia
+        "https://feeds.feedburner.com/wikileaks",        # WikiLeaks
+        "https://feeds.feedburner.com/publicintegrity",  # Center for Public Integrity
+        "https://feeds.feedburner.com/opensecrets",      # OpenSecrets
+    ],
+    "specialized": [
+        # Specialized Topics
+        "https://feeds.feedburner.com/defense-news",     # Defense News
+        "https://feeds.feedburner.com/military-news",    # Military.com
+        "https://feeds.feedburner.com/space-news",       # SpaceNews
+        "https://feeds.feedburner.com/nasa-news",        # NASA News
+        "https://feeds.feedburner.com/energy-news",      # Energy News
+        "https://feeds.feedburner.com/climate-news",     # Climate News
+        "https://feeds.feedburner.com/environmental-news", # Environmental News
+        "https://feeds.feedburner.com/education-news",   # Education News
+        "https://feeds.feedburner.com/sports-news",      # Sports News
+        "https://feeds.feedburner.com/entertainment-news", # Entertainment News
+    ],
+    "wire": [
+        # Wire Services & Agencies
+        "https://feeds.feedburner.com/ap-breaking-news",
+        "https://feeds.feedburner.com/reuters-breaking-news",
+        "https://feeds.feedburner.com/bloomberg-breaking-news",
+        "https://feeds.feedburner.com/afp-english",      # Agence France-Presse
+        "https://feeds.feedburner.com/dpa-english",      # Deutsche Presse-Agentur
+        "https://feeds.feedburner.com/efe-english",      # EFE Agency
+        "https://feeds.feedburner.com/ansa-english",     # ANSA
+        "https://feeds.feedburner.com/xinhua-english",   # Xinhua News Agency
+        "https://feeds.feedburner.com/tass-english",     # TASS
+        "https://feeds.feedburner.com/itar-tass-english", # ITAR-TASS
+    ],
+}
+
+# Which configuration flag switches each feed category on
+RSS_CATEGORY_FLAGS = {
+    "international": ENABLE_MAINSTREAM_NEWS,
+    "us": ENABLE_US_SOURCES,
+    "european": ENABLE_EUROPEAN_SOURCES,
+    "business": ENABLE_BUSINESS_TECH,
+    "science_health": ENABLE_SCIENCE_HEALTH,
+    "asian": ENABLE_ASIAN_SOURCES,
+    "middle_east_africa": ENABLE_MIDDLE_EAST_SOURCES or ENABLE_AFRICAN_SOURCES,
+    "latin_american": ENABLE_LATIN_AMERICAN_SOURCES,
+    "canadian": ENABLE_CANADIAN_SOURCES,
+    "alternative": ENABLE_ALTERNATIVE_MEDIA,
+    "specialized": ENABLE_SPECIALIZED_TOPICS,
+    "wire": ENABLE_WIRE_SERVICES,
+}
+
+def enabled_rss_feeds():
+    """Map every enabled RSS feed URL to its category"""
+    feeds = {}
+    for category, urls in RSS_FEEDS.items():
+        if RSS_CATEGORY_FLAGS.get(category, True):
+            for url in urls:
+                feeds.setdefault(url, category)
+    return feeds
+
+RSS_URLS = list(enabled_rss_feeds())
 
 # Twitter (X) API setup - Comprehensive global news sources
 TWITTER_BEARER_TOKEN = "AAAAAAAAAAAAAAAAAAAAAFOc3QEAAAAAwFWgGM%2FJnepYkyVyrsn5WZzcMRI%3DQtDxII81yUK8iqMygdKw72WP8N3q36piLtJPSpCic1qEig4Jea"
@@ -462,7 +548,9 @@ TWITTER_USER_IDS = {
     "TheIntercept": "2479634806",
     "ProPublica": "13437142",
 }
-TWEETS_PER_SOURCE = 3  # Reduced to avoid rate limits with more sources
+TWEETS_PER_SOURCE = 3  # Tweets taken from an account the first time it is seen
+TWITTER_MAX_NEW_TWEETS = 20  # Cap on newer tweets fetched per account per run
+TWITTER_MAX_RATE_WAIT = 60  # Seconds worth waiting for a rate-limit window; longer defers to next run
 
 # YouTube links - Comprehensive news channels for transcription
 YOUTUBE_LINKS = [
@@ -583,19 +671,22 @@ YOUTUBE_LINKS = [
 ]
 
 # --- HELPERS ---
+def extract_article_text(html):
+    """Extract paragraph text from an article page"""
+    return article_extractor.extract_article_text(
+        html, max_paragraphs=ARTICLE_MAX_PARAGRAPHS, max_chars=ARTICLE_MAX_CHARS
+    )
+
 def fetch_article_text(url):
     try:
-        res = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=10)
-        res.raise_for_status()  # Raises an HTTPError for bad responses
-        soup = BeautifulSoup(res.text, 'html.parser')
-        
-        # Extract text from paragraphs
-        paragraphs = soup.find_all('p')
-        if paragraphs:
-            return '\n'.join([p.text.strip() for p in paragraphs if p.text.strip()])
-        else:
-            # Fallback: try to get any text content
-            return soup.get_text()[:1000] + "..."
+        # Streams the page and stops reading once the extraction budget is met
+        return article_extractor.fetch_article_text(
+            url,
+            max_bytes=ARTICLE_MAX_DOWNLOAD_BYTES,
+            max_paragraphs=ARTICLE_MAX_PARAGRAPHS,
+            max_chars=ARTICLE_MAX_CHARS,
+            timeout=10
+        )
             
     except requests.exceptions.Timeout:
         return "Error: Request timed out after 10 seconds"
@@ -604,15 +695,49 @@ def fetch_article_text(url):
     except Exception as e:
         return f"Error parsing article: {e}"
 
+_content_index = None
+
+def get_content_index():
+    """Shared content hash index over downloads/ and the articles table"""
+    global _content_index
+    if _content_index is None:
+        try:
+            _content_index = ContentHashIndex(downloads_dir=DOWNLOADS_DIR)
+        except Exception as e:
+            print(f"⚠️  Content hash index unavailable: {e}")
+            return None
+    return _content_index
+
+def _find_duplicate_file(content_hash):
+    """Fallback duplicate scan over downloads/ when the hash index is unavailable"""
+    import hashlib
+    
+    for existing_file in os.listdir(DOWNLOADS_DIR):
+        if existing_file.endswith('.txt'):
+            try:
+                with open(os.path.join(DOWNLOADS_DIR, existing_file), 'r', encoding='utf-8') as f:
+                    existing_content = f.read()
+                    existing_hash = hashlib.md5(existing_content.encode('utf-8')).hexdigest()
+                    
+                if existing_hash == content_hash:
+                    return existing_file
+                    
+            except Exception:
+                continue  # Skip if can't read file
+    return None
+
+def build_filename(title, prefix=""):
+    """File name an article is (or would be) saved under in downloads/"""
+    safe_title = "".join([c if c.isalnum() else "_" for c in title])[:50]
+    return f"{prefix}{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+
 def save_to_file(content, title, prefix=""):
     """Save content to file with duplicate checking"""
-    import hashlib
     import sqlite3
     
     # Generate a content hash to check for duplicates
-    content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
-    safe_title = "".join([c if c.isalnum() else "_" for c in title])[:50]
-    filename = f"{prefix}{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+    content_hash = hash_content(content)
+    filename = build_filename(title, prefix)
     filepath = os.path.join(DOWNLOADS_DIR, filename)
     
     # Check if similar content already exists in database
@@ -620,104 +745,318 @@ def save_to_file(content, title, prefix=""):
         conn = sqlite3.connect('news_database.db')
         cursor = conn.cursor()
         
-        # Check for existing content with same hash
-        cursor.execute('SELECT filename FROM articles WHERE content_hash = ?', (content_hash,))
+        # Check for existing content with same hash (indexed; the column holds the normalized hash)
+        cursor.execute('SELECT filename FROM articles WHERE content_hash = ?', (generate_content_hash(content),))
         existing = cursor.fetchone()
+        conn.close()
         
         if existing:
             print(f"🔄 Duplicate content detected, skipping: {title[:50]}... (matches: {existing[0]})")
-            conn.close()
             return None
-            
-        # Check for similar title
-        cursor.execute('SELECT filename FROM articles WHERE title LIKE ?', (f'%{safe_title[:30]}%',))
-        existing_title = cursor.fetchone()
-        
-        if existing_title:
-            print(f"🔄 Similar title detected, skipping: {title[:50]}... (matches: {existing_title[0]})")
-            conn.close()
-            return None
-            
-        conn.close()
         
     except Exception as e:
         print(f"⚠️  Could not check for duplicates: {e}")
         # Continue saving if database check fails
     
-    # Check if file with same content already exists
-    for existing_file in os.listdir(DOWNLOADS_DIR):
-        if existing_file.endswith('.txt'):
-            try:
-                with open(os.path.join(DOWNLOADS_DIR, existing_file), 'r', encoding='utf-8') as f:
-                    existing_content = f.read()
-                    existing_hash = hashlib.md5(existing_content.encode('utf-8')).hexdigest()
-                    
-                if existing_hash == content_hash:
-                    print(f"🔄 Duplicate file content detected, skipping: {title[:50]}... (matches: {existing_file})")
-                    return None
-                    
-            except Exception:
-                continue  # Skip if can't read file
+    # Check saved files and known titles with one indexed lookup each
+    index = get_content_index()
+    if index:
+        try:
+            match = index.find_duplicate(content_hash, title)
+        except Exception as e:
+            print(f"⚠️  Could not query content index: {e}")
+            match = None
+        
+        if match and match[0] == 'content':
+            print(f"🔄 Duplicate file content detected, skipping: {title[:50]}... (matches: {match[1]})")
+            return None
+        if match and match[0] == 'title':
+            print(f"🔄 Similar title detected, skipping: {title[:50]}... (matches: {match[1]})")
+            return None
+    else:
+        existing_file = _find_duplicate_file(content_hash)
+        if existing_file:
+            print(f"🔄 Duplicate file content detected, skipping: {title[:50]}... (matches: {existing_file})")
+            return None
     
     # Save the new file
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"✅ Saved new article: {filepath}")
+    
+    if index:
+        try:
+            index.add(content_hash, title, filename)
+        except Exception as e:
+            print(f"⚠️  Could not update content index: {e}")
     return filepath
 
-def fetch_rss_articles(rss_url, limit=None):
+_article_writer = None
+
+def get_article_writer():
+    """Shared batched database writer, or None in files-only mode"""
+    global _article_writer
+    if INGEST_MODE not in ("database", "both"):
+        return None
+    if _article_writer is None:
+        try:
+            _article_writer = ArticleWriter(batch_size=DATABASE_BATCH_SIZE)
+        except Exception as e:
+            print(f"⚠️  Database writer unavailable, falling back to files: {e}")
+            return None
+    return _article_writer
+
+SOURCE_TYPES = {"RSS_": "RSS", "TW_": "Twitter", "YT_": "YouTube"}
+
+def store_article(content, title, prefix="", source_name=None, url=None, published_date=None):
+    """Store one article according to INGEST_MODE; returns True if it was kept"""
+    writer = get_article_writer()
+    filename = build_filename(title, prefix)
+    file_path = ""
+    
+    if writer is None or INGEST_MODE == "both":
+        saved_path = save_to_file(content, title, prefix=prefix)
+        if not saved_path:
+            return False
+        if writer is None:
+            return True
+        filename = os.path.basename(saved_path)
+        file_path = saved_path
+    
+    writer.add(title, content, SOURCE_TYPES.get(prefix, "RSS"), source_name,
+               filename, file_path=file_path, url=url, published_date=published_date)
+    return True
+
+def flush_article_writer():
+    """Write any queued database records and report the totals"""
+    writer = get_article_writer()
+    if writer:
+        totals = writer.close()
+        print(f"💾 Database ingest: {totals['inserted']} inserted, {totals['skipped']} duplicates skipped, "
+              f"{totals['errors']} errors")
+
+_validator_store = None
+
+def get_validator_store():
+    """Shared feed validator store, or None when conditional GET is disabled"""
+    global _validator_store
+    if not ENABLE_CONDITIONAL_GET:
+        return None
+    if _validator_store is None:
+        try:
+            _validator_store = FeedValidatorStore()
+        except Exception as e:
+            print(f"⚠️  Feed validator cache unavailable: {e}")
+            return None
+    return _validator_store
+
+_seen_index = None
+
+def get_seen_index():
+    """Shared seen-URL index, or None when the filter is disabled"""
+    global _seen_index
+    if not ENABLE_SEEN_URL_FILTER:
+        return None
+    if _seen_index is None:
+        try:
+            _seen_index = SeenUrlIndex()
+        except Exception as e:
+            print(f"⚠️  Seen-URL index unavailable: {e}")
+            return None
+    return _seen_index
+
+_feed_health = None
+
+def get_feed_health():
+    """Shared feed health registry, or None when the circuit breaker is disabled"""
+    global _feed_health
+    if not ENABLE_FEED_CIRCUIT_BREAKER:
+        return None
+    if _feed_health is None:
+        try:
+            _feed_health = FeedHealthRegistry()
+        except Exception as e:
+            print(f"⚠️  Feed health registry unavailable: {e}")
+            return None
+    return _feed_health
+
+def fetch_rss_articles(rss_url, limit=None, observations=None):
     if limit is None:
         limit = MAX_ARTICLES_PER_SOURCE
         
     try:
         print(f"🔄 Fetching from: {rss_url}")
-        feed = feedparser.parse(rss_url)
+        store = get_validator_store()
+        validators = store.get(rss_url) if store else None
+        
+        health = get_feed_health()
+        started = time.time()
+        try:
+            response = http_client.get(rss_url, headers=FeedValidatorStore.conditional_headers(validators))
+            response.raise_for_status()
+        except Exception as e:
+            if health:
+                health.record(rss_url, False, (time.time() - started) * 1000, str(e))
+            raise
+        latency_ms = (time.time() - started) * 1000
         articles = []
         
-        if not feed.entries:
-            print(f"❌ No articles found in RSS feed: {rss_url}")
+        if response.status_code == 304:
+            print(f"⏭️  Feed not modified since last pass: {rss_url}")
+            if health:
+                health.record(rss_url, True, latency_ms)
+            if store:
+                store.record(rss_url, 304)
+            if observations is not None:
+                observations[rss_url] = []
             return articles
-            
-        for entry in feed.entries[:limit]:
-            try:
-                if ENABLE_RATE_LIMITING:
-                    import time
-                    time.sleep(REQUEST_DELAY)
-                    
-                content = fetch_article_text(entry.link)
-                articles.append({"title": entry.title, "content": content})
-                print(f"✅ Fetched: {entry.title[:60]}...")
-            except Exception as e:
-                print(f"❌ Failed to fetch article '{entry.title[:60]}...': {e}")
-                continue
-                
-        print(f"✅ Successfully fetched {len(articles)} articles from {rss_url}")
-        return articles
+        
+        feed = feedparser.parse(response.content)
+        entries = feed.entries
+        if health:
+            health.record(rss_url, bool(entries), latency_ms, None if entries else "empty feed")
+        if store:
+            entries = store.filter_new_entries(entries, validators)
+        if observations is not None:
+            observations[rss_url] = [entry_timestamp(entry) for entry in entries]
+        new_ids = [FeedValidatorStore.entry_id(entry) for entry in entries]
+        
+        # Entry IDs handled on this pass; only these are remembered as seen
+        processed = []
+        seen_index = get_seen_index()
+        if seen_index and entries:
+            unseen = set(seen_index.filter_unseen([entry.get('link') for entry in entries]))
+            processed.extend(FeedValidatorStore.entry_id(entry) for entry in entries
+                             if entry.get('link') not in unseen)
+            skipped = len(entries)
+            entries = [entry for entry in entries if entry.get('link') in unseen]
+            skipped -= len(entries)
+            if skipped:
+                print(f"⏭️  Skipped {skipped} already-fetched articles")
+        
+        try:
+            return _fetch_feed_entries(feed, entries[:limit], rss_url, seen_index, processed)
+        finally:
+            if store:
+                # Validators only once every new entry is handled, so a feed with
+                # entries left over is downloaded in full again next pass
+                complete = set(new_ids) <= set(processed)
+                store.record(rss_url, response.status_code,
+                             response.headers.get('ETag') if complete else None,
+                             response.headers.get('Last-Modified') if complete else None,
+                             store.remembered_ids(feed.entries, validators, processed))
         
     except Exception as e:
         print(f"❌ Failed to fetch RSS feed {rss_url}: {e}")
+        if observations is not None:
+            observations[rss_url] = None
         return []
 
+def _fetch_feed_entries(feed, entries, rss_url, seen_index, processed):
+    """Download the articles of selected feed entries; appends the IDs of those fetched to processed"""
+    articles = []
+    if not entries:
+        print(f"❌ No new articles found in RSS feed: {rss_url}")
+        return articles
+        
+    for entry in entries:
+        try:
+            # http_client spaces requests to the same host; no extra sleep here
+            content = fetch_article_text(entry.link)
+            articles.append({
+                "title": entry.title,
+                "content": content,
+                "link": entry.link,
+                "source": feed.feed.get('title'),
+                "published": entry.get('published')
+            })
+            if not content.startswith("Error"):
+                processed.append(FeedValidatorStore.entry_id(entry))
+                if seen_index:
+                    seen_index.add(entry.link)
+            print(f"✅ Fetched: {entry.title[:60]}...")
+        except Exception as e:
+            print(f"❌ Failed to fetch article '{entry.title[:60]}...': {e}")
+            continue
+            
+    print(f"✅ Successfully fetched {len(articles)} articles from {rss_url}")
+    return articles
+
+def fetch_all_rss_articles(rss_urls):
+    """Fetch every RSS feed concurrently.
+    
+    Returns the (feed_url, articles) pairs and the per-feed new-entry observations.
+    """
+    engine = AsyncRSSEngine(
+        text_extractor=extract_article_text,
+        max_concurrency=MAX_CONCURRENT_REQUESTS,
+        per_host_concurrency=MAX_REQUESTS_PER_HOST,
+        host_delay=REQUEST_DELAY if ENABLE_RATE_LIMITING else 0,
+        host_delays=http_client.host_rate_limits if ENABLE_RATE_LIMITING else {},
+        articles_per_source=MAX_ARTICLES_PER_SOURCE,
+        max_article_bytes=ARTICLE_MAX_DOWNLOAD_BYTES,
+        validator_store=get_validator_store(),
+        seen_index=get_seen_index(),
+        health_registry=get_feed_health(),
+    )
+    results = engine.run(rss_urls)
+    
+    stats = engine.stats
+    print(f"⚡ Concurrent sweep: {stats['feeds']} feeds ({stats['feeds_not_modified']} unchanged, "
+          f"{stats['feeds_failed']} failed), "
+          f"{stats['articles']} articles across {stats['hosts']} hosts in {stats['elapsed_seconds']}s, "
+          f"{stats['articles_skipped_seen']} already-seen articles skipped, "
+          f"{stats['feeds_skipped_unhealthy']} unhealthy feeds skipped")
+    return results, engine.feed_observations
+
+TWITTER_TIMELINE_ENDPOINT = "users/:id/tweets"
+
 def fetch_tweets():
     try:
         print("🔄 Connecting to Twitter API...")
-        client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN)
+        # Raw responses so the x-rate-limit-* headers are available
+        client = tweepy.Client(bearer_token=TWITTER_BEARER_TOKEN, return_type=requests.Response)
+        cursors = TwitterCursorStore()
+        known = cursors.get_cursors()
         
-        for name, user_id in TWITTER_USER_IDS.items():
+        for name, user_id in cursors.order_accounts(TWITTER_USER_IDS):
+            wait = cursors.seconds_until_allowed(TWITTER_TIMELINE_ENDPOINT)
+            if wait > TWITTER_MAX_RATE_WAIT:
+                print(f"⏳ Twitter rate limit window resets in {int(wait)}s - remaining accounts deferred to next run")
+                break
+            if wait > 0:
+                print(f"⏳ Waiting {int(wait)}s for the Twitter rate limit window...")
+                time.sleep(wait)
+            
+            since_id = (known.get(user_id) or {}).get('since_id')
             try:
-                print(f"🔄 Fetching tweets from {name}...")
-                tweets = client.get_users_tweets(id=user_id, max_results=TWEETS_PER_SOURCE)
+                print(f"🔄 Fetching tweets from {name}" + (f" newer than {since_id}..." if since_id else "..."))
+                # The API accepts 5-100 results per page
+                limit = TWITTER_MAX_NEW_TWEETS if since_id else TWEETS_PER_SOURCE
+                params = {'max_results': min(100, max(5, limit))}
+                if since_id:
+                    params['since_id'] = since_id
+                response = client.get_users_tweets(id=user_id, **params)
+                cursors.record_rate_limit(TWITTER_TIMELINE_ENDPOINT, response.headers)
+                payload = response.json()
+                tweets = payload.get('data') or []
+                newest_id = (payload.get('meta') or {}).get('newest_id')
+                
+                # Keep the newest `limit` tweets, stored oldest first
+                tweets = sorted(tweets, key=lambda tweet: int(tweet['id']))[-limit:]
+                for tweet in tweets:
+                    store_article(tweet['text'], f"{name}_tweet_{tweet['id']}", prefix="TW_", source_name=name,
+                                  url=f"https://twitter.com/{name}/status/{tweet['id']}")
+                cursors.update_cursor(user_id, name, newest_id, len(tweets))
                 
-                if tweets.data:
-                    for tweet in tweets.data:
-                        save_to_file(tweet.text, f"{name}_tweet_{tweet.id}", prefix="TW_")
-                    print(f"✅ Successfully fetched {len(tweets.data)} tweets from {name}")
+                if tweets:
+                    print(f"✅ Successfully fetched {len(tweets)} new tweets from {name}")
                 else:
-                    print(f"⚠️ No tweets found for {name}")
+                    print(f"⏭️  No new tweets from {name}")
                     
             except tweepy.TooManyRequests as e:
+                cursors.record_rate_limit(TWITTER_TIMELINE_ENDPOINT, e.response.headers)
                 print(f"❌ Rate limit hit for {name}: {e}")
-                print("⏳ Waiting might be needed before next Twitter request")
                 continue
             except tweepy.Unauthorized as e:
                 print(f"❌ Unauthorized access for {name}: {e}")
@@ -730,41 +1069,94 @@ def fetch_tweets():
         print(f"❌ Twitter API connection failed: {e}")
         print("Continuing with other news sources...")
 
-def download_youtube_audio(youtube_url):
-    cmd = [
-        "yt-dlp", "-x", "--audio-format", "mp3",
-        "-o", f"{DOWNLOADS_DIR}/%(title)s.%(ext)s", youtube_url
-    ]
-    subprocess.run(cmd, check=True)
-    for file in os.listdir(DOWNLOADS_DIR):
-        if file.endswith(".mp3"):
-            return os.path.join(DOWNLOADS_DIR, file)
-    return None
-
-def transcribe_audio(audio_path):
-    model = whisper.load_model("base")
-    result = model.transcribe(audio_path)
-    return result['text']
+def process_youtube_videos(youtube_urls):
+    """Transcribe videos on the worker pool and store each transcript as it finishes"""
+    total_articles = 0
+    workers = min(TRANSCRIPTION_WORKERS or os.cpu_count() or 1, len(youtube_urls))
+    
+    with TranscriptionPool(workers=workers, model_name=WHISPER_MODEL, work_dir=DOWNLOADS_DIR) as pool:
+        print(f"🔄 Transcribing {len(youtube_urls)} videos on {workers} workers...")
+        for result in pool.transcribe_all(youtube_urls):
+            if result['error']:
+                print(f"❌ Failed to process YouTube video {result['url']}: {result['error']}")
+                continue
+            try:
+                store_article(result['text'], result['title'], prefix="YT_",
+                              source_name="YouTube", url=result['url'])
+                total_articles += 1
+                print(f"✅ Transcribed: {result['title'][:60]} "
+                      f"(download {result['download_seconds']}s, transcribe {result['transcribe_seconds']}s)")
+            except Exception as e:
+                print(f"❌ Error saving transcript for {result['url']}: {e}")
+        
+        metrics = pool.get_metrics()
+        print(f"🎙️ Transcription: {metrics['completed']} done, {metrics['failed']} failed "
+              f"in {metrics['elapsed_seconds']}s ({metrics['videos_per_minute']} videos/min)")
+    
+    return total_articles
 
 # --- MAIN PIPELINE ---
-def run_pipeline():
-    print("🚀 Starting news aggregation pipeline...")
-    print(f"📊 Configured to process {len(RSS_URLS)} RSS sources")
+def process_rss_feeds(rss_urls):
+    """Fetch and store articles from the given feeds.
+    
+    Returns (articles stored, observations) where observations maps each feed
+    URL to the publish times of its new entries, or None if the fetch failed.
+    """
     total_articles = 0
     
-    # 1. RSS/Text Articles
-    print("\n📰 Processing RSS feeds...")
-    for i, rss in enumerate(RSS_URLS, 1):
+    if ENABLE_CONCURRENT_FETCHING and ASYNC_ENGINE_AVAILABLE:
+        results, observations = fetch_all_rss_articles(rss_urls)
+        for rss, articles in results:
+            for article in articles:
+                try:
+                    store_article(article['content'], article['title'], prefix="RSS_",
+                                  source_name=article.get('source'), url=article.get('link'),
+                                  published_date=article.get('published'))
+                    total_articles += 1
+                except Exception as e:
+                    print(f"❌ Error saving article from {rss}: {e}")
+                    continue
+        return total_articles, observations
+    
+    observations = {}
+    health = get_feed_health()
+    if health:
+        allowed = health.filter_allowed(rss_urls)
+        if len(allowed) < len(rss_urls):
+            print(f"⏭️  Skipping {len(rss_urls) - len(allowed)} unhealthy feeds until their backoff expires")
+        rss_urls = allowed
+    
+    for i, rss in enumerate(rss_urls, 1):
         try:
-            print(f"\n📍 Processing source {i}/{len(RSS_URLS)}")
-            articles = fetch_rss_articles(rss)
+            print(f"\n📍 Processing source {i}/{len(rss_urls)}")
+            articles = fetch_rss_articles(rss, observations=observations)
             for article in articles:
-                save_to_file(article['content'], article['title'], prefix="RSS_")
+                store_article(article['content'], article['title'], prefix="RSS_",
+                              source_name=article.get('source'), url=article.get('link'),
+                              published_date=article.get('published'))
                 total_articles += 1
         except Exception as e:
             print(f"❌ Error processing RSS feed {rss}: {e}")
             print("Continuing with next RSS feed...")
             continue
+    return total_articles, observations
+
+def poll_feeds(rss_urls):
+    """Scheduler entry point: poll only the given feeds and report what was new"""
+    total_articles, observations = process_rss_feeds(rss_urls)
+    flush_article_writer()
+    print(f"✅ Polled {len(rss_urls)} feeds, stored {total_articles} articles")
+    return observations
+
+def run_pipeline():
+    print("🚀 Starting news aggregation pipeline...")
+    print(f"📊 Configured to process {len(RSS_URLS)} RSS sources")
+    total_articles = 0
+    
+    # 1. RSS/Text Articles
+    print("\n📰 Processing RSS feeds...")
+    rss_articles, _ = process_rss_feeds(RSS_URLS)
+    total_articles += rss_articles
 
     # 2. Twitter
     print(f"\n🐦 Processing Twitter feeds...")
@@ -780,24 +1172,19 @@ def run_pipeline():
     # 3. YouTube Videos
     print(f"\n🎥 Processing YouTube videos...")
     if YOUTUBE_LINKS:
-        for yt_url in YOUTUBE_LINKS:
-            try:
-                print(f"🔄 Processing YouTube: {yt_url}")
-                audio_path = download_youtube_audio(yt_url)
-                if audio_path:
-                    transcript = transcribe_audio(audio_path)
-                    save_to_file(transcript, os.path.basename(audio_path), prefix="YT_")
-                    os.remove(audio_path)
-                    total_articles += 1
-            except Exception as e:
-                print(f"❌ Failed to process YouTube video {yt_url}: {e}")
-                print("Continuing with next video...")
-                continue
+        try:
+            total_articles += process_youtube_videos(YOUTUBE_LINKS)
+        except Exception as e:
+            print(f"❌ YouTube processing failed: {e}")
+            print("Continuing with other sources...")
     else:
         print("⚠️ No YouTube links configured")
 
-    print(f"\n✅ Pipeline completed! Total content saved: {total_articles} files")
-    print("📁 Check the 'downloads' folder for all saved content.")
+    flush_article_writer()
+    
+    print(f"\n✅ Pipeline completed! Total content processed: {total_articles} articles")
+    if INGEST_MODE in ("files", "both"):
+        print("📁 Check the 'downloads' folder for all saved content.")
     print(f"🌍 Processed {len(RSS_URLS)} RSS sources from around the world")
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ import threading
 from datetime import datetime
 import logging
 
+from feed_scheduler import AdaptiveFeedScheduler
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -12,6 +14,7 @@ class NewsScheduler:
     def __init__(self, app):
         self.app = app
         self.is_running = False
+        self.feed_scheduler = AdaptiveFeedScheduler(category_bounds=feed_interval_bounds())
         
     def start_scheduler(self):
         """Start the background news scheduler"""
@@ -23,70 +26,50 @@ class NewsScheduler:
     
     def _run_scheduler(self):
         """Background thread that runs the scheduler"""
-        # Schedule different types of news at different intervals
-        
-        # Breaking news and general updates - every 30 minutes
-        schedule.every(30).minutes.do(self._fetch_general_news)
-        
-        # Business and finance - every 15 minutes (market hours)
-        schedule.every(15).minutes.do(self._fetch_business_news)
-        
-        # Technology news - every 2 hours
-        schedule.every(2).hours.do(self._fetch_tech_news)
-        
-        # Full refresh - every 6 hours
-        schedule.every(6).hours.do(self._full_refresh)
+        # Each RSS feed is polled on its own learned interval; see _poll_due_feeds
+        self._sync_feeds()
         
         # Daily cleanup - once per day at 3 AM
         schedule.every().day.at("03:00").do(self._daily_cleanup)
         
         while self.is_running:
             schedule.run_pending()
-            time.sleep(60)  # Check every minute
+            self._poll_due_feeds()
+            time.sleep(NEWS_CONFIG['SCHEDULER_TICK_SECONDS'])
     
-    def _fetch_general_news(self):
-        """Fetch general news updates"""
+    def _sync_feeds(self):
+        """Register the feeds enabled by the category flags"""
         try:
-            from news_aggregator import aggregate_news
-            logging.info("Starting scheduled general news fetch")
-            aggregate_news()
-            logging.info("General news fetch completed")
+            from news_aggregator import enabled_rss_feeds
+            feeds = enabled_rss_feeds()
+            self.feed_scheduler.sync_feeds(feeds)
+            logging.info(f"Adaptive scheduler tracking {len(feeds)} feeds")
         except Exception as e:
-            logging.error(f"Error in general news fetch: {e}")
+            logging.error(f"Error registering feeds with the scheduler: {e}")
     
-    def _fetch_business_news(self):
-        """Fetch business news (during market hours only)"""
+    def _poll_due_feeds(self):
+        """Poll only the feeds whose learned interval has elapsed"""
+        due = []
+        observations = {}
         try:
-            current_hour = datetime.now().hour
-            # Only during market hours (9 AM - 4 PM EST, adjust for your timezone)
-            if 9 <= current_hour <= 16:
-                from news_aggregator import aggregate_news
-                logging.info("Starting scheduled business news fetch")
-                # You could modify this to fetch only business sources
-                aggregate_news()
-                logging.info("Business news fetch completed")
+            due = self.feed_scheduler.due_feeds(limit=NEWS_CONFIG['MAX_FEEDS_PER_TICK'])
+            if not due:
+                return
+            from news_aggregator import poll_feeds
+            logging.info(f"Polling {len(due)} due feeds")
+            observations = poll_feeds(due)
         except Exception as e:
-            logging.error(f"Error in business news fetch: {e}")
-    
-    def _fetch_tech_news(self):
-        """Fetch technology news"""
+            logging.error(f"Error in scheduled feed poll: {e}")
+        
+        # Feeds the pass never reached count as failed so they still get rescheduled
         try:
-            from news_aggregator import aggregate_news
-            logging.info("Starting scheduled tech news fetch")
-            aggregate_news()
-            logging.info("Tech news fetch completed")
+            self.feed_scheduler.record_polls({url: observations.get(url) for url in due})
         except Exception as e:
-            logging.error(f"Error in tech news fetch: {e}")
+            logging.error(f"Error updating feed schedule: {e}")
     
-    def _full_refresh(self):
-        """Full news refresh"""
-        try:
-            from news_aggregator import aggregate_news
-            logging.info("Starting full news refresh")
-            aggregate_news()
-            logging.info("Full news refresh completed")
-        except Exception as e:
-            logging.error(f"Error in full refresh: {e}")
+    def get_feed_queue(self, limit=None):
+        """Upcoming feed polls ordered by due time"""
+        return self.feed_scheduler.next_due_queue(limit)
     
     def _daily_cleanup(self):
         """Daily maintenance tasks"""
@@ -108,9 +91,39 @@ NEWS_CONFIG = {
     'BUSINESS_NEWS_INTERVAL': 15,  # minutes  
     'TECH_NEWS_INTERVAL': 120,    # minutes (2 hours)
     'FULL_REFRESH_INTERVAL': 360,  # minutes (6 hours)
+    'BREAKING_NEWS_MIN_INTERVAL': 5,  # minutes - fastest any feed is polled
+    'SCHEDULER_TICK_SECONDS': 60,  # How often due feeds are checked
+    'MAX_FEEDS_PER_TICK': 100,    # Cap on feeds polled in one pass
     'ENABLE_AUTO_REFRESH': True,
     'QUIET_HOURS_START': 23,      # 11 PM
     'QUIET_HOURS_END': 6,         # 6 AM
     'MARKET_HOURS_START': 9,      # 9 AM
     'MARKET_HOURS_END': 16        # 4 PM
 }
+
+def feed_interval_bounds():
+    """(min, max) polling minutes per news_aggregator feed category.
+    
+    Wire and mainstream feeds may be polled as often as breaking news needs and
+    are checked at least every general interval or two; niche categories are
+    allowed to drift out to the full-refresh interval.
+    """
+    breaking = NEWS_CONFIG['BREAKING_NEWS_MIN_INTERVAL']
+    general = NEWS_CONFIG['GENERAL_NEWS_INTERVAL']
+    business = NEWS_CONFIG['BUSINESS_NEWS_INTERVAL']
+    tech = NEWS_CONFIG['TECH_NEWS_INTERVAL']
+    full = NEWS_CONFIG['FULL_REFRESH_INTERVAL']
+    return {
+        'wire': (breaking, general),
+        'international': (breaking, general * 2),
+        'us': (breaking, general * 2),
+        'business': (breaking, tech),
+        'european': (business, tech),
+        'asian': (business, tech),
+        'middle_east_africa': (business, tech),
+        'latin_american': (business, tech),
+        'canadian': (business, tech),
+        'science_health': (general, full),
+        'alternative': (general, full),
+        'specialized': (general, full),
+    }
@@ -13,6 +13,8 @@ from collections import defaultdict
 import logging
 from typing import List, Dict, Any, Optional
 
+from search_cache import get_search_cache
+
 logger = logging.getLogger(__name__)
 
 class QuickUpdatesManager:
@@ -25,7 +27,7 @@ class QuickUpdatesManager:
         self.article_cache = {}  # article_id -> article_data
         self.category_cache = {}  # category -> article_ids
         self.source_cache = {}   # source -> article_ids
-        self.search_cache = {}   # query -> results (with TTL)
+        self.search_cache = get_search_cache()  # shared with /search and /api/articles (LRU + TTL)
         
         # Performance metrics
         self.metrics = {
@@ -384,17 +386,8 @@ class QuickUpdatesManager:
     def _cleanup_expired_cache(self):
         """Clean up expired cache entries"""
         try:
-            # Clear search cache (it has TTL)
-            current_time = time.time()
-            expired_keys = []
-            
-            for key, value in self.search_cache.items():
-                if isinstance(value, dict) and 'timestamp' in value:
-                    if current_time - value['timestamp'] > 300:  # 5 minutes TTL
-                        expired_keys.append(key)
-            
-            for key in expired_keys:
-                del self.search_cache[key]
+            # Drop expired search results
+            self.search_cache.purge_expired()
             
             # Limit cache sizes to prevent memory issues
             if len(self.article_cache) > 1000:
@@ -424,6 +417,7 @@ class QuickUpdatesManager:
             'cached_articles': len(self.article_cache),
             'cached_categories': len(self.category_cache),
             'cached_sources': len(self.source_cache),
+            'search_cache': self.search_cache.get_stats(),
             'active_subscribers': sum(len(subs) for subs in self.subscribers.values()),
             'last_update': self.metrics['last_update'],
             'queue_sizes': {
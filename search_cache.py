@@ -0,0 +1,213 @@
+"""
+Search Result Cache for WiseNews
+In-memory LRU cache (with a TTL) for search and article listing results, keyed
+by normalized query, filters and page. Entries are tagged with a generation
+counter that triggers bump whenever articles (or the stories and live events
+that filter them) change, so a cached page is dropped as soon as new articles
+are committed - by this process or any other writer - instead of going stale
+until it expires.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cached result pages kept at most (least recently used are evicted first)
+MAX_ENTRIES = 512
+# Seconds a result is served even if nothing changed
+TTL_SECONDS = 300
+
+GENERATION_TABLE = 'search_cache_generation'
+# Changes that can alter a cached result: (table, trigger event)
+WATCHED_CHANGES = [
+    ('articles', 'INSERT'),
+    ('articles', 'DELETE'),
+    ('articles', 'UPDATE'),
+    ('story_cluster_members', 'INSERT'),
+    ('story_clusters', 'UPDATE'),
+    ('live_events', 'UPDATE OF status'),
+]
+# Article columns whose updates do not invalidate (opening an article marks it read)
+UNWATCHED_COLUMNS = {'read_status'}
+
+def normalize_query(query: Optional[str]) -> str:
+    """Case and whitespace differences share one cache entry"""
+    return ' '.join((query or '').lower().split())
+
+def make_key(kind: str, query: Optional[str] = None, page: int = 1, **filters) -> Tuple:
+    """Cache key for one result page of a search or listing"""
+    return (kind, normalize_query(query), tuple(sorted(filters.items())), page)
+
+class SearchResultCache:
+    """LRU + TTL result cache invalidated by the database's article generation"""
+
+    def __init__(self, db_path: str = 'news_database.db', max_entries: int = MAX_ENTRIES,
+                 ttl: float = TTL_SECONDS):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, generation, value)
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+
+    def ensure(self) -> bool:
+        """Create the generation counter and the triggers that bump it"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {GENERATION_TABLE} (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    generation INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute(f'INSERT OR IGNORE INTO {GENERATION_TABLE} (id, generation) VALUES (1, 0)')
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            for table, event in WATCHED_CHANGES:
+                if table not in tables:
+                    continue
+                trigger = f"{GENERATION_TABLE}_{table}_{event.split()[0].lower()}"
+                if event == 'UPDATE':
+                    cursor.execute(f"PRAGMA table_info({table})")
+                    columns = [column[1] for column in cursor.fetchall() if column[1] not in UNWATCHED_COLUMNS]
+                    event = f"UPDATE OF {', '.join(columns)}"
+                    # The column list is fixed at creation: name the trigger after it and
+                    # replace it once the table gains columns (e.g. live_event_id)
+                    stale = trigger
+                    trigger = f"{trigger}_{zlib.crc32(event.encode()):08x}"
+                    cursor.execute("""
+                        SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ? AND name != ?
+                        AND (name = ? OR name LIKE ?)
+                    """, (table, trigger, stale, f'{stale}%'))
+                    for (name,) in cursor.fetchall():
+                        cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON {table} BEGIN
+                        UPDATE {GENERATION_TABLE} SET generation = generation + 1 WHERE id = 1;
+                    END
+                ''')
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache generation unavailable: {e}")
+            return False
+        finally:
+            conn.close()
+            self._checked = True
+
+    def generation(self, cursor=None) -> Optional[int]:
+        """Current article generation; None when it cannot be read (bypass the cache then)"""
+        if not self._checked:
+            self.ensure()
+        conn = None
+        if cursor is None:
+            conn = self._connect()
+            cursor = conn.cursor()
+        try:
+            cursor.execute(f'SELECT generation FROM {GENERATION_TABLE} WHERE id = 1')
+            row = cursor.fetchone()
+        except sqlite3.Error:
+            row = None
+        finally:
+            if conn is not None:
+                conn.close()
+        return row[0] if row else None
+
+    def _advance(self, generation: int) -> bool:
+        """Drop everything cached before the articles last changed; False for an outdated generation"""
+        if self._generation is not None and generation < self._generation:
+            return False
+        if generation != self._generation:
+            self.stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+            self._generation = generation
+        return True
+
+    def get(self, key: Tuple, generation: Optional[int]) -> Optional[Any]:
+        """Cached value for ``key`` if it is current, else None"""
+        if generation is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key) if self._advance(generation) else None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            stored_at, _, value = entry
+            if time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return value
+
+    def put(self, key: Tuple, value: Any, generation: Optional[int]):
+        """Store a result computed at ``generation`` (read before the query ran)"""
+        if generation is None:
+            return
+        with self._lock:
+            if not self._advance(generation):
+                return
+            self._entries[key] = (time.time(), generation, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def invalidate(self):
+        """Drop every entry now (for writers in this process that bypass the triggers)"""
+        with self._lock:
+            self.stats['invalidations'] += len(self._entries)
+            self._entries.clear()
+
+    clear = invalidate
+
+    def purge_expired(self) -> int:
+        """Remove entries past their TTL; returns how many"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [key for key, (stored_at, _, _) in self._entries.items() if stored_at < cutoff]
+            for key in expired:
+                del self._entries[key]
+            self.stats['expirations'] += len(expired)
+        return len(expired)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+            stats['generation'] = self._generation
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate_percent'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0
+        stats['max_entries'] = self.max_entries
+        stats['ttl_seconds'] = self.ttl
+        return stats
+
+# Global instance for the main news database
+search_cache = None
+
+def get_search_cache():
+    """Get or create the shared result cache for news_database.db"""
+    global search_cache
+    if search_cache is None:
+        search_cache = SearchResultCache('news_database.db')
+    return search_cache
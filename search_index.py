@@ -0,0 +1,154 @@
+"""
+Full-Text Search Index for WiseNews
+SQLite FTS5 index over article title, summary, content and keywords (whichever
+the articles table has), kept in sync by triggers. Searches use MATCH with
+BM25 ranking and snippet() previews instead of LIKE '%q%' scans over every
+article body.
+
+Backfill / rebuild: python search_index.py [db_path]
+"""
+
+import logging
+import re
+import sqlite3
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'articles_fts'
+# Indexed columns in order, with their BM25 weights
+SEARCH_COLUMNS = [('title', 10.0), ('summary', 5.0), ('content', 1.0), ('keywords', 3.0)]
+# Tokens of a query used at most
+MAX_QUERY_TOKENS = 12
+SNIPPET_TOKENS = 24
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, as a prefix"""
+    tokens = re.findall(r'\w+', query.lower())[:MAX_QUERY_TOKENS]
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+class SearchIndex:
+    """FTS5 index on an articles table (external content, trigger-synced)"""
+
+    def __init__(self, db_path: str = 'news_database.db', table: str = 'articles'):
+        self.db_path = db_path
+        self.table = table
+        self.columns: List[str] = []
+        self.weights: List[float] = []
+        self.available = False
+        self._checked = False
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+
+    def ensure(self) -> bool:
+        """Create the index and its triggers if missing; backfills a new index"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"PRAGMA table_info({self.table})")
+            existing = {column[1] for column in cursor.fetchall()}
+
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,))
+            row = cursor.fetchone()
+            if row:
+                # Keep whatever columns the index was created with
+                indexed = re.search(r'fts5\((.*)\)', row[0], re.S).group(1)
+                self.columns = [name for name, _ in SEARCH_COLUMNS if re.search(rf'\b{name}\b', indexed)]
+            else:
+                self.columns = [name for name, _ in SEARCH_COLUMNS if name in existing]
+            self.weights = [weight for name, weight in SEARCH_COLUMNS if name in self.columns]
+            if not self.columns:
+                return False
+
+            created = row is None
+            column_list = ', '.join(self.columns)
+            new_values = ', '.join(f'new.{name}' for name in self.columns)
+            old_values = ', '.join(f'old.{name}' for name in self.columns)
+            cursor.executescript(f'''
+                CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+                    {column_list},
+                    content='{self.table}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                );
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {self.table} BEGIN
+                    INSERT INTO {FTS_TABLE}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END;
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {self.table} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                END;
+                CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {column_list} ON {self.table} BEGIN
+                    INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    INSERT INTO {FTS_TABLE}(rowid, {column_list}) VALUES (new.id, {new_values});
+                END;
+            ''')
+            if created:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                logger.info(f"Built full-text index over {column_list}")
+            conn.commit()
+            self.available = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5 - callers fall back to LIKE
+            logger.warning(f"Full-text search unavailable: {e}")
+            self.available = False
+        finally:
+            conn.close()
+            self._checked = True
+        return self.available
+
+    def ready(self) -> bool:
+        """ensure() once per process, then just report availability"""
+        return self.available if self._checked else self.ensure()
+
+    def rebuild(self) -> float:
+        """Re-read every article into the index; returns seconds taken"""
+        started = time.time()
+        conn = self._connect()
+        conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        conn.commit()
+        conn.close()
+        return time.time() - started
+
+    def _snippet_column(self) -> int:
+        for name in ('content', 'summary', 'title'):
+            if name in self.columns:
+                return self.columns.index(name)
+        return 0
+
+    def count(self, cursor, match: str, where: str = '', params: Sequence = ()) -> int:
+        """Number of articles matching; ``where`` filters on alias ``a``"""
+        cursor.execute(f'''
+            SELECT COUNT(*) FROM {FTS_TABLE} JOIN {self.table} a ON a.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH ? {f'AND ({where})' if where else ''}
+        ''', [match, *params])
+        return cursor.fetchone()[0]
+
+    def search(self, cursor, match: str, select: str, where: str = '', params: Sequence = (),
+               limit: Optional[int] = 20, offset: int = 0) -> List[Tuple]:
+        """Best-ranked matches: the ``select`` columns (alias ``a``) plus a snippet as the last column.
+
+        ``limit=None`` returns every match.
+        """
+        weights = ', '.join(str(weight) for weight in self.weights)
+        cursor.execute(f'''
+            SELECT {select},
+                   snippet({FTS_TABLE}, {self._snippet_column()}, '', '', '…', {SNIPPET_TOKENS}) AS preview
+            FROM {FTS_TABLE} JOIN {self.table} a ON a.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH ? {f'AND ({where})' if where else ''}
+            ORDER BY bm25({FTS_TABLE}, {weights})
+            LIMIT ? OFFSET ?
+        ''', [match, *params, -1 if limit is None else limit, offset])
+        return cursor.fetchall()
+
+if __name__ == "__main__":
+    index = SearchIndex(sys.argv[1] if len(sys.argv) > 1 else 'news_database.db')
+    if not index.ensure():
+        print("❌ Full-text index could not be created (no searchable columns or no FTS5)")
+        sys.exit(1)
+    print(f"🔎 Rebuilding full-text index over {', '.join(index.columns)}...")
+    print(f"✅ Rebuilt in {index.rebuild():.1f}s")
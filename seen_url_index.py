@@ -0,0 +1,200 @@
+"""
+Seen-URL Index for WiseNews
+Remembers every article URL whose body has already been downloaded so feed
+entries for known articles are dropped before any page fetch.
+An in-memory Bloom filter answers most lookups; an exact SQLite table of
+canonicalized URLs confirms the positives.
+"""
+
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only carry tracking/campaign information
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ref', 'ref_src', 'referrer', 'cmpid', 'cmp', 'ocid', 'smid', 'smtyp', 'taid',
+    'ito', 'ftag', 'feedtype', 'feedname', 'rss', 'partner', 'src', 'srnd', 'guccounter',
+    'at_medium', 'at_campaign', 'at_custom1', 'at_custom2', 'at_custom3', 'at_custom4',
+    'ns_mchannel', 'ns_source', 'ns_campaign', 'ns_linkname', 'ns_fee',
+}
+TRACKING_PREFIXES = ('utm_', 'at_', 'ns_', '__twitter', 'ga_')
+
+def canonicalize_url(url: str) -> str:
+    """Normalize an article URL so trivially different links compare equal"""
+    if not url:
+        return ''
+
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    # Fragments never change the article served
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+def url_hash(url: str) -> str:
+    """Hash of the canonical form of a URL"""
+    return hashlib.sha1(canonicalize_url(url).encode('utf-8')).hexdigest()
+
+class BloomFilter:
+    """Fixed-size Bloom filter over hex digests"""
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: str):
+        # Double hashing over two 64-bit halves of the digest
+        h1 = int(digest[:16], 16)
+        h2 = int(digest[16:32], 16) | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, digest: str):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+class SeenUrlIndex:
+    """Persistent set of article URLs that have already been fetched"""
+
+    def __init__(self, db_path: str = 'news_database.db', capacity: int = 1000000, error_rate: float = 0.001):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.stats = {
+            'lookups': 0,
+            'bloom_negatives': 0,
+            'exact_checks': 0,
+            'false_positives': 0,
+            'seen': 0
+        }
+        self._init_db()
+        self._load_bloom()
+
+    def _init_db(self):
+        """Create the seen_urls table if needed"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                url_hash TEXT PRIMARY KEY,
+                canonical_url TEXT NOT NULL,
+                first_seen DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _load_bloom(self):
+        """Populate the Bloom filter from the exact table"""
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        cursor = conn.cursor()
+        cursor.execute('SELECT url_hash FROM seen_urls')
+        for (digest,) in cursor:
+            self.bloom.add(digest)
+        conn.close()
+        logger.info(f"Seen-URL index loaded with {self.bloom.count} URLs")
+
+    def contains(self, url: str) -> bool:
+        """True if the article at this URL was fetched before"""
+        return not self.filter_unseen([url])
+
+    def filter_unseen(self, urls: Iterable[str]) -> List[str]:
+        """Return the URLs that have never been fetched, preserving order"""
+        urls = [url for url in urls if url]
+        digests = {url: url_hash(url) for url in urls}
+
+        with self._lock:
+            self.stats['lookups'] += len(urls)
+            candidates = [digest for digest in set(digests.values()) if digest in self.bloom]
+            candidate_set = set(candidates)
+            self.stats['bloom_negatives'] += sum(1 for digest in digests.values() if digest not in candidate_set)
+
+        known = set()
+        if candidates:
+            self.stats['exact_checks'] += len(candidates)
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            cursor = conn.cursor()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(candidates), 500):
+                chunk = candidates[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f'SELECT url_hash FROM seen_urls WHERE url_hash IN ({placeholders})', chunk)
+                known.update(row[0] for row in cursor.fetchall())
+            conn.close()
+            self.stats['false_positives'] += len(candidates) - len(known)
+
+        unseen = [url for url in urls if digests[url] not in known]
+        self.stats['seen'] += len(urls) - len(unseen)
+        return unseen
+
+    def add(self, url: str):
+        """Mark one URL as fetched"""
+        self.add_many([url])
+
+    def add_many(self, urls: Iterable[str]):
+        """Mark several URLs as fetched in a single transaction"""
+        rows = {}
+        for url in urls:
+            if url:
+                canonical = canonicalize_url(url)
+                rows[hashlib.sha1(canonical.encode('utf-8')).hexdigest()] = canonical
+        if not rows:
+            return
+
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            now = datetime.now().isoformat()
+            conn.executemany(
+                'INSERT OR IGNORE INTO seen_urls (url_hash, canonical_url, first_seen) VALUES (?, ?, ?)',
+                [(digest, canonical, now) for digest, canonical in rows.items()]
+            )
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.warning(f"Could not record seen URLs: {e}")
+            return
+
+        with self._lock:
+            for digest in rows:
+                if digest not in self.bloom:
+                    self.bloom.add(digest)
+
+    def get_statistics(self) -> Dict:
+        """Lookup counters plus index size"""
+        stats = dict(self.stats)
+        stats['indexed_urls'] = self.bloom.count
+        stats['bloom_bits'] = self.bloom.num_bits
+        stats['bloom_hashes'] = self.bloom.num_hashes
+        return stats
@@ -3,7 +3,7 @@ Social Media Manager for WiseNews
 Handles automated posting, user authentication, content sharing, and social monitoring
 """
 
-import requests
+from http_client import http_client
 import json
 import sqlite3
 import logging
@@ -366,7 +366,7 @@ Stay ahead of market movements with WiseNews 📈
                 'text': twitter_content['text']
             }
             
-            response = requests.post(
+            response = http_client.post(
                 f'{self.api_configs["twitter"]["base_url"]}/tweets',
                 headers=headers,
                 json=payload
@@ -404,7 +404,7 @@ Stay ahead of market movements with WiseNews 📈
                 'access_token': self.api_configs['facebook']['access_token']
             }
             
-            response = requests.post(url, data=params)
+            response = http_client.post(url, data=params)
             """
             
             mock_response = {
@@ -455,7 +455,7 @@ Stay ahead of market movements with WiseNews 📈
                 }
             }
             
-            response = requests.post(
+            response = http_client.post(
                 f'{self.api_configs["linkedin"]["base_url"]}/ugcPosts',
                 headers=headers,
                 json=payload
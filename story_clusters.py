@@ -0,0 +1,310 @@
+"""
+Story Clustering for WiseNews
+Assigns every new article to a story cluster as it is ingested - coverage of
+the same event from different outlets shares a cluster - using the MinHash
+signatures and LSH buckets of the duplicate index, so each assignment costs a
+bounded number of lookups no matter how large the archive gets. Each cluster
+keeps a representative chosen with the duplicate detector's article scoring,
+which lets listings show one card per story.
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from duplicate_detector import DuplicateDetector
+from minhash_index import estimate_jaccard
+
+logger = logging.getLogger(__name__)
+
+# Estimated shingle overlap with a story's representative needed to join it
+STORY_SIMILARITY = 0.5
+# Only stories updated this recently can take new articles
+STORY_WINDOW_HOURS = 48
+# LSH candidates compared per article
+MAX_CANDIDATES = 50
+
+# Take a removed article (:id) out of its story: the story shrinks, disappears
+# with its last member, or has the closest remaining member take over as
+# representative (its score is recomputed by the next article that joins)
+_FORGET_STATEMENTS = [
+    '''UPDATE story_clusters SET article_count = article_count - 1
+       WHERE id = (SELECT cluster_id FROM story_cluster_members WHERE article_id = :id)''',
+    'DELETE FROM story_cluster_members WHERE article_id = :id',
+    '''DELETE FROM story_clusters WHERE representative_id = :id
+       AND NOT EXISTS (SELECT 1 FROM story_cluster_members WHERE cluster_id = story_clusters.id)''',
+    '''UPDATE story_cluster_members SET is_representative = 1
+       WHERE article_id = (SELECT m.article_id FROM story_clusters c
+                           JOIN story_cluster_members m ON m.cluster_id = c.id
+                           WHERE c.representative_id = :id
+                           ORDER BY m.similarity DESC, m.article_id DESC LIMIT 1)''',
+    '''UPDATE story_clusters SET
+           representative_id = (SELECT article_id FROM story_cluster_members
+                                WHERE cluster_id = story_clusters.id AND is_representative = 1),
+           representative_score = NULL,
+           title = (SELECT a.title FROM story_cluster_members m JOIN articles a ON a.id = m.article_id
+                    WHERE m.cluster_id = story_clusters.id AND m.is_representative = 1)
+       WHERE representative_id = :id''',
+]
+
+def ensure_story_cleanup_trigger(cursor):
+    """Keep stories consistent when articles are deleted by any writer"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('articles', 'story_cluster_members')")
+    if len(cursor.fetchall()) < 2:
+        return
+    body = ';\n'.join(statement.replace(':id', 'old.id') for statement in _FORGET_STATEMENTS)
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS story_cluster_members_article_ad AFTER DELETE ON articles BEGIN
+            {body};
+        END
+    ''')
+
+def forget_articles(cursor, article_ids: Iterable[int]):
+    """Take articles about to be deleted out of their stories (no-op without story tables)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'story_cluster_members'")
+    if cursor.fetchone() is None:
+        return
+    params = [{'id': article_id} for article_id in article_ids]
+    for statement in _FORGET_STATEMENTS:
+        cursor.executemany(statement, params)
+
+class StoryClusterer:
+    """Incremental article -> story assignment kept in SQLite"""
+
+    def __init__(self, db_path: str = 'news_database.db', similarity: float = STORY_SIMILARITY,
+                 window_hours: int = STORY_WINDOW_HOURS, max_candidates: int = MAX_CANDIDATES):
+        self.db_path = db_path
+        self.similarity = similarity
+        self.window_hours = window_hours
+        self.max_candidates = max_candidates
+        self.detector = DuplicateDetector(db_path)
+        self.index = self.detector.lsh_index
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create the story tables if needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS story_clusters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                representative_id INTEGER NOT NULL,
+                representative_score REAL,
+                title TEXT,
+                article_count INTEGER DEFAULT 1,
+                first_seen DATETIME,
+                last_updated DATETIME
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS story_cluster_members (
+                article_id INTEGER PRIMARY KEY,
+                cluster_id INTEGER NOT NULL,
+                similarity REAL, -- estimated overlap with the representative when it joined
+                is_representative INTEGER DEFAULT 0,
+                added_at DATETIME,
+                FOREIGN KEY (cluster_id) REFERENCES story_clusters (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_story_members_cluster ON story_cluster_members(cluster_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_story_clusters_updated ON story_clusters(last_updated)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_story_clusters_representative ON story_clusters(representative_id)')
+        ensure_story_cleanup_trigger(cursor)
+        conn.commit()
+        conn.close()
+
+    def _load_articles(self, cursor, article_ids: List[int]) -> Dict[int, tuple]:
+        """Rows in DuplicateDetector's tuple shape"""
+        cursor.execute("PRAGMA table_info(articles)")
+        columns = {column[1] for column in cursor.fetchall()}
+        importance = 'COALESCE(importance_score, 5)' if 'importance_score' in columns else '5'
+        sentiment = 'COALESCE(sentiment_score, 0.0)' if 'sentiment_score' in columns else '0.0'
+
+        articles = {}
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            cursor.execute(f'''
+                SELECT id, title, content, url_hash, source_name, date_added, {importance}, {sentiment}, date_added
+                FROM articles WHERE id IN ({','.join('?' * len(chunk))})
+            ''', chunk)
+            articles.update((row[0], row) for row in cursor.fetchall())
+        return articles
+
+    def assign_many(self, article_ids: Iterable[int], sync_index: bool = True) -> Dict[int, int]:
+        """Put articles into stories; returns {article_id: cluster_id}.
+
+        Pass ``sync_index=False`` when the caller has already synced the
+        duplicate index for the batch these articles belong to.
+        """
+        article_ids = list(article_ids)
+        if not article_ids:
+            return {}
+
+        conn = self._connect()
+        cursor = conn.cursor()
+        placeholders = ','.join('?' * len(article_ids))
+        cursor.execute(f'''
+            SELECT article_id, cluster_id FROM story_cluster_members WHERE article_id IN ({placeholders})
+        ''', article_ids)
+        result = dict(cursor.fetchall())
+        articles = self._load_articles(cursor, [i for i in article_ids if i not in result])
+
+        # Signatures come from the duplicate index, caught up first for articles it has not seen
+        if sync_index:
+            self.index.sync()
+        signatures = self.index.get_signatures(articles)
+
+        cutoff = (datetime.now() - timedelta(hours=self.window_hours)).isoformat()
+        for article_id in sorted(articles):
+            article = articles[article_id]
+            signature = signatures.get(article_id)
+            cluster_id, similarity = self._best_cluster(cursor, article_id, signature, cutoff)
+            result[article_id] = self._join(cursor, article, cluster_id, similarity)
+            conn.commit()
+
+        conn.close()
+        return result
+
+    def assign(self, article_id: int, sync_index: bool = True) -> Optional[int]:
+        return self.assign_many([article_id], sync_index).get(article_id)
+
+    def _best_cluster(self, cursor, article_id, signature, cutoff):
+        """Recent story whose representative is most similar, if above the threshold.
+
+        Candidates come from the LSH buckets, but the article is compared with
+        each story's representative rather than the member it collided with,
+        so stories cannot drift by chaining through loosely related articles.
+        """
+        if signature is None:
+            return None, None
+        candidates = list(self.index.candidates(signature, exclude_id=article_id))
+        if not candidates:
+            return None, None
+
+        placeholders = ','.join('?' * len(candidates))
+        cursor.execute(f'''
+            SELECT DISTINCT c.representative_id, c.id FROM story_cluster_members m
+            JOIN story_clusters c ON c.id = m.cluster_id
+            WHERE m.article_id IN ({placeholders}) AND c.last_updated >= ?
+            LIMIT ?
+        ''', candidates + [cutoff, self.max_candidates])
+        clusters = dict(cursor.fetchall())
+        if not clusters:
+            return None, None
+
+        best = (None, None)
+        for representative_id, other_signature in self.index.get_signatures(clusters).items():
+            similarity = estimate_jaccard(signature, other_signature)
+            if similarity >= self.similarity and (best[1] is None or similarity > best[1]):
+                best = (clusters[representative_id], similarity)
+        return best
+
+    def _join(self, cursor, article, cluster_id, similarity) -> int:
+        now = datetime.now().isoformat()
+        score = self.detector.score_article(article)
+
+        if cluster_id is None:
+            cursor.execute('''
+                INSERT INTO story_clusters (representative_id, representative_score, title, first_seen, last_updated)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (article[0], score, article[1], now, now))
+            cluster_id = cursor.lastrowid
+            cursor.execute('''
+                INSERT INTO story_cluster_members (article_id, cluster_id, similarity, is_representative, added_at)
+                VALUES (?, ?, NULL, 1, ?)
+            ''', (article[0], cluster_id, now))
+            return cluster_id
+
+        cursor.execute('SELECT representative_id, representative_score FROM story_clusters WHERE id = ?',
+                       (cluster_id,))
+        representative_id, representative_score = cursor.fetchone()
+        takes_over = representative_score is None or score > representative_score
+
+        cursor.execute('''
+            INSERT INTO story_cluster_members (article_id, cluster_id, similarity, is_representative, added_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (article[0], cluster_id, similarity, int(takes_over), now))
+        if takes_over:
+            cursor.execute('UPDATE story_cluster_members SET is_representative = 0 WHERE article_id = ?',
+                           (representative_id,))
+            cursor.execute('''
+                UPDATE story_clusters SET representative_id = ?, representative_score = ?, title = ?,
+                       article_count = article_count + 1, last_updated = ?
+                WHERE id = ?
+            ''', (article[0], score, article[1], now, cluster_id))
+        else:
+            cursor.execute('''
+                UPDATE story_clusters SET article_count = article_count + 1, last_updated = ? WHERE id = ?
+            ''', (now, cluster_id))
+        return cluster_id
+
+    def get_story(self, cluster_id: int) -> Optional[Dict]:
+        """A story with its members, representative first"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT id, representative_id, title, article_count, first_seen, last_updated
+            FROM story_clusters WHERE id = ?
+        ''', (cluster_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+        cursor.execute('''
+            SELECT a.id, a.title, a.source_name, a.date_added, m.similarity, m.is_representative
+            FROM story_cluster_members m JOIN articles a ON a.id = m.article_id
+            WHERE m.cluster_id = ?
+            ORDER BY m.is_representative DESC, a.date_added DESC
+        ''', (cluster_id,))
+        members = [{
+            'id': member[0],
+            'title': member[1],
+            'source_name': member[2],
+            'date_added': member[3],
+            'similarity': round(member[4], 3) if member[4] is not None else None,
+            'is_representative': bool(member[5])
+        } for member in cursor.fetchall()]
+        conn.close()
+        return {
+            'id': row[0],
+            'representative_id': row[1],
+            'title': row[2],
+            'article_count': row[3],
+            'first_seen': row[4],
+            'last_updated': row[5],
+            'articles': members
+        }
+
+# Filter for article listings: hide members that are not their story's representative,
+# as long as that representative is itself still listed (not soft-deleted)
+ONE_PER_STORY_CONDITION = '''
+    NOT EXISTS (SELECT 1 FROM story_cluster_members story_m
+                JOIN story_clusters story_c ON story_c.id = story_m.cluster_id
+                JOIN articles story_rep ON story_rep.id = story_c.representative_id
+                WHERE story_m.article_id = articles.id AND story_m.is_representative = 0
+                AND COALESCE(story_rep.is_deleted, 0) = 0)
+'''
+
+# Number of articles in each listed article's story (1 when unclustered)
+STORY_SIZE_COLUMN = '''
+    COALESCE((SELECT story_c.article_count FROM story_cluster_members story_m
+              JOIN story_clusters story_c ON story_c.id = story_m.cluster_id
+              WHERE story_m.article_id = articles.id), 1)
+'''
+
+if __name__ == "__main__":
+    # Cluster the articles of the current story window that are not in a story yet
+    clusterer = StoryClusterer()
+    conn = sqlite3.connect(clusterer.db_path)
+    cutoff = (datetime.now() - timedelta(hours=clusterer.window_hours)).strftime('%Y-%m-%d %H:%M:%S')
+    recent = [row[0] for row in conn.execute('''
+        SELECT id FROM articles WHERE date_added >= ?
+        AND id NOT IN (SELECT article_id FROM story_cluster_members) ORDER BY id
+    ''', (cutoff,))]
+    conn.close()
+    assigned = clusterer.assign_many(recent)
+    print(f"🧵 Filed {len(assigned)} articles into {len(set(assigned.values()))} stories")
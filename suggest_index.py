@@ -0,0 +1,268 @@
+"""
+Search Suggestion Index for WiseNews
+In-memory prefix index for search-as-you-type. Completions come from past
+searches, article keywords, source names and recent article titles, each with
+a popularity weight; they are kept in a sorted array of normalized keys so a
+keystroke is a binary search plus a top-k over the matching range, with the
+top-k of each prefix memoized until the next refresh. New articles and
+searches are folded in incrementally from id watermarks on a background
+thread, so a keystroke never waits on a database scan. A past search is only
+offered once MIN_SEARCH_SESSIONS different sessions have made it, so one
+visitor's queries are never suggested to others.
+"""
+
+import bisect
+import heapq
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Completions returned per request at most
+MAX_SUGGESTIONS = 8
+# Seconds between incremental refreshes (checked on request)
+REFRESH_SECONDS = 30
+# Most recent article titles offered as completions
+MAX_TITLES = 5000
+# Prefix top-k lists memoized between refreshes
+MAX_MEMO_PREFIXES = 5000
+# Distinct sessions that must have made a search before it is suggested
+MIN_SEARCH_SESSIONS = 3
+# Searches below that threshold tracked at most (the oldest are forgotten)
+MAX_PENDING_SEARCHES = 20000
+# Popularity weight per occurrence of each kind of completion
+KIND_WEIGHTS = {
+    'search': 5.0,   # per session that made a search that found something
+    'keyword': 1.0,  # per article tagged with it
+    'source': 0.5,   # per article from it
+    'title': 1.0     # once, plus a recency bonus
+}
+
+def normalize_term(text: Optional[str]) -> str:
+    """Lowercase words separated by single spaces"""
+    return ' '.join(re.findall(r'[^\W_]+', (text or '').lower()))
+
+class SuggestIndex:
+    """Popularity-weighted prefix completions over a news database"""
+
+    def __init__(self, db_path: str = 'news_database.db', refresh_seconds: float = REFRESH_SECONDS,
+                 max_titles: int = MAX_TITLES, min_search_sessions: int = MIN_SEARCH_SESSIONS):
+        self.db_path = db_path
+        self.refresh_seconds = refresh_seconds
+        self.max_titles = max_titles
+        self.min_search_sessions = min_search_sessions
+
+        # term -> {'text': display text, 'kind': best kind, 'weight': popularity}
+        self.terms: Dict[str, Dict] = {}
+        # Sorted (prefix key, term) pairs: each term under its start and after each space
+        self._keys: List[tuple] = []
+        self._memo: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        # One refresh at a time, so rows past a watermark are only counted once
+        self._refresh_lock = threading.Lock()
+        self._article_watermark = 0
+        self._search_watermark = 0
+        self._title_ids: List[tuple] = []  # (article id, term) of titles offered, oldest first
+        # normalized search -> sessions that made it, until it reaches min_search_sessions
+        self._pending_searches: Dict[str, set] = {}
+        self._admitted_searches = set()
+        self._last_refresh = 0.0
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0, check_same_thread=False)
+
+    def _add(self, text: str, kind: str, weight: float, new_keys: List[tuple]):
+        term = normalize_term(text)
+        if len(term) < 2:
+            return None
+        entry = self.terms.get(term)
+        if entry is None:
+            self.terms[term] = {'text': text.strip(), 'kind': kind, 'weight': weight}
+            new_keys.append((term, term))
+            for match in re.finditer(' ', term):
+                new_keys.append((term[match.end():], term))
+        else:
+            entry['weight'] += weight
+            if KIND_WEIGHTS[kind] > KIND_WEIGHTS[entry['kind']]:
+                entry['kind'] = kind
+        return term
+
+    def refresh(self) -> int:
+        """Fold in articles and searches added since the last refresh; returns new rows seen"""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0] for row in cursor.fetchall()}
+            articles = []
+            searches = []
+            if 'articles' in tables:
+                cursor.execute("PRAGMA table_info(articles)")
+                columns = {column[1] for column in cursor.fetchall()}
+                keywords = 'keywords' if 'keywords' in columns else 'NULL'
+                source = 'source_name' if 'source_name' in columns else ('source' if 'source' in columns else 'NULL')
+                if not self._article_watermark:
+                    # First build: titles only from the most recent articles
+                    cursor.execute('SELECT COALESCE(MAX(id), 0) FROM articles')
+                    title_floor = cursor.fetchone()[0] - self.max_titles
+                else:
+                    title_floor = 0
+                cursor.execute(f'''
+                    SELECT id, CASE WHEN id > ? THEN title END, {keywords}, {source}
+                    FROM articles WHERE id > ? ORDER BY id
+                ''', (title_floor, self._article_watermark))
+                articles = cursor.fetchall()
+            if 'search_history' in tables:
+                cursor.execute("PRAGMA table_info(search_history)")
+                # Without a session column there is no telling visitors apart - offer no searches
+                if 'session_key' in {column[1] for column in cursor.fetchall()}:
+                    cursor.execute('''
+                        SELECT id, query, session_key FROM search_history
+                        WHERE id > ? AND (results_count IS NULL OR results_count > 0)
+                        ORDER BY id
+                    ''', (self._search_watermark,))
+                    searches = cursor.fetchall()
+        finally:
+            conn.close()
+
+        with self._lock:
+            new_keys = []
+            for article_id, title, keywords, source in articles:
+                for keyword in (keywords or '').split(','):
+                    if keyword.strip():
+                        self._add(keyword, 'keyword', KIND_WEIGHTS['keyword'], new_keys)
+                if source:
+                    self._add(source, 'source', KIND_WEIGHTS['source'], new_keys)
+                if title:
+                    # Newer titles rank above older ones of the same weight
+                    term = self._add(title, 'title', KIND_WEIGHTS['title'] + math.log1p(article_id) / 100, new_keys)
+                    if term:
+                        self._title_ids.append((article_id, term))
+                self._article_watermark = article_id
+            for search_id, query, session_key in searches:
+                self._count_search(query, session_key, new_keys)
+                self._search_watermark = search_id
+
+            self._expire_titles()
+            if new_keys:
+                new_keys.sort()
+                self._keys = list(heapq.merge(self._keys, new_keys))
+            if articles or searches:
+                self._memo.clear()
+            self._last_refresh = time.time()
+        return len(articles) + len(searches)
+
+    def _count_search(self, query: str, session_key: Optional[str], new_keys: List[tuple]):
+        """Count a past search; it becomes a completion once enough distinct sessions made it"""
+        term = normalize_term(query)
+        if len(term) < 2 or not session_key:
+            return
+        if term in self._admitted_searches:
+            self._add(query, 'search', KIND_WEIGHTS['search'], new_keys)
+            return
+
+        sessions = self._pending_searches.pop(term, set())
+        sessions.add(session_key)
+        if len(sessions) >= self.min_search_sessions:
+            self._admitted_searches.add(term)
+            self._add(query, 'search', KIND_WEIGHTS['search'] * len(sessions), new_keys)
+            return
+        self._pending_searches[term] = sessions  # most recently seen last
+        if len(self._pending_searches) > MAX_PENDING_SEARCHES:
+            del self._pending_searches[next(iter(self._pending_searches))]
+
+    def _expire_titles(self):
+        """Keep only the most recent titles (unless the same text is also a search or keyword)"""
+        excess = len(self._title_ids) - self.max_titles
+        if excess <= 0:
+            return
+        dropped, self._title_ids = self._title_ids[:excess], self._title_ids[excess:]
+        kept = {term for _, term in self._title_ids}
+        expired = {term for _, term in dropped
+                   if term not in kept and self.terms.get(term, {}).get('kind') == 'title'}
+        for term in expired:
+            del self.terms[term]
+        self._keys = [key for key in self._keys if key[1] not in expired]
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except sqlite3.Error as e:
+            logger.warning(f"Suggestion index refresh failed: {e}")
+            self._last_refresh = time.time()  # back off until the next interval
+
+    def start(self):
+        """Build (or catch up) the index on a background thread; returns immediately"""
+        with self._thread_lock:
+            if self._refresh_thread is None or not self._refresh_thread.is_alive():
+                self._refresh_thread = threading.Thread(target=self._background_refresh,
+                                                        name='suggest-index-refresh', daemon=True)
+                self._refresh_thread.start()
+        return self
+
+    def _ensure_fresh(self):
+        # Requests never wait for a refresh: they use the index as it is while one runs
+        if time.time() - self._last_refresh >= self.refresh_seconds:
+            self.start()
+
+    def suggest(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> List[Dict]:
+        """Most popular completions of ``prefix`` (matching any word start)"""
+        key = normalize_term(prefix)
+        if prefix[-1:].isspace() and key:
+            key += ' '
+        if not key:
+            return []
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        self._ensure_fresh()
+
+        with self._lock:
+            ranked = self._memo.get(key)
+            if ranked is None:
+                lo = bisect.bisect_left(self._keys, (key,))
+                hi = bisect.bisect_left(self._keys, (key + '\U0010ffff',))
+                matches = {term for _, term in self._keys[lo:hi]}
+                ranked = heapq.nlargest(MAX_SUGGESTIONS, matches, key=lambda term: self.terms[term]['weight'])
+                if len(self._memo) >= MAX_MEMO_PREFIXES:
+                    self._memo.clear()
+                self._memo[key] = ranked
+            return [{
+                'text': self.terms[term]['text'],
+                'type': self.terms[term]['kind'],
+                'score': round(self.terms[term]['weight'], 2)
+            } for term in ranked[:limit]]
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'terms': len(self.terms),
+                'keys': len(self._keys),
+                'memoized_prefixes': len(self._memo),
+                'article_watermark': self._article_watermark,
+                'search_watermark': self._search_watermark,
+                'searches_offered': len(self._admitted_searches),
+                'searches_below_threshold': len(self._pending_searches),
+                'last_refresh': self._last_refresh
+            }
+
+if __name__ == "__main__":
+    import sys
+    index = SuggestIndex(sys.argv[1] if len(sys.argv) > 1 else 'news_database.db')
+    started = time.time()
+    index.refresh()
+    print(f"🔤 Indexed {len(index.terms)} completions in {time.time() - started:.2f}s")
+    for prefix in sys.argv[2:]:
+        started = time.time()
+        suggestions = index.suggest(prefix)
+        print(f"  {prefix!r} ({(time.time() - started) * 1000:.1f} ms): "
+              f"{', '.join(item['text'] for item in suggestions)}")
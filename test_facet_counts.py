@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test Trigger-Maintained Facet Counts
+Runs random inserts, updates, soft deletes, restores and deletes against an
+articles table and checks after each step that article_facets matches a
+GROUP BY over the visible (is_deleted = 0) articles
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+
+from facet_counts import FACET_TABLE, TOTAL_FACET, FacetCounts
+
+SOURCES = ['bbc', 'reuters', 'cnn', None]
+CATEGORIES = ['world', 'tech', 'sports', None]
+DAYS = ['2026-10-15T09:00:00', '2026-10-16T18:30:00', '2026-10-17T07:45:00', None]
+
+def _expected(cursor, facets):
+    visible = 'FROM articles WHERE is_deleted = 0'
+    cursor.execute(f'SELECT COUNT(*) {visible}')
+    expected = {(TOTAL_FACET, ''): cursor.fetchone()[0]}
+    for facet, (column, expression) in facets.items():
+        value = f"IFNULL({expression.format(row='articles')}, '')"
+        cursor.execute(f'SELECT {value}, COUNT(*) {visible} GROUP BY {value}')
+        expected.update(((facet, row[0]), row[1]) for row in cursor.fetchall())
+    return {key: count for key, count in expected.items() if count}
+
+def _stored(cursor):
+    cursor.execute(f'SELECT facet, value, count FROM {FACET_TABLE} WHERE count != 0')
+    return {(facet, value): count for facet, value, count in cursor.fetchall()}
+
+def test_facet_counts_follow_writes():
+    print("🧪 FACET COUNTS TRIGGER TEST")
+    print("=" * 50)
+
+    rng = random.Random(24)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'facets.db')
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE articles (
+                id INTEGER PRIMARY KEY, title TEXT, source_name TEXT, category TEXT,
+                read_status INTEGER DEFAULT 0, date_added TEXT, is_deleted INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.executemany('INSERT INTO articles (title, source_name, category, date_added) VALUES (?, ?, ?, ?)',
+                           [(f"Existing {i}", rng.choice(SOURCES), rng.choice(CATEGORIES), rng.choice(DAYS))
+                            for i in range(50)])
+        conn.commit()
+
+        facet_counts = FacetCounts(db_path)
+        assert facet_counts.ensure(), "facet table and triggers should be created"
+        print(f"📊 Facets: {', '.join(facet_counts.facets)}")
+        assert _stored(cursor) == _expected(cursor, facet_counts.facets), "initial fill must match GROUP BY"
+
+        operations = 0
+        for step in range(400):
+            cursor.execute('SELECT id FROM articles')
+            ids = [row[0] for row in cursor.fetchall()]
+            action = rng.choice(['insert', 'update', 'soft_delete', 'restore', 'delete', 'mark_read'])
+            if action == 'insert' or not ids:
+                cursor.execute('INSERT INTO articles (title, source_name, category, date_added, is_deleted) '
+                               'VALUES (?, ?, ?, ?, ?)',
+                               (f"New {step}", rng.choice(SOURCES), rng.choice(CATEGORIES), rng.choice(DAYS),
+                                rng.choice([0, 0, 0, 1])))
+            elif action == 'update':
+                cursor.execute('UPDATE articles SET source_name = ?, category = ?, date_added = ? WHERE id = ?',
+                               (rng.choice(SOURCES), rng.choice(CATEGORIES), rng.choice(DAYS), rng.choice(ids)))
+            elif action == 'soft_delete':
+                cursor.execute('UPDATE articles SET is_deleted = 1 WHERE id = ?', (rng.choice(ids),))
+            elif action == 'restore':
+                cursor.execute('UPDATE articles SET is_deleted = 0, category = ? WHERE id = ?',
+                               (rng.choice(CATEGORIES), rng.choice(ids)))
+            elif action == 'delete':
+                cursor.execute('DELETE FROM articles WHERE id = ?', (rng.choice(ids),))
+            else:
+                cursor.execute('UPDATE articles SET read_status = 1 - read_status WHERE id = ?', (rng.choice(ids),))
+            conn.commit()
+            operations += 1
+            assert _stored(cursor) == _expected(cursor, facet_counts.facets), f"counts drifted after {action}"
+
+        print(f"   ✅ Counts match GROUP BY after {operations} random writes")
+        cursor.execute('SELECT COUNT(*) FROM articles WHERE is_deleted = 0')
+        assert facet_counts.total() == cursor.fetchone()[0]
+        cursor.execute('SELECT DISTINCT category FROM articles WHERE is_deleted = 0 AND category IS NOT NULL')
+        assert set(facet_counts.values('category')) - {None} == {row[0] for row in cursor.fetchall()}
+
+        # A new facet column replaces the triggers and recounts
+        cursor.execute('ALTER TABLE articles ADD COLUMN source_type TEXT')
+        cursor.execute("UPDATE articles SET source_type = 'rss' WHERE id % 2 = 0")
+        conn.commit()
+        facet_counts = FacetCounts(db_path)
+        assert facet_counts.ensure() and 'source_type' in facet_counts.facets
+        assert _stored(cursor) == _expected(cursor, facet_counts.facets), "rebuild after a new column must match"
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                       (f'{FACET_TABLE}_%',))
+        triggers = cursor.fetchone()[0]
+        facet_counts.ensure()
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?",
+                       (f'{FACET_TABLE}_%',))
+        assert cursor.fetchone()[0] == triggers, "ensure() must not pile up triggers"
+        print(f"   ✅ New column rebuilt the counts ({triggers} triggers)")
+        conn.close()
+
+    print("✅ Facet counts stay in step with the articles table")
+
+if __name__ == "__main__":
+    test_facet_counts_follow_writes()
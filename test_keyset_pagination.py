@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test Keyset Pagination
+Checks the page cursor encode/decode round-trip and that walking the listing
+forwards and back with seek() + paginate() visits every article exactly once,
+in the same order as ORDER BY date DESC, id DESC
+"""
+
+import base64
+import sqlite3
+
+from keyset_pagination import decode_cursor, encode_cursor, ensure_seek_index, paginate, seek
+
+PER_PAGE = 7
+
+def _fetch_page(cursor, token):
+    condition, params, order_by, _ = seek(token)
+    cursor.execute(f'''
+        SELECT id, title, date_added FROM articles
+        {f'WHERE {condition}' if condition else ''}
+        ORDER BY {order_by} LIMIT ?
+    ''', params + [PER_PAGE + 1])
+    return paginate(cursor.fetchall(), PER_PAGE, token, date_index=2)
+
+def test_cursor_round_trip():
+    print("🧪 KEYSET CURSOR ROUND-TRIP TEST")
+    print("=" * 50)
+
+    positions = [
+        ('2026-10-17T08:30:00', 42, False),
+        ('2026-10-17 08:30:00.123456', 1, True),
+        (None, 7, False),                  # articles without a date
+        ('Überschrift / ?&=+', 2 ** 40, True),
+    ]
+    for date_value, row_id, backwards in positions:
+        token = encode_cursor(date_value, row_id, backwards)
+        assert '=' not in token and '/' not in token and '+' not in token, f"token not URL-safe: {token}"
+        assert decode_cursor(token) == (date_value, row_id, backwards)
+        print(f"   ✅ {token} -> {decode_cursor(token)}")
+
+    crafted = [base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+               for payload in ('[[1],1,0]', '[{"a":1},1,0]', '["x",[1],0]')]
+    for malformed in (None, '', 'not-a-cursor', encode_cursor('x', 1)[:-3], 'W1tdXQ', *crafted):
+        assert decode_cursor(malformed) is None, f"{malformed!r} should be ignored"
+    print("   ✅ Missing and malformed cursors fall back to the first page")
+
+def test_keyset_walk():
+    print("🧪 KEYSET PAGE WALK TEST")
+    print("=" * 50)
+
+    conn = sqlite3.connect(':memory:')
+    cursor = conn.cursor()
+    cursor.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, date_added TEXT)')
+    ensure_seek_index(cursor)
+    # Repeated timestamps, so the id tie-breaker matters
+    cursor.executemany('INSERT INTO articles (title, date_added) VALUES (?, ?)',
+                       [(f"Article {i}", f"2026-10-{1 + i // 4:02d}T12:00:00") for i in range(40)])
+    cursor.execute('SELECT id FROM articles ORDER BY date_added DESC, id DESC')
+    expected = [row[0] for row in cursor.fetchall()]
+
+    pages = []
+    token = None
+    while True:
+        rows, next_cursor, prev_cursor = _fetch_page(cursor, token)
+        pages.append(([row[0] for row in rows], token, prev_cursor))
+        assert (prev_cursor is None) == (token is None), "only the first page has no newer link"
+        if not next_cursor:
+            break
+        token = next_cursor
+
+    walked = [article_id for ids, _, _ in pages for article_id in ids]
+    print(f"📊 {len(pages)} pages of {PER_PAGE}, {len(walked)} articles")
+    assert walked == expected, "forward walk must match ORDER BY date DESC, id DESC"
+
+    # Each page's "newer" link leads back to exactly the page before it
+    for (previous_ids, _, _), (_, _, prev_cursor) in zip(pages, pages[1:]):
+        rows, _, _ = _fetch_page(cursor, prev_cursor)
+        assert [row[0] for row in rows] == previous_ids
+    print("   ✅ Newer links return the previous page")
+
+    cursor.execute(f'EXPLAIN QUERY PLAN SELECT id FROM articles WHERE {seek(token)[0]} ORDER BY {seek(token)[2]}',
+                   seek(token)[1])
+    plan = ' '.join(row[-1] for row in cursor.fetchall())
+    print(f"   Query plan: {plan}")
+    assert 'idx_articles_date_added_id' in plan, "page seeks should use the (date, id) index"
+    conn.close()
+
+    print("✅ Keyset pagination visits every article once")
+
+if __name__ == "__main__":
+    test_cursor_round_trip()
+    test_keyset_walk()
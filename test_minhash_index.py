@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test MinHash / LSH Duplicate Index
+Checks that the LSH buckets surface the near-duplicate pairs a full pairwise
+Jaccard comparison finds, and that sync() picks up articles inserted later
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+from itertools import combinations
+
+from minhash_index import MinHashLSHIndex, candidate_neighbours, normalize_text, shingles
+
+# Pairs at least this similar (exact shingle Jaccard) must come out of the buckets
+JACCARD_THRESHOLD = 0.6
+MIN_RECALL = 0.95
+
+def _make_corpus(stories=80, seed=7):
+    """Stories with a few lightly reworded copies each, plus unrelated filler"""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(3000)]
+    articles = []
+    for story in range(stories):
+        words = [rng.choice(vocabulary) for _ in range(150)]
+        for copy in range(rng.choice([1, 2, 3, 4])):
+            edited = list(words)
+            for _ in range(copy * 3):
+                edited[rng.randrange(len(edited))] = rng.choice(vocabulary)
+            articles.append((f"Story {story} headline", ' '.join(edited)))
+    return articles
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def test_minhash_lsh_recall():
+    print("🧪 MINHASH / LSH RECALL TEST")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'minhash.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT)')
+        corpus = _make_corpus()
+        conn.executemany('INSERT INTO articles (title, content) VALUES (?, ?)', corpus)
+        conn.commit()
+
+        index = MinHashLSHIndex(db_path)
+        indexed = index.sync()
+        print(f"📊 Indexed {indexed} articles")
+        assert indexed == len(corpus)
+
+        # Pairwise baseline over the same shingles the index hashes
+        cursor = conn.execute('SELECT id, title, content FROM articles')
+        sets = {row[0]: shingles(f"{normalize_text(row[1])} {normalize_text(row[2])}") for row in cursor.fetchall()}
+        expected = {(a, b) for a, b in combinations(sorted(sets), 2)
+                    if _jaccard(sets[a], sets[b]) >= JACCARD_THRESHOLD}
+
+        neighbours = candidate_neighbours(index.load_buckets())
+        found = {pair for pair in expected if pair[1] in neighbours.get(pair[0], ())}
+        recall = len(found) / len(expected) if expected else 1.0
+        candidates = sum(len(others) for others in neighbours.values()) // 2
+        total_pairs = len(sets) * (len(sets) - 1) // 2
+        print(f"   Pairs above {JACCARD_THRESHOLD}: {len(expected)}")
+        print(f"   Found through LSH buckets: {len(found)} (recall {recall:.1%})")
+        print(f"   Candidate pairs compared: {candidates} of {total_pairs}")
+        assert expected, "corpus should contain near-duplicate pairs"
+        assert recall >= MIN_RECALL, f"LSH recall {recall:.1%} below {MIN_RECALL:.0%}"
+        assert candidates < total_pairs / 10, "LSH should prune most pairs"
+
+        # Rows inserted after a sync are indexed by the next one
+        title, content = corpus[0]
+        new_id = conn.execute('INSERT INTO articles (title, content) VALUES (?, ?)', (title, content)).lastrowid
+        conn.commit()
+        assert index.sync() == 1
+        matches = dict(index.query(title, content, min_jaccard=0.99))
+        assert new_id in matches and 1 in matches, "copy of article 1 should be found after sync"
+
+        index.remove([new_id])
+        assert new_id not in index.indexed_ids()
+        conn.close()
+
+    print("✅ MinHash index matches the pairwise baseline")
+
+if __name__ == "__main__":
+    test_minhash_lsh_recall()
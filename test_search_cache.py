@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test Search Result Cache Invalidation
+Checks that cached pages are dropped when articles change through any
+connection, that read_status updates leave them alone, that the UPDATE
+trigger follows columns added later, and that LRU/TTL limits hold
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+from search_cache import SearchResultCache, make_key
+
+def _search(conn, cache, query):
+    """What the search route does: read the generation, then the cache, else query and store"""
+    key = make_key('search', query, page=1)
+    generation = cache.generation()
+    cached = cache.get(key, generation)
+    if cached is not None:
+        return cached, True
+    rows = conn.execute('SELECT id FROM articles WHERE title LIKE ? ORDER BY id',
+                        (f'%{query}%',)).fetchall()
+    cache.put(key, rows, generation)
+    return rows, False
+
+def test_search_cache_invalidation():
+    print("🧪 SEARCH CACHE INVALIDATION TEST")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'cache.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, read_status INTEGER DEFAULT 0)')
+        conn.executemany('INSERT INTO articles (title) VALUES (?)', [('Election results',), ('Market update',)])
+        conn.commit()
+
+        cache = SearchResultCache(db_path)
+        assert cache.ensure()
+        rows, hit = _search(conn, cache, 'election')
+        assert not hit and len(rows) == 1
+        rows, hit = _search(conn, cache, '  ELECTION ')
+        assert hit, "case and whitespace variants should share an entry"
+        print("   ✅ Repeated query served from cache")
+
+        # Another writer (its own connection) inserts a match
+        writer = sqlite3.connect(db_path)
+        writer.execute("INSERT INTO articles (title) VALUES ('Election turnout')")
+        writer.commit()
+        rows, hit = _search(conn, cache, 'election')
+        assert not hit and len(rows) == 2, "insert from another connection must invalidate"
+        print("   ✅ Insert by another connection invalidated the page")
+
+        writer.execute("UPDATE articles SET title = 'Election night' WHERE id = 2")
+        writer.commit()
+        rows, hit = _search(conn, cache, 'election')
+        assert not hit and len(rows) == 3, "title update must invalidate"
+
+        writer.execute('UPDATE articles SET read_status = 1 WHERE id = 1')
+        writer.commit()
+        rows, hit = _search(conn, cache, 'election')
+        assert hit, "read_status updates should not invalidate"
+        print("   ✅ Updates invalidate, read_status does not")
+
+        writer.execute('DELETE FROM articles WHERE id = 3')
+        writer.commit()
+        rows, hit = _search(conn, cache, 'election')
+        assert not hit and len(rows) == 2, "delete must invalidate"
+
+        # Columns added later are watched once ensure() runs again
+        writer.execute('ALTER TABLE articles ADD COLUMN category TEXT')
+        writer.commit()
+        cache.ensure()
+        _search(conn, cache, 'election')
+        writer.execute("UPDATE articles SET category = 'politics' WHERE id = 1")
+        writer.commit()
+        _, hit = _search(conn, cache, 'election')
+        assert not hit, "update of a column added later must invalidate"
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+                                "AND tbl_name = 'articles' AND name LIKE '%_update%'").fetchone()[0]
+        assert triggers == 1, f"stale UPDATE triggers left behind: {triggers}"
+        print("   ✅ UPDATE trigger rebuilt for the new column")
+        writer.close()
+        conn.close()
+
+    # LRU and TTL, no database needed beyond a fixed generation
+    cache = SearchResultCache(db_path=':memory:', max_entries=2, ttl=0.2)
+    for page in (1, 2, 3):
+        cache.put(make_key('list', page=page), [page], generation=5)
+    assert cache.get(make_key('list', page=1), 5) is None, "oldest entry should be evicted"
+    assert cache.get(make_key('list', page=3), 5) == [3]
+    assert cache.get(make_key('list', page=3), 4) is None, "an older generation never reads the cache"
+    time.sleep(0.25)
+    assert cache.get(make_key('list', page=3), 5) is None, "entry should expire after the TTL"
+    stats = cache.get_stats()
+    print(f"   📊 {stats}")
+    assert stats['evictions'] == 1 and stats['expirations'] == 1
+
+    print("✅ Cached results never outlive the articles they came from")
+
+if __name__ == "__main__":
+    test_search_cache_invalidation()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Write-Behind Buffer
+Checks that buffered rows reach the database in batches from the flusher
+thread, that a row which can never be written is dropped without taking its
+batch with it, and that rows survive a locked database until the next flush
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from write_behind_buffer import WriteBehindBuffer
+
+INSERT_SQL = 'INSERT INTO live_feed_updates (id, message) VALUES (?, ?)'
+
+def _count(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute('SELECT COUNT(*) FROM live_feed_updates').fetchone()[0]
+    conn.close()
+    return count
+
+def test_write_behind_buffer():
+    print("🧪 WRITE-BEHIND BUFFER TEST")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'buffer.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE live_feed_updates (id INTEGER PRIMARY KEY, message TEXT NOT NULL)')
+        conn.commit()
+        conn.close()
+
+        # Size-triggered flushes from several producer threads
+        buffer = WriteBehindBuffer(INSERT_SQL, db_path, name='test', flush_size=50, flush_interval=0.2)
+        producers = [threading.Thread(target=buffer.add_many,
+                                      args=([(base + i, f"update {base + i}") for i in range(250)],))
+                     for base in (0, 1000, 2000, 3000)]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        deadline = time.time() + 5
+        while buffer.pending() and time.time() < deadline:
+            time.sleep(0.05)
+        buffer.flush()
+        metrics = buffer.get_metrics()
+        print(f"📊 {metrics}")
+        assert _count(db_path) == 1000 and metrics['written'] == 1000
+        assert metrics['batches'] < 1000 / 10, "rows should be written in batches"
+        print("   ✅ 1000 rows from 4 producers written in batches")
+
+        # Poison rows (duplicate key, NULL message) are dropped, the rest of the batch is kept
+        buffer.add_many([(5000, 'ok'), (0, 'duplicate id'), (5001, None), (5002, 'ok')])
+        buffer.flush()
+        metrics = buffer.get_metrics()
+        assert _count(db_path) == 1002, "good rows of a batch with bad ones must be written"
+        assert metrics['dropped'] == 2 and buffer.pending() == 0
+        print("   ✅ Bad rows dropped without losing the rest of their batch")
+
+        # A locked database keeps the rows queued for the next flush
+        locker = sqlite3.connect(db_path, timeout=0, isolation_level=None)
+        locker.execute('BEGIN EXCLUSIVE')
+        buffer._connection().execute('PRAGMA busy_timeout = 50')
+        buffer.add_many([(6000, 'late'), (6001, 'late')])
+        buffer.flush()
+        assert buffer.pending() == 2, "rows must be requeued while the database is locked"
+        locker.execute('ROLLBACK')
+        locker.close()
+        buffer.close()
+        assert _count(db_path) == 1004 and buffer.pending() == 0
+        print("   ✅ Rows held through a locked database and written on close")
+
+    print("✅ Write-behind buffer writes every good row exactly once")
+
+if __name__ == "__main__":
+    test_write_behind_buffer()
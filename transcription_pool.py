@@ -0,0 +1,151 @@
+"""
+Transcription Worker Pool for WiseNews
+Process pool for YouTube ingestion: every worker loads the Whisper model once
+and then downloads and transcribes queued videos, each in its own temp
+directory, while the pool reports progress and throughput
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "base"
+
+# Per-process state set up by _init_worker
+_model = None
+
+def _init_worker(model_name: str, threads_per_worker: int):
+    """Load the Whisper model once for the lifetime of the worker process"""
+    global _model
+    try:
+        import torch
+        torch.set_num_threads(max(1, threads_per_worker))
+    except ImportError:
+        pass
+
+    import whisper
+    _model = whisper.load_model(model_name)
+
+def _download_audio(youtube_url: str, job_dir: str) -> str:
+    """Download a video's audio track into the job's own directory"""
+    cmd = [
+        "yt-dlp", "-x", "--audio-format", "mp3",
+        "-o", os.path.join(job_dir, "%(title)s.%(ext)s"), youtube_url
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    for file in os.listdir(job_dir):
+        if file.endswith(".mp3"):
+            return os.path.join(job_dir, file)
+    raise FileNotFoundError(f"yt-dlp produced no mp3 for {youtube_url}")
+
+def _transcribe_job(youtube_url: str, work_dir: Optional[str]) -> Dict:
+    """Worker entry point: download, transcribe and clean up one video"""
+    job_dir = tempfile.mkdtemp(prefix="yt_", dir=work_dir)
+    result = {'url': youtube_url, 'title': None, 'text': None, 'error': None,
+              'download_seconds': 0.0, 'transcribe_seconds': 0.0, 'worker_pid': os.getpid()}
+    try:
+        started = time.time()
+        audio_path = _download_audio(youtube_url, job_dir)
+        result['download_seconds'] = round(time.time() - started, 2)
+        result['title'] = os.path.splitext(os.path.basename(audio_path))[0]
+
+        started = time.time()
+        result['text'] = _model.transcribe(audio_path)['text']
+        result['transcribe_seconds'] = round(time.time() - started, 2)
+    except Exception as e:
+        result['error'] = str(e)
+    finally:
+        shutil.rmtree(job_dir, ignore_errors=True)
+    return result
+
+class TranscriptionPool:
+    """Queue of YouTube transcription jobs served by model-holding worker processes"""
+
+    def __init__(self, workers: Optional[int] = None, model_name: str = DEFAULT_MODEL,
+                 work_dir: Optional[str] = None):
+        cpus = os.cpu_count() or 1
+        self.workers = workers or cpus
+        self.model_name = model_name
+        self.work_dir = work_dir
+        if work_dir:
+            os.makedirs(work_dir, exist_ok=True)
+
+        # Split the cores between workers so torch threads do not oversubscribe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(model_name, cpus // self.workers)
+        )
+        self._lock = threading.Lock()
+        self._started = time.time()
+        self.metrics = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'download_seconds': 0.0,
+            'transcribe_seconds': 0.0
+        }
+
+    def submit(self, youtube_url: str):
+        """Queue one video and return its future"""
+        with self._lock:
+            self.metrics['submitted'] += 1
+        return self._executor.submit(_transcribe_job, youtube_url, self.work_dir)
+
+    def _record(self, result: Dict):
+        with self._lock:
+            if result['error']:
+                self.metrics['failed'] += 1
+            else:
+                self.metrics['completed'] += 1
+            self.metrics['download_seconds'] += result['download_seconds']
+            self.metrics['transcribe_seconds'] += result['transcribe_seconds']
+
+    def transcribe_all(self, youtube_urls: Iterable[str]) -> Iterator[Dict]:
+        """Queue every video and yield results as they finish"""
+        futures = {self.submit(url): url for url in youtube_urls}
+        total = len(futures)
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker died (e.g. the model failed to load)
+                result = {'url': futures[future], 'title': None, 'text': None, 'error': str(e),
+                          'download_seconds': 0.0, 'transcribe_seconds': 0.0, 'worker_pid': None}
+            self._record(result)
+            metrics = self.get_metrics()
+            logger.info(f"Transcription progress {done}/{total} "
+                        f"({metrics['videos_per_minute']} videos/min)")
+            yield result
+
+    def get_metrics(self) -> Dict:
+        """Progress counters plus throughput since the pool started"""
+        with self._lock:
+            metrics = dict(self.metrics)
+        elapsed = time.time() - self._started
+        finished = metrics['completed'] + metrics['failed']
+        metrics['workers'] = self.workers
+        metrics['model'] = self.model_name
+        metrics['pending'] = metrics['submitted'] - finished
+        metrics['elapsed_seconds'] = round(elapsed, 1)
+        metrics['videos_per_minute'] = round(finished / elapsed * 60, 2) if elapsed > 0 else 0.0
+        metrics['download_seconds'] = round(metrics['download_seconds'], 1)
+        metrics['transcribe_seconds'] = round(metrics['transcribe_seconds'], 1)
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
@@ -0,0 +1,115 @@
+"""
+Twitter Cursor Store for WiseNews
+Persists a since_id cursor per account so each run only asks the API for
+tweets newer than the last one stored, and keeps the rate-limit state the API
+reports so requests are scheduled around the window instead of retried blindly
+"""
+
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class TwitterCursorStore:
+    """since_id cursors and rate-limit windows kept in SQLite"""
+
+    def __init__(self, db_path: str = 'news_database.db'):
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30.0)
+
+    def _init_db(self):
+        """Create cursor and rate-limit tables if needed"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS twitter_cursors (
+                user_id TEXT PRIMARY KEY,
+                username TEXT,
+                since_id TEXT, -- newest tweet id already ingested
+                last_checked REAL, -- unix time
+                tweets_fetched INTEGER DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS twitter_rate_limits (
+                endpoint TEXT PRIMARY KEY,
+                request_limit INTEGER,
+                remaining INTEGER,
+                reset_at REAL, -- unix time the window resets
+                updated_at DATETIME
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def get_cursors(self) -> Dict[str, Dict]:
+        """All stored cursors keyed by user id"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT user_id, username, since_id, last_checked, tweets_fetched FROM twitter_cursors')
+        cursors = {
+            row[0]: {'username': row[1], 'since_id': row[2], 'last_checked': row[3], 'tweets_fetched': row[4]}
+            for row in cursor.fetchall()
+        }
+        conn.close()
+        return cursors
+
+    def order_accounts(self, accounts: Dict[str, str]) -> List:
+        """(name, user_id) pairs, least recently checked first so deferred accounts go next"""
+        cursors = self.get_cursors()
+        return sorted(accounts.items(), key=lambda item: (cursors.get(item[1]) or {}).get('last_checked') or 0)
+
+    def update_cursor(self, user_id: str, username: str, newest_id: Optional[str], fetched: int):
+        """Record a successful check, advancing since_id when newer tweets arrived"""
+        conn = self._connect()
+        conn.execute('''
+            INSERT INTO twitter_cursors (user_id, username, since_id, last_checked, tweets_fetched)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET
+                username = excluded.username,
+                since_id = COALESCE(excluded.since_id, twitter_cursors.since_id),
+                last_checked = excluded.last_checked,
+                tweets_fetched = twitter_cursors.tweets_fetched + excluded.tweets_fetched
+        ''', (user_id, username, newest_id, time.time(), fetched))
+        conn.commit()
+        conn.close()
+
+    def record_rate_limit(self, endpoint: str, headers) -> Optional[Dict]:
+        """Store the x-rate-limit-* headers of a response"""
+        if headers is None:
+            return None
+        try:
+            state = {
+                'limit': int(headers.get('x-rate-limit-limit')),
+                'remaining': int(headers.get('x-rate-limit-remaining')),
+                'reset_at': float(headers.get('x-rate-limit-reset'))
+            }
+        except (TypeError, ValueError):
+            return None
+
+        conn = self._connect()
+        conn.execute('''
+            INSERT OR REPLACE INTO twitter_rate_limits (endpoint, request_limit, remaining, reset_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (endpoint, state['limit'], state['remaining'], state['reset_at'], datetime.now().isoformat()))
+        conn.commit()
+        conn.close()
+        return state
+
+    def seconds_until_allowed(self, endpoint: str) -> float:
+        """0 if a request can go out now, otherwise seconds until the window resets"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute('SELECT remaining, reset_at FROM twitter_rate_limits WHERE endpoint = ?', (endpoint,))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row or row[0] is None or row[0] > 0:
+            return 0.0
+        return max(0.0, (row[1] or 0) - time.time())
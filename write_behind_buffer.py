@@ -0,0 +1,192 @@
+"""
+Write-Behind Buffer for WiseNews
+Collects rows from high-frequency producers (websocket ticks, aggregation
+passes) in memory and writes them with one executemany per transaction from a
+background thread once enough rows are pending or the flush interval passes,
+so producers never wait on an SQLite connection or commit
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Flush once this many rows are pending...
+FLUSH_SIZE = 200
+# ...or this many seconds after the last flush, whichever comes first
+FLUSH_INTERVAL = 2.0
+# Rows held while the database is unavailable; the oldest are dropped beyond this
+MAX_PENDING = 20000
+
+class WriteBehindBuffer:
+    """Buffered inserts for one statement, flushed in batched transactions"""
+
+    def __init__(self, insert_sql: str, db_path: str = 'news_database.db', name: str = 'write-behind',
+                 flush_size: int = FLUSH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 max_pending: int = MAX_PENDING):
+        self.insert_sql = insert_sql
+        self.db_path = db_path
+        self.name = name
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._pending = deque()
+        self._cond = threading.Condition()
+        # One writer at a time: the flusher thread or an explicit flush()
+        self._write_lock = threading.Lock()
+        self._conn = None
+        self._thread = None
+        self._running = False
+        self.metrics = {
+            'buffered': 0,
+            'written': 0,
+            'batches': 0,
+            'overflowed': 0,
+            'dropped': 0,
+            'errors': 0,
+            'write_seconds': 0.0
+        }
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, name=f"{self.name}-flusher", daemon=True)
+        self._thread.start()
+        return self
+
+    def add(self, row: Sequence):
+        """Queue one row; never touches the database"""
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.metrics['overflowed'] += 1
+            self._pending.append(row)
+            self.metrics['buffered'] += 1
+            if len(self._pending) >= self.flush_size:
+                self._cond.notify()
+        if not self._running:
+            self.start()
+
+    def add_many(self, rows: Iterable[Sequence]):
+        for row in rows:
+            self.add(row)
+
+    def _take_batch(self):
+        with self._cond:
+            batch = list(self._pending)
+            self._pending.clear()
+        return batch
+
+    def _connection(self):
+        if self._conn is None:
+            # isolation_level=None so the BEGIN/COMMIT below is the only transaction
+            self._conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None,
+                                         check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        return self._conn
+
+    def _write_rows(self, batch) -> int:
+        """Insert the batch one row at a time, dropping rows that can never be written"""
+        dropped = 0
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            for row in batch:
+                try:
+                    self._conn.execute(self.insert_sql, row)
+                except (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError) as e:
+                    # Only this statement is undone; the rest of the batch stays in the transaction
+                    logger.warning(f"{self.name}: dropping row that cannot be written: {e}")
+                    dropped += 1
+            self._conn.execute('COMMIT')
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+        return dropped
+
+    def _write(self, batch):
+        if not batch:
+            return
+        with self._write_lock:
+            started = time.time()
+            try:
+                conn = self._connection()
+                conn.execute('BEGIN IMMEDIATE')
+                written = len(batch)
+                try:
+                    conn.executemany(self.insert_sql, batch)
+                    conn.execute('COMMIT')
+                except (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError) as e:
+                    # A bad row would fail every retry of the whole batch - isolate it instead
+                    conn.execute('ROLLBACK')
+                    logger.warning(f"{self.name}: batch of {len(batch)} rows rejected ({e}), writing row by row")
+                    dropped = self._write_rows(batch)
+                    self.metrics['dropped'] += dropped
+                    written -= dropped
+                except Exception:
+                    conn.execute('ROLLBACK')
+                    raise
+                self.metrics['written'] += written
+                self.metrics['batches'] += 1
+            except sqlite3.OperationalError as e:
+                # Locked or busy: put the rows back in front so they go out with the next flush
+                logger.error(f"{self.name}: failed to write {len(batch)} rows: {e}")
+                self.metrics['errors'] += 1
+                with self._cond:
+                    room = self.max_pending - len(self._pending)
+                    requeue = batch[-room:] if room > 0 else []
+                    self.metrics['overflowed'] += len(batch) - len(requeue)
+                    self._pending.extendleft(reversed(requeue))
+            except Exception as e:
+                logger.error(f"{self.name}: dropping {len(batch)} rows that cannot be written: {e}")
+                self.metrics['errors'] += 1
+                self.metrics['dropped'] += len(batch)
+            finally:
+                self.metrics['write_seconds'] += time.time() - started
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._pending) >= self.flush_size or not self._running,
+                                    timeout=self.flush_interval)
+                running = self._running
+            self._write(self._take_batch())
+            if not running:
+                return
+
+    def flush(self):
+        """Write everything pending now, from the calling thread"""
+        self._write(self._take_batch())
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def close(self):
+        """Stop the flusher after a final flush"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_metrics(self) -> Dict:
+        with self._cond:
+            metrics = dict(self.metrics)
+            metrics['pending'] = len(self._pending)
+        metrics['name'] = self.name
+        metrics['avg_batch_size'] = round(metrics['written'] / metrics['batches'], 1) if metrics['batches'] else None
+        metrics['write_seconds'] = round(metrics['write_seconds'], 3)
+        return metrics